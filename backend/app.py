@@ -1,3 +1,5 @@
+import threading
+
 from flask import Flask, jsonify, render_template
 from flask_cors import CORS
 from config import Config
@@ -13,6 +15,12 @@ from routes.emergency import emergency_bp
 from routes.gemini import gemini_bp
 from routes.places import places_bp
 from routes.face_detection import face_detection_bp
+from routes.rules import rules_bp
+
+# Heavy services (loaded lazily, or up front by warmup())
+from services import face_detector, gemini_service
+from services.face_detector_pool import get_face_pool
+from services.symptom_pipeline import recover_pending_analyses
 
 app = Flask(
     __name__,
@@ -46,6 +54,29 @@ app.register_blueprint(emergency_bp, url_prefix="/api/emergency")
 app.register_blueprint(gemini_bp, url_prefix="/api/gemini")
 app.register_blueprint(places_bp, url_prefix="/api/places")
 app.register_blueprint(face_detection_bp, url_prefix="/api/face-detection")
+app.register_blueprint(rules_bp, url_prefix="/api/rules")
+
+
+def warmup():
+    """Load cascades, the Gemini model and the face pool before the first request"""
+    face_detector.warmup(Config.WARMUP_FACE_DETECTORS)
+    gemini_service.warmup()
+    face_pool = get_face_pool()
+    if face_pool is not None:
+        face_pool.warmup()
+
+
+def start_background_jobs():
+    """
+    Re-queue deferred analyses lost with a previous process. Call once the
+    server starts (not at import, so importing app never touches MongoDB)
+    """
+    if Config.ANALYSIS_RECOVER_ON_STARTUP:
+        threading.Thread(target=recover_pending_analyses, name="analysis-recovery", daemon=True).start()
+
+
+if Config.WARMUP_ON_STARTUP:
+    warmup()
 
 
 @app.route("/")
@@ -64,6 +95,7 @@ def health_check():
 
 if __name__ == "__main__":
     init_db()
+    start_background_jobs()
     print(" CuraSyn+ Backend starting...")
     print(" API running on http://localhost:5000")
     app.run(debug=True, host="0.0.0.0", port=5000)
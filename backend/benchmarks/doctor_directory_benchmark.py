@@ -0,0 +1,91 @@
+"""
+In-memory doctor directory at scale: snapshot build time, then per-query
+latency of match_doctor, nearby (grid) and search against the snapshot,
+next to a plain scan of the same in-memory list (a lower bound for the
+MongoDB path, which also pays the round-trip and decoding).
+
+Usage (from backend/):
+    python -m benchmarks.doctor_directory_benchmark --doctors 100000 --queries 200
+"""
+
+import argparse
+import random
+import time
+
+from bson import ObjectId
+
+from benchmarks.doctor_geo_benchmark import CITIES, make_doctors
+from services import doctor_matcher
+from services.doctor_directory import DoctorDirectory
+from services.doctor_matcher import DoctorMatcher
+from utils.geo import haversine_km
+
+CITY_NAMES = ['Boston', 'New York', 'Chicago', 'Los Angeles', 'Houston']
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(query) for query in queries]
+    return results, (time.perf_counter() - start) / len(queries) * 1000
+
+
+def scan_nearby(doctors, user, radius_km=5):
+    found = []
+    for doctor in doctors:
+        coords = doctor['location']['coordinates']
+        distance = haversine_km(user['lat'], user['lng'], coords['lat'], coords['lng'])
+        if distance <= radius_km and doctor['specialization'] == 'Neurology':
+            found.append((distance, doctor['_id']))
+    return sorted(found)[:10]
+
+
+def run(count, queries):
+    doctors = make_doctors(count)
+    rng = random.Random(2)
+    for doctor in doctors:
+        doctor['_id'] = ObjectId()
+        doctor['location']['city'] = rng.choice(CITY_NAMES)
+    
+    directory = DoctorDirectory(loader=lambda: doctors, stamp=None, watch=None, poll_interval=None)
+    start = time.perf_counter()
+    snapshot = directory.refresh()
+    build = time.perf_counter() - start
+    
+    users = []
+    for _ in range(queries):
+        lat, lng = rng.choice(CITIES)
+        users.append({'lat': lat + rng.gauss(0, 0.2), 'lng': lng + rng.gauss(0, 0.2)})
+    report = {'symptoms': ['chest pain'], 'severity': 'moderate', 'ai_analysis': ''}
+    
+    live_directory = doctor_matcher.doctor_directory
+    doctor_matcher.doctor_directory = directory
+    try:
+        _, match_ms = timed(lambda user: DoctorMatcher.match_doctor(report, user), users)
+    finally:
+        doctor_matcher.doctor_directory = live_directory
+    
+    def grid_nearby(user):
+        found = [(distance, doctor['_id']) for doctor, distance in snapshot.near(user['lat'], user['lng'], 5)
+                 if doctor['specialization'] == 'Neurology']
+        return found[:10]
+    
+    grid, grid_ms = timed(grid_nearby, users)
+    scan, scan_ms = timed(lambda user: scan_nearby(doctors, user), users)
+    
+    _, search_ms = timed(lambda _: snapshot.search('cardio', 'bost', limit=50), users)
+    _, search_scan_ms = timed(
+        lambda _: [d for d in doctors if 'cardio' in d['specialization'].lower()
+                   and 'bost' in d['location']['city'].lower()][:50], users)
+    
+    print(f"{count} doctors: snapshot built in {build:.2f}s ({len(snapshot.grid)} grid cells)")
+    print(f"  match_doctor (all cardiology/pulmonology candidates) {match_ms:8.2f} ms")
+    print(f"  nearby 5km   grid {grid_ms:8.2f} ms   list scan {scan_ms:8.2f} ms   same results: {grid == scan}")
+    print(f"  search       index {search_ms:7.2f} ms   list scan {search_scan_ms:8.2f} ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--doctors', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+    run(args.doctors, args.queries)
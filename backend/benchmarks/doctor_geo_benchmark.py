@@ -0,0 +1,128 @@
+"""
+Doctor matching and nearby search over 100k+ synthetic doctors: the
+previous full scan + Python Haversine vs $geoNear on the 2dsphere index.
+Needs a running MongoDB (MONGO_URI); data goes into a separate
+`claritymd_benchmark` database that is dropped afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.doctor_geo_benchmark --doctors 100000 --queries 50
+"""
+
+import argparse
+import random
+import time
+
+from pymongo import GEOSPHERE
+
+from services import doctor_matcher
+from services.doctor_matcher import DoctorMatcher
+from utils.db import client
+from utils.geo import geo_near, geo_point
+
+SPECIALIZATIONS = ['Cardiology', 'Neurology', 'Orthopedics', 'Dermatology', 'Pulmonology',
+                   'Gastroenterology', 'ENT', 'Ophthalmology', 'Pediatrics', 'General Practice']
+
+# Metro areas the synthetic doctors cluster around
+CITIES = [(42.36, -71.06), (40.71, -74.00), (41.88, -87.63), (34.05, -118.24), (29.76, -95.37)]
+
+
+def make_doctors(count, seed=5):
+    rng = random.Random(seed)
+    doctors = []
+    for i in range(count):
+        lat, lng = rng.choice(CITIES)
+        coordinates = {'lat': lat + rng.gauss(0, 0.4), 'lng': lng + rng.gauss(0, 0.4)}
+        doctors.append({
+            'name': f'Dr. Synthetic {i}',
+            'specialization': rng.choice(SPECIALIZATIONS),
+            'location': {'coordinates': coordinates, 'geo': geo_point(coordinates)},
+            'rating': round(rng.uniform(2.5, 5.0), 1),
+            'availability': {'accepting_new_patients': rng.random() < 0.8}
+        })
+    return doctors
+
+
+def old_match(collection, report, user_location):
+    """match_doctor before $geoNear: every doctor of the specialization, scored in Python"""
+    specializations = DoctorMatcher._determine_specialization(report['symptoms'], '')
+    doctors = list(collection.find({'specialization': {'$in': specializations}}))
+    for doctor in doctors:
+        doctor['match_score'] = DoctorMatcher._calculate_match_score(
+            doctor, specializations, user_location, report['severity'])
+        coords = doctor['location']['coordinates']
+        doctor['distance'] = DoctorMatcher._calculate_distance(
+            user_location['lat'], user_location['lng'], coords['lat'], coords['lng'])
+    doctors.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+    return doctors[:10]
+
+
+def old_nearby(collection, lat, lng, radius, specialization):
+    """/api/doctors/nearby before $geoNear: whole collection, flat-earth distance"""
+    nearby = []
+    for doctor in collection.find():
+        coords = doctor['location']['coordinates']
+        distance = ((lat - coords['lat']) ** 2 + (lng - coords['lng']) ** 2) ** 0.5 * 111
+        if distance <= radius / 1000 and doctor['specialization'] == specialization:
+            doctor['distance'] = round(distance, 2)
+            nearby.append(doctor)
+    nearby.sort(key=lambda x: x['distance'])
+    return nearby[:10]
+
+
+def new_nearby(collection, lat, lng, radius, specialization):
+    return list(collection.aggregate([
+        geo_near(lat, lng, radius / 1000, {'specialization': specialization}),
+        {'$limit': 10}
+    ]))
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(*query) for query in queries]
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def run(count, queries):
+    db = client.claritymd_benchmark
+    collection = db.doctors
+    collection.drop()
+    collection.insert_many(make_doctors(count))
+    collection.create_index('specialization')
+    collection.create_index([('location.geo', GEOSPHERE), ('specialization', 1)])
+    
+    rng = random.Random(9)
+    users = []
+    for _ in range(queries):
+        lat, lng = rng.choice(CITIES)
+        users.append({'lat': lat + rng.gauss(0, 0.2), 'lng': lng + rng.gauss(0, 0.2)})
+    report = {'symptoms': ['chest pain', 'palpitations'], 'severity': 'moderate'}
+    
+    # DoctorMatcher reads the module-level collection
+    live_collection = doctor_matcher.doctors_collection
+    doctor_matcher.doctors_collection = collection
+    try:
+        old, old_time = timed(lambda user: old_match(collection, report, user), [(u,) for u in users])
+        new, new_time = timed(lambda user: DoctorMatcher.match_doctor(report, user), [(u,) for u in users])
+    finally:
+        doctor_matcher.doctors_collection = live_collection
+    same_scores = sum([d['match_score'] for d in a] == [d['match_score'] for d in b] for a, b in zip(old, new))
+    
+    nearby_queries = [(u['lat'], u['lng'], 5000, 'Neurology') for u in users]
+    old_near, old_near_time = timed(lambda *q: old_nearby(collection, *q), nearby_queries)
+    new_near, new_near_time = timed(lambda *q: new_nearby(collection, *q), nearby_queries)
+    
+    print(f"{count} doctors, {queries} queries")
+    print(f"  match_doctor  scan {old_time * 1000:8.1f} ms   $geoNear {new_time * 1000:8.1f} ms   "
+          f"same top-10 scores: {same_scores}/{queries}")
+    print(f"  nearby        scan {old_near_time * 1000:8.1f} ms   $geoNear {new_near_time * 1000:8.1f} ms   "
+          f"avg results {sum(map(len, new_near)) / queries:.1f}")
+    
+    client.drop_database('claritymd_benchmark')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--doctors', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+    run(args.doctors, args.queries)
@@ -0,0 +1,79 @@
+"""
+Match scoring over 10k-1M candidates: the per-doctor
+_calculate_match_score loop + distance + full sort vs the vectorized
+match_scores + top_k. Every score and the ranked top 10 (order included)
+must be identical.
+
+Usage (from backend/):
+    python -m benchmarks.doctor_scoring_benchmark --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+
+from services.doctor_matcher import DoctorMatcher
+from services.doctor_scoring import match_scores, top_k
+
+SPECIALIZATIONS = ['Cardiology', 'Neurology', 'Pulmonology', 'General Practice', 'ENT']
+USER = {'lat': 42.36, 'lng': -71.06}
+NEEDED = ['Cardiology', 'Pulmonology']
+
+
+def make_candidates(count, seed=1):
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(count):
+        # A few doctors without coordinates or availability info, as in real data
+        coordinates = {} if i % 97 == 0 else {'lat': USER['lat'] + rng.gauss(0, 0.3),
+                                               'lng': USER['lng'] + rng.gauss(0, 0.3)}
+        candidates.append({
+            '_id': i,
+            'specialization': rng.choice(SPECIALIZATIONS),
+            'location': {'coordinates': coordinates},
+            'rating': round(rng.uniform(2.5, 5.0), 1),
+            'availability': {} if i % 7 == 0 else {'accepting_new_patients': rng.random() < 0.8}
+        })
+    return candidates
+
+
+def old_rank(doctors, user_location):
+    scored = []
+    for doctor in doctors:
+        score = DoctorMatcher._calculate_match_score(doctor, NEEDED, user_location, 'moderate')
+        coords = doctor['location']['coordinates']
+        distance = DoctorMatcher._calculate_distance(
+            user_location['lat'], user_location['lng'], coords.get('lat', 0), coords.get('lng', 0))
+        scored.append((doctor, score, distance))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return [score for _, score, _ in scored], [(d['_id'], s) for d, s, _ in scored[:10]]
+
+
+def new_rank(doctors, user_location):
+    scores, _ = match_scores(doctors, NEEDED, user_location)
+    return scores, [(doctors[i]['_id'], int(scores[i])) for i in top_k(scores, 10)]
+
+
+def run(sizes):
+    for size in sizes:
+        doctors = make_candidates(size)
+        
+        start = time.perf_counter()
+        old_scores, old_top = old_rank(doctors, USER)
+        old_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        new_scores, new_top = new_rank(doctors, USER)
+        new_time = time.perf_counter() - start
+        
+        reference = [DoctorMatcher._calculate_match_score(d, NEEDED, USER, 'moderate') for d in doctors]
+        identical = reference == new_scores.tolist() and old_top == new_top
+        print(f"{size:>8} candidates   loop {old_time * 1000:9.1f} ms   vectorized {new_time * 1000:8.1f} ms   "
+              f"x{old_time / new_time:5.1f}   identical: {identical}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    run(args.sizes)
@@ -0,0 +1,60 @@
+"""
+Reconnect burst: N queued symptom submissions sent as N calls to
+/api/emergency/detect vs one streamed /api/emergency/detect-bulk call,
+through the Flask test client. Verdicts must agree.
+
+Usage (from backend/):
+    python -m benchmarks.emergency_bulk_benchmark --submissions 2000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from flask import Flask
+
+from benchmarks.keyword_matcher_benchmark import make_texts
+from routes.emergency import emergency_bp
+from services.rule_engine import rule_engine
+
+
+def run(count, distinct):
+    app = Flask(__name__)
+    app.register_blueprint(emergency_bp, url_prefix='/api/emergency')
+    client = app.test_client()
+    
+    # Offline queues repeat themselves; draw from a limited set of texts
+    rng = random.Random(3)
+    texts = make_texts(distinct, [rule_engine.rules.emergency_keywords])
+    submissions = [{'id': i, 'symptoms': rng.choice(texts).split(', ')} for i in range(count)]
+    
+    start = time.perf_counter()
+    single = [client.post('/api/emergency/detect', json={'symptoms': s['symptoms']}).json['emergency_detected']
+              for s in submissions]
+    single_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    response = client.post('/api/emergency/detect-bulk', json={'submissions': submissions}, buffered=False)
+    chunks = iter(response.response)
+    first_line = next(chunks)
+    first_time = time.perf_counter() - start
+    body = first_line + b''.join(chunks)
+    bulk_time = time.perf_counter() - start
+    
+    bulk = [json.loads(line) for line in body.decode().splitlines()]
+    in_order = [line['index'] for line in bulk] == list(range(count))
+    agree = [line['emergency_detected'] for line in bulk] == single
+    
+    print(f"{count} submissions ({distinct} distinct texts), {sum(single)} emergencies")
+    print(f"  single requests  {single_time:7.3f}s")
+    print(f"  bulk request     {bulk_time:7.3f}s   first chunk after {first_time * 1000:.1f} ms")
+    print(f"  in order: {in_order}   verdicts agree: {agree}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--submissions', type=int, default=2000)
+    parser.add_argument('--distinct', type=int, default=300)
+    args = parser.parse_args()
+    run(args.submissions, args.distinct)
@@ -0,0 +1,57 @@
+"""
+Compare frames per second of the single-frame (base64 and raw bytes) and
+batched face analysis paths.
+
+Usage (from backend/):
+    python -m benchmarks.face_batch_benchmark --frames 30 --rounds 5
+"""
+
+import argparse
+import time
+
+from benchmarks.synthetic_faces import make_session, to_data_url
+from services.face_detector import FaceDetector
+
+
+def run(frames, rounds, width, height, workers):
+    detector = FaceDetector()
+    jpegs = make_session(frames, width, height)
+    images = [to_data_url(jpeg) for jpeg in jpegs]
+    
+    # Warm up both paths so cascade loading and thread start-up are not timed
+    detector.detect_face_from_base64(images[0])
+    detector.detect_faces_batch(images[:2], max_workers=workers)
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for image in images:
+            detector.detect_face_from_base64(image)
+    single = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for jpeg in jpegs:
+            detector.detect_face_from_bytes(jpeg)
+    raw = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(rounds):
+        detector.detect_faces_batch(images, max_workers=workers)
+    batched = time.perf_counter() - start
+    
+    total = frames * rounds
+    print(f"{width}x{height}, {frames} frames x {rounds} rounds, {workers} decode workers")
+    print(f"  single-frame: {total / single:8.1f} fps")
+    print(f"  raw bytes:    {total / raw:8.1f} fps  ({single / raw:.2f}x)")
+    print(f"  batched:      {total / batched:8.1f} fps  ({single / batched:.2f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Face analysis batch benchmark')
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    run(args.frames, args.rounds, args.width, args.height, args.workers)
@@ -0,0 +1,262 @@
+"""
+Benchmark and accuracy regression suite for FaceDetector.
+
+Runs a corpus of synthetic faces (several droop levels, the strongest
+above DROOP_THRESHOLD so the corpus has positive cases) and generated
+variants of them (lighting, contrast, blur, small rotations, JPEG
+quality) at multiple resolutions, plus any real images passed with
+--images. Reports p50/p95 latency, frames per second, peak memory,
+detection rate and the stability of droop_detected across the variants
+of each face. Every frame's verdict is written to the JSON output, so
+two runs can be diffed with --compare, which fails on flipped verdicts
+and on asymmetry scores that drift more than --score-tolerance.
+
+Usage (from backend/):
+    python -m benchmarks.face_benchmark --output before.json
+    python -m benchmarks.face_benchmark --face-params 1.1,5 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_faces import encode_jpeg, make_face
+from services.face_detector import FaceDetector
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720), (1920, 1080)]
+# (right eye shift, right mouth shift) as fractions of frame height, and right cheek darkening
+DROOP_LEVELS = [
+    (0.0, 0.0, 0),
+    (0.03, 0.0, 0),
+    (0.06, 0.0, 0),
+    (0.08, 0.06, 40),  # around the threshold
+    (0.08, 0.06, 60),  # most variants above it
+]
+
+
+def _rotate(gray, degrees):
+    height, width = gray.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), degrees, 1.0)
+    return cv2.warpAffine(gray, matrix, (width, height), borderMode=cv2.BORDER_REPLICATE)
+
+
+# Generated variants of each synthetic face: name -> (transform, JPEG quality)
+VARIANTS = {
+    'base': (lambda g: g, 80),
+    'dark': (lambda g: cv2.convertScaleAbs(g, alpha=0.6), 80),
+    'bright': (lambda g: cv2.convertScaleAbs(g, alpha=1.0, beta=40), 80),
+    'low_contrast': (lambda g: cv2.convertScaleAbs(g, alpha=0.5, beta=64), 80),
+    'blur': (lambda g: cv2.GaussianBlur(g, (0, 0), 2), 80),
+    'tilt_left': (lambda g: _rotate(g, 5), 80),
+    'tilt_right': (lambda g: _rotate(g, -5), 80),
+    'low_quality': (lambda g: g, 40),
+}
+
+
+def build_corpus(resolutions, seeds, image_dir=None):
+    """
+    Returns {resolution label: [(frame id, group id, jpeg bytes), ...]}.
+    Frames in the same group are variants of one face and should agree on droop.
+    """
+    corpus = {}
+    for width, height in resolutions:
+        frames = []
+        for droop, mouth_droop, sag in DROOP_LEVELS:
+            level = f"droop{droop:.2f}" + (f"-mouth{mouth_droop:.2f}-sag{sag}" if mouth_droop or sag else '')
+            for seed in range(seeds):
+                face = make_face(width, height, droop=int(droop * height), seed=seed,
+                                 mouth_droop=int(mouth_droop * height), sag=sag)
+                group = f"{level}/seed{seed}"
+                for name, (transform, quality) in VARIANTS.items():
+                    jpeg = encode_jpeg(transform(face), quality)
+                    frames.append((f"{group}/{name}", group, jpeg))
+        corpus[f"{width}x{height}"] = frames
+    
+    if image_dir:
+        frames = []
+        for name in sorted(os.listdir(image_dir)):
+            if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+                with open(os.path.join(image_dir, name), 'rb') as f:
+                    frames.append((name, name, f.read()))
+        corpus['images'] = frames
+    return corpus
+
+
+def run_frames(detector, frames, repeats):
+    """Time each frame (best of `repeats`) and record its verdict"""
+    latencies, verdicts = [], {}
+    tracemalloc.start()
+    for frame_id, group, jpeg in frames:
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            result = detector.detect_face_from_bytes(jpeg)
+            best = min(best, time.perf_counter() - start)
+        latencies.append(best)
+        verdicts[frame_id] = {
+            'group': group,
+            'face': bool(result.get('success')),
+            'droop': bool(result.get('droop_detected', False)),
+            'asymmetry_score': round(result.get('symmetry', {}).get('asymmetry_score', 0.0), 3)
+        }
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return np.array(latencies), verdicts, peak
+
+
+def summarize(latencies, verdicts, peak):
+    groups = defaultdict(list)
+    for verdict in verdicts.values():
+        if verdict['face']:
+            groups[verdict['group']].append(verdict['droop'])
+    # Share of frames that agree with their group's majority verdict
+    agreeing = sum(max(sum(v), len(v) - sum(v)) for v in groups.values())
+    analyzed = sum(len(v) for v in groups.values())
+    
+    return {
+        'frames': len(verdicts),
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 2),
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 2),
+        'fps': round(len(latencies) / float(latencies.sum()), 1),
+        'peak_traced_kb': round(peak / 1024, 1),
+        'detection_rate': round(sum(v['face'] for v in verdicts.values()) / len(verdicts), 4),
+        'droop_rate': round(sum(v['droop'] for v in verdicts.values()) / len(verdicts), 4),
+        'droop_stability': round(agreeing / analyzed, 4) if analyzed else None
+    }
+
+
+def make_detector(args):
+    detector = FaceDetector(args.detection_width)
+    # Instance attributes shadow the class defaults being evaluated
+    if args.face_params:
+        detector.FACE_PARAMS = _params(args.face_params)
+    if args.eye_params:
+        detector.EYE_PARAMS = _params(args.eye_params)
+    if args.smile_params:
+        detector.SMILE_PARAMS = _params(args.smile_params)
+    if args.droop_threshold is not None:
+        detector.DROOP_THRESHOLD = args.droop_threshold
+    return detector
+
+
+def _params(text):
+    scale, neighbors = text.split(',')
+    return float(scale), int(neighbors)
+
+
+def run(args):
+    detector = make_detector(args)
+    resolutions = [tuple(map(int, r.split('x'))) for r in args.resolutions.split(',')]
+    corpus = build_corpus(resolutions, args.seeds, args.images)
+    
+    report = {
+        'parameters': {
+            'detection_width': detector.detection_width or 0,
+            'face_params': detector.FACE_PARAMS,
+            'eye_params': detector.EYE_PARAMS,
+            'smile_params': detector.SMILE_PARAMS,
+            'droop_threshold': detector.DROOP_THRESHOLD
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'opencv': cv2.__version__,
+            'numpy': np.__version__,
+            'cpus': os.cpu_count()
+        },
+        'results': {},
+        'verdicts': {}
+    }
+    
+    # Warm up so cascade page-in is not counted against the first frame
+    detector.detect_face_from_bytes(next(iter(corpus.values()))[0][2])
+    for label, frames in corpus.items():
+        latencies, verdicts, peak = run_frames(detector, frames, args.repeats)
+        report['results'][label] = summarize(latencies, verdicts, peak)
+        report['verdicts'][label] = verdicts
+    # ru_maxrss is in kilobytes on Linux
+    report['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return report
+
+
+def print_report(report):
+    print(f"parameters: {report['parameters']}")
+    print(f"{'corpus':>10} {'frames':>6} {'p50_ms':>7} {'p95_ms':>7} {'fps':>6} {'peak_kb':>8} "
+          f"{'detect':>7} {'droop':>6} {'stable':>7}")
+    for label, r in report['results'].items():
+        stability = f"{r['droop_stability']:.1%}" if r['droop_stability'] is not None else 'n/a'
+        print(f"{label:>10} {r['frames']:6d} {r['p50_ms']:7.1f} {r['p95_ms']:7.1f} {r['fps']:6.1f} "
+              f"{r['peak_traced_kb']:8.0f} {r['detection_rate']:7.1%} {r['droop_rate']:6.1%} {stability:>7}")
+    print(f"max RSS: {report['max_rss_kb'] / 1024:.0f} MB")
+
+
+def compare(report, baseline, latency_tolerance, score_tolerance):
+    """Print differences against a previous run; returns True when something regressed"""
+    regressed = False
+    print(f"\ncompared with baseline parameters {baseline['parameters']}")
+    for label, result in report['results'].items():
+        before = baseline['results'].get(label)
+        if before is None:
+            continue
+        shared = [
+            (frame_id, baseline['verdicts'][label][frame_id], verdict)
+            for frame_id, verdict in report['verdicts'][label].items()
+            if frame_id in baseline['verdicts'][label]
+        ]
+        changed = [
+            frame_id for frame_id, old, new in shared
+            if (new['face'], new['droop']) != (old['face'], old['droop'])
+        ]
+        # Scores moving toward the threshold are a regression before any verdict flips
+        drifted = [
+            frame_id for frame_id, old, new in shared
+            if old['face'] and new['face'] and abs(new['asymmetry_score'] - old['asymmetry_score']) > score_tolerance
+        ]
+        slower = result['p95_ms'] > before['p95_ms'] * (1 + latency_tolerance)
+        worse = result['detection_rate'] < before['detection_rate']
+        regressed = regressed or slower or worse or bool(changed) or bool(drifted)
+        print(f"  {label}: p95 {before['p95_ms']} -> {result['p95_ms']} ms{' (SLOWER)' if slower else ''}, "
+              f"detection {before['detection_rate']:.1%} -> {result['detection_rate']:.1%}, "
+              f"droop {before['droop_rate']:.1%} -> {result['droop_rate']:.1%}, "
+              f"{len(changed)} verdict changes, {len(drifted)} scores drifted > {score_tolerance}")
+        for frame_id in (changed + drifted)[:5]:
+            print(f"    {frame_id}: {baseline['verdicts'][label][frame_id]} -> {report['verdicts'][label][frame_id]}")
+    return regressed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='FaceDetector benchmark and accuracy regression suite')
+    parser.add_argument('--resolutions', default=','.join(f"{w}x{h}" for w, h in RESOLUTIONS))
+    parser.add_argument('--seeds', type=int, default=3, help='faces per droop level')
+    parser.add_argument('--repeats', type=int, default=3, help='timed runs per frame (best is kept)')
+    parser.add_argument('--images', help='directory of real JPEG/PNG face images to include')
+    parser.add_argument('--detection-width', type=int, default=320)
+    parser.add_argument('--face-params', help='scaleFactor,minNeighbors for the face cascade')
+    parser.add_argument('--eye-params', help='scaleFactor,minNeighbors for the eye cascade')
+    parser.add_argument('--smile-params', help='scaleFactor,minNeighbors for the smile cascade')
+    parser.add_argument('--droop-threshold', type=float)
+    parser.add_argument('--output', help='write the machine-readable report to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON report to diff against')
+    parser.add_argument('--latency-tolerance', type=float, default=0.2,
+                        help='allowed p95 slowdown before --compare reports a regression')
+    parser.add_argument('--score-tolerance', type=float, default=0.5,
+                        help='allowed asymmetry_score change per frame before --compare reports a regression')
+    args = parser.parse_args()
+    
+    report = run(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        sys.exit(1 if compare(report, baseline, args.latency_tolerance, args.score_tolerance) else 0)
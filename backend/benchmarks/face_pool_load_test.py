@@ -0,0 +1,73 @@
+"""
+Load test for the face analysis process pool: throughput of many
+concurrent clients as the pool grows from 1 worker to the core count,
+against inline analysis in the client threads.
+
+Usage (from backend/):
+    python -m benchmarks.face_pool_load_test --clients 16 --frames 200
+"""
+
+import argparse
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic_faces import make_session
+from services.face_detector import FaceDetector
+from services.face_detector_pool import FaceDetectorPool, PoolBusyError
+
+
+def drive(analyze, jpegs, clients, frames):
+    """Send `frames` requests from `clients` threads; returns (fps, rejected)"""
+    rejected = 0
+    
+    def request(i):
+        try:
+            analyze(jpegs[i % len(jpegs)])
+            return 0
+        except PoolBusyError:
+            return 1
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        rejected = sum(executor.map(request, range(frames)))
+    elapsed = time.perf_counter() - start
+    return (frames - rejected) / elapsed, rejected
+
+
+def run(clients, frames, queue_depth, detection_width):
+    jpegs = make_session(10)
+    cores = os.cpu_count() or 1
+    
+    # CascadeClassifier is not safe to share between threads, so the inline
+    # baseline gives every client thread its own detector
+    local = threading.local()
+    
+    def inline(jpeg):
+        if not hasattr(local, 'detector'):
+            local.detector = FaceDetector(detection_width)
+        return local.detector.detect_face_from_bytes(jpeg)
+    
+    fps, _ = drive(inline, jpegs, clients, frames)
+    print(f"{cores} cores, {clients} clients, {frames} frames, queue depth {queue_depth}")
+    print(f"  inline (request threads): {fps:7.1f} fps")
+    
+    workers = 1
+    while workers <= cores:
+        pool = FaceDetectorPool(workers, queue_depth, detection_width, submit_timeout=30)
+        pool.warmup()
+        fps, rejected = drive(pool.detect, jpegs, clients, frames)
+        pool.shutdown()
+        print(f"  pool x{workers:<3}               {fps:7.1f} fps  rejected {rejected}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Face analysis pool load test')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--queue-depth', type=int, default=16)
+    parser.add_argument('--detection-width', type=int, default=320)
+    args = parser.parse_args()
+    run(args.clients, args.frames, args.queue_depth, args.detection_width)
@@ -0,0 +1,74 @@
+"""
+Latency and accuracy of the downscaled face search at several camera
+resolutions and detection widths.
+
+Accuracy is measured against the full-resolution search on the same frame:
+face found rate, IoU of the face box and agreement of droop_detected.
+
+Usage (from backend/):
+    python -m benchmarks.face_pyramid_benchmark --frames 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_faces import make_face
+from services.face_detector import FaceDetector
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+DETECTION_WIDTHS = [0, 640, 480, 320, 240]
+
+
+def iou(a, b):
+    ax2, ay2 = a['x'] + a['width'], a['y'] + a['height']
+    bx2, by2 = b['x'] + b['width'], b['y'] + b['height']
+    iw = max(0, min(ax2, bx2) - max(a['x'], b['x']))
+    ih = max(0, min(ay2, by2) - max(a['y'], b['y']))
+    inter = iw * ih
+    union = a['width'] * a['height'] + b['width'] * b['height'] - inter
+    return inter / union if union else 0.0
+
+
+def timed(detector, frames):
+    search_ms, total_ms, results = [], [], []
+    for gray in frames:
+        start = time.perf_counter()
+        detector._detect_faces(gray)
+        search_ms.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        results.append(detector._analyze_gray(gray))
+        total_ms.append((time.perf_counter() - start) * 1000)
+    return np.median(search_ms), np.median(total_ms), results
+
+
+def run(frame_count):
+    print(f"{'resolution':>10} {'det_width':>9} {'search_ms':>9} {'total_ms':>9} "
+          f"{'found':>6} {'iou':>6} {'droop_agree':>11}")
+    for width, height in RESOLUTIONS:
+        # Half the frames are symmetric, half have a drooping right eye
+        frames = [make_face(width, height, droop=(i % 2) * height // 20, seed=i) for i in range(frame_count)]
+        _, _, reference = timed(FaceDetector(), frames)
+        
+        for detection_width in DETECTION_WIDTHS:
+            if detection_width and detection_width >= width:
+                continue
+            search_ms, total_ms, results = timed(FaceDetector(detection_width), frames)
+            
+            found = sum(r['success'] for r in results) / len(results)
+            pairs = [(r, ref) for r, ref in zip(results, reference) if r['success'] and ref['success']]
+            mean_iou = np.mean([iou(r['face_box'], ref['face_box']) for r, ref in pairs]) if pairs else 0.0
+            agree = np.mean([r['droop_detected'] == ref['droop_detected'] for r, ref in pairs]) if pairs else 0.0
+            
+            label = detection_width or 'full'
+            print(f"{width}x{height:<5} {label:>9} {search_ms:9.1f} {total_ms:9.1f} "
+                  f"{found:6.0%} {mean_iou:6.3f} {agree:11.0%}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Face detection pyramid benchmark')
+    parser.add_argument('--frames', type=int, default=10)
+    args = parser.parse_args()
+    run(args.frames)
@@ -0,0 +1,74 @@
+"""
+Per-frame cost of a sustained tracking session versus independent
+full-frame analysis of every frame.
+
+Usage (from backend/):
+    python -m benchmarks.face_tracking_benchmark --frames 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_faces import encode_jpeg, make_face
+from services.face_detector import FaceDetector
+from services.face_tracking import FaceTrackingSession
+
+
+def make_clip(frames, width, height):
+    """Frames of a face drifting slowly across the image, as from a hand-held phone"""
+    clip = []
+    for i in range(frames):
+        gray = make_face(width, height, seed=i)
+        shift = int(width * 0.02 * np.sin(i / 5))
+        clip.append(encode_jpeg(np.roll(gray, shift, axis=1)))
+    return clip
+
+
+def run(frames, width, height, detection_width):
+    detector = FaceDetector(detection_width)
+    clip = make_clip(frames, width, height)
+    grays = [detector._decode_bytes(jpeg) for jpeg in clip]
+    
+    start = time.perf_counter()
+    for gray in grays:
+        detector._detect_faces(gray)
+    full_search = (time.perf_counter() - start) / frames
+    
+    start = time.perf_counter()
+    for jpeg in clip:
+        detector.detect_face_from_bytes(jpeg)
+    full = (time.perf_counter() - start) / frames
+    
+    session = FaceTrackingSession(detector)
+    box = None
+    start = time.perf_counter()
+    for gray in grays:
+        faces = detector._detect_faces(gray, box)
+        if len(faces) == 0:
+            faces = detector._detect_faces(gray)
+        box = tuple(faces[0]) if len(faces) else None
+    tracked_search = (time.perf_counter() - start) / frames
+    
+    start = time.perf_counter()
+    for jpeg in clip:
+        result = session.process_bytes(jpeg)
+    tracked = (time.perf_counter() - start) / frames
+    
+    print(f"{width}x{height}, detection width {detection_width or 'full'}, {frames} frames")
+    print(f"  face search  full: {full_search * 1000:6.1f} ms  tracked: {tracked_search * 1000:6.1f} ms "
+          f"({full_search / tracked_search:.1f}x)")
+    print(f"  whole frame  full: {full * 1000:6.1f} ms  tracked: {tracked * 1000:6.1f} ms "
+          f"({full / tracked:.1f}x)")
+    print(f"  tracked frames: {session.tracked_frames}/{session.frames}, smoothed: {result['smoothed']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Face tracking session benchmark')
+    parser.add_argument('--frames', type=int, default=30)
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    parser.add_argument('--detection-width', type=int, default=0)
+    args = parser.parse_args()
+    run(args.frames, args.width, args.height, args.detection_width)
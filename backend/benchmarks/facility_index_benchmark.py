@@ -0,0 +1,132 @@
+"""
+Offline facility index: builds it from a synthetic CSV and GeoJSON dataset
+(no network), checks grid lookups against a brute-force scan and times
+them, then runs find_nearby_hospitals in race mode against the local fake
+Places server while it is healthy, erroring and hung.
+
+Usage (from backend/):
+    python -m benchmarks.facility_index_benchmark --facilities 6000 --queries 500
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.fake_places_server import FakePlacesServer
+from benchmarks.places_cache_benchmark import HOTSPOTS, make_users
+from config import Config
+from services import google_places_service
+from services.facility_index import FacilityIndex, load_facilities
+from services.google_places_service import GooglePlacesService
+from utils.geo import haversine_km
+from utils.http_client import HTTPClient
+
+KINDS = ['General Hospital', 'Medical Center', 'Heart Institute', 'Children\'s Hospital', 'Urgent Care']
+
+
+def make_rows(count, seed=3):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(count):
+        lat, lng = rng.choice(HOTSPOTS)
+        rows.append({
+            'ID': f'H{i:05d}',
+            'NAME': f'{rng.choice(["North", "South", "East", "West", "Saint"])} {i} {rng.choice(KINDS)}',
+            'ADDRESS': f'{i} Synthetic Ave',
+            'LATITUDE': lat + rng.gauss(0, 0.5),
+            'LONGITUDE': lng + rng.gauss(0, 0.5),
+            'TYPE': 'hospital',
+            'STATUS': 'CLOSED' if rng.random() < 0.03 else 'OPEN'
+        })
+    return rows
+
+
+def write_datasets(rows, directory):
+    csv_path = os.path.join(directory, 'facilities.csv')
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    geojson_path = os.path.join(directory, 'facilities.geojson')
+    with open(geojson_path, 'w') as f:
+        json.dump({'type': 'FeatureCollection', 'features': [
+            {'type': 'Feature',
+             'geometry': {'type': 'Point', 'coordinates': [row['LONGITUDE'], row['LATITUDE']]},
+             'properties': {k: v for k, v in row.items() if k not in ('LATITUDE', 'LONGITUDE')}}
+            for row in rows
+        ]}, f)
+    return csv_path, geojson_path
+
+
+def brute_force(facilities, lat, lng, radius, limit=10):
+    found = sorted(
+        (haversine_km(lat, lng, f['location']['lat'], f['location']['lng']), i)
+        for i, f in enumerate(facilities)
+    )
+    return [facilities[i] for distance, i in found if distance <= radius / 1000][:limit]
+
+
+def race(label, server, points):
+    # Fresh client per upstream state, so one run's open breaker does not carry over
+    google_places_service.places_http = HTTPClient(server.url, timeouts=Config.PLACES_TIMEOUTS)
+    start = time.perf_counter()
+    sources = {}
+    for lat, lng in points:
+        facilities = GooglePlacesService.find_nearby_hospitals(lat, lng)
+        assert facilities, 'no answer'
+        source = facilities[0].get('source', 'places')
+        sources[source] = sources.get(source, 0) + 1
+    elapsed = (time.perf_counter() - start) / len(points)
+    print(f"  {label:<16} {elapsed * 1000:7.1f} ms per lookup   answered by {sources}")
+
+
+def run(count, queries, radius):
+    rows = make_rows(count)
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, geojson_path = write_datasets(rows, directory)
+        start = time.perf_counter()
+        facilities = load_facilities(csv_path)
+        index = FacilityIndex(facilities)
+        build = time.perf_counter() - start
+        assert load_facilities(geojson_path) == facilities
+    print(f"{len(facilities)} open facilities of {count} rows, index built in {build * 1000:.0f} ms, "
+          f"{index.stats()['cells']} grid cells")
+    
+    points = make_users(queries, spread_km=20)
+    start = time.perf_counter()
+    scanned = [brute_force(facilities, lat, lng, radius) for lat, lng in points]
+    scan = (time.perf_counter() - start) / queries
+    start = time.perf_counter()
+    indexed = [index.nearby(lat, lng, radius, 'hospital') for lat, lng in points]
+    grid = (time.perf_counter() - start) / queries
+    assert indexed == scanned
+    print(f"  brute force    {scan * 1e6:8.1f} us per lookup")
+    print(f"  grid index     {grid * 1e6:8.1f} us per lookup   (identical results)")
+    
+    # Race mode end to end, without the caches so every lookup goes upstream
+    google_places_service.facility_index = index
+    google_places_service.places_cache = None
+    google_places_service.place_details_cache = None
+    Config.FACILITY_INDEX_MODE = 'race'
+    print(f"race mode, {Config.FACILITY_INDEX_RACE_TIMEOUT * 1000:.0f} ms budget for the Places API:")
+    sample = points[:10]
+    for label, server in [
+        ('healthy (100ms)', FakePlacesServer(latency=0.1)),
+        ('erroring', FakePlacesServer(mode='error')),
+        ('hung', FakePlacesServer(mode='hang', hang_seconds=3))
+    ]:
+        race(label, server.start(), sample)
+        server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--facilities', type=int, default=6000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--radius', type=int, default=10000)
+    args = parser.parse_args()
+    run(args.facilities, args.queries, args.radius)
@@ -0,0 +1,64 @@
+"""
+Local stand-in for google.generativeai.GenerativeModel, for benchmarks
+and manual testing without network access or an API key:
+
+    from services import gemini_service
+    gemini_service.set_model(FakeModel(latency=1.5))
+"""
+
+import threading
+import time
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    def __init__(self, latency=1.0, reply='This is a fake AI response.'):
+        self.latency = latency
+        self.reply = reply
+        self.calls = 0
+        self.max_concurrent = 0
+        self._running = 0
+        self._lock = threading.Lock()
+    
+    def generate_content(self, prompt, stream=False, request_options=None, **kwargs):
+        # Like the SDK, give up after request_options['timeout'] seconds
+        timeout = (request_options or {}).get('timeout')
+        if stream:
+            return self._stream(prompt, timeout=timeout)
+        with self._lock:
+            self.calls += 1
+            self._running += 1
+            self.max_concurrent = max(self.max_concurrent, self._running)
+        try:
+            if timeout is not None and self.latency > timeout:
+                time.sleep(timeout)
+                raise TimeoutError(f'Deadline of {timeout}s exceeded')
+            time.sleep(self.latency)
+            return FakeResponse(f"{self.reply} ({len(prompt)} prompt chars)")
+        finally:
+            with self._lock:
+                self._running -= 1
+    
+    def _stream(self, prompt, chunks=5, timeout=None):
+        """Yield the reply in chunks spread evenly over the latency"""
+        with self._lock:
+            self.calls += 1
+            self._running += 1
+            self.max_concurrent = max(self.max_concurrent, self._running)
+        try:
+            words = f"{self.reply} ({len(prompt)} prompt chars)".split(' ')
+            step = max(1, -(-len(words) // chunks))
+            deadline = None if timeout is None else time.monotonic() + timeout
+            for i in range(0, len(words), step):
+                if deadline is not None and time.monotonic() + self.latency / chunks > deadline:
+                    time.sleep(max(0, deadline - time.monotonic()))
+                    raise TimeoutError(f'Deadline of {timeout}s exceeded')
+                time.sleep(self.latency / chunks)
+                yield FakeResponse(' '.join(words[i:i + step]) + ' ')
+        finally:
+            with self._lock:
+                self._running -= 1
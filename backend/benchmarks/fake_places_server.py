@@ -0,0 +1,145 @@
+"""
+Local stand-in for the Google Places web service, for benchmarks and
+manual testing without network access or an API key:
+
+    server = FakePlacesServer(handshake_delay=0.02).start()
+    places_http.base_url = server.url
+
+Serves /nearbysearch/json and /details/json with deterministic places
+around the requested location, within the requested radius (at most 15 km). handshake_delay is paid once per new
+connection (standing in for TCP + TLS setup), latency once per request.
+mode switches the upstream into 'error' (HTTP 503) or 'hang' (no reply
+until hang_seconds) to exercise retries, timeouts and the breaker.
+
+With pages > 1, nearby searches are split into pages of `results` with a
+next_page_token, like the real API: a token answers INVALID_REQUEST until
+token_delay seconds after it was issued.
+"""
+
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_places(lat, lng, count, seed=None, radius_km=15):
+    """count places scattered within radius_km of (lat, lng)"""
+    rng = random.Random(seed if seed is not None else f'{lat:.4f},{lng:.4f}')
+    places = []
+    for i in range(count):
+        distance_km = rng.uniform(min(0.2, radius_km), radius_km)
+        bearing = rng.uniform(0, 2 * math.pi)
+        places.append({
+            'place_id': f'fake-{rng.getrandbits(48):012x}',
+            'name': f'Fake Hospital {i}',
+            'vicinity': f'{i} Fake Street',
+            'geometry': {'location': {
+                'lat': lat + distance_km / 111.2 * math.cos(bearing),
+                'lng': lng + distance_km / (111.2 * math.cos(math.radians(lat))) * math.sin(bearing)
+            }},
+            'rating': round(rng.uniform(2.5, 5.0), 1),
+            'user_ratings_total': rng.randint(5, 2000),
+            'opening_hours': {'open_now': rng.random() < 0.8},
+            'types': ['hospital', 'health', 'point_of_interest']
+        })
+    return places
+
+
+class FakePlacesServer:
+    def __init__(self, handshake_delay=0.0, latency=0.0, results=20, mode='ok', hang_seconds=30,
+                 pages=1, token_delay=0.0):
+        self.handshake_delay = handshake_delay
+        self.latency = latency
+        self.results = results
+        self.mode = mode
+        self.hang_seconds = hang_seconds
+        self.pages = pages
+        self.token_delay = token_delay
+        self._tokens = {}  # next_page_token -> (places, page, issued_at)
+        self.connections = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self.url = None
+    
+    def start(self):
+        fake = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive
+            
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+                time.sleep(fake.handshake_delay)
+            
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                if fake.mode == 'hang':
+                    time.sleep(fake.hang_seconds)
+                    return
+                time.sleep(fake.latency)
+                if fake.mode == 'error':
+                    return self._reply(503, {'status': 'UNKNOWN_ERROR'})
+                url = urlparse(self.path)
+                self._reply(200, fake.handle(url.path, {k: v[0] for k, v in parse_qs(url.query).items()}))
+            
+            def _reply(self, status, payload):
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+    
+    def handle(self, path, params):
+        if path.endswith('/nearbysearch/json'):
+            if 'pagetoken' in params:
+                with self._lock:
+                    token = self._tokens.get(params['pagetoken'])
+                if token is None or time.monotonic() - token[2] < self.token_delay:
+                    return {'status': 'INVALID_REQUEST'}
+                places, page, _ = token
+            else:
+                lat, lng = (float(x) for x in params.get('location', '0,0').split(','))
+                radius_km = min(float(params.get('radius', 15000)) / 1000, 15)
+                places, page = make_places(lat, lng, self.results * self.pages, radius_km=radius_km), 0
+            return self._page(places, page)
+        if path.endswith('/details/json'):
+            place_id = params.get('place_id', '')
+            return {'status': 'OK', 'result': {
+                'name': f'Fake Hospital {place_id[-4:]}',
+                'formatted_address': f'{place_id[-4:]} Fake Street',
+                'formatted_phone_number': '(555) 010-0000',
+                'rating': 4.2
+            }}
+        return {'status': 'INVALID_REQUEST'}
+    
+    def _page(self, places, page):
+        reply = {'status': 'OK', 'results': places[page * self.results:(page + 1) * self.results]}
+        if page + 1 < self.pages:
+            token = uuid.uuid4().hex
+            with self._lock:
+                self._tokens[token] = (places, page + 1, time.monotonic())
+            reply['next_page_token'] = token
+        return reply
+    
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
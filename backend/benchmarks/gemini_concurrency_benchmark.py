@@ -0,0 +1,63 @@
+"""
+Many concurrent symptom analyses against a local fake Gemini model.
+Shows the concurrency cap holding, identical prompts being coalesced
+into one upstream call, and excess load being rejected quickly instead
+of tying up request threads.
+
+Usage (from backend/):
+    python -m benchmarks.gemini_concurrency_benchmark --requests 64 --latency 0.5
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_gemini import FakeModel
+from services import gemini_service
+from services.gemini_service import GeminiService
+
+SYMPTOM_SETS = [
+    ['headache', 'fever'],
+    ['cough', 'sore throat'],
+    ['back pain'],
+    ['rash', 'itching'],
+]
+
+
+def run(requests, latency, distinct):
+    model = FakeModel(latency=latency)
+    gemini_service.set_model(model)
+    executor = gemini_service.llm_executor
+    
+    def report(i):
+        start = time.perf_counter()
+        symptoms = SYMPTOM_SETS[i % len(SYMPTOM_SETS)] if i % distinct else ['unique', str(i)]
+        result = GeminiService.analyze_symptoms(symptoms, [])
+        return result['success'], time.perf_counter() - start
+    
+    start = time.perf_counter()
+    # One client thread per request, as with a threaded web server
+    with ThreadPoolExecutor(max_workers=requests) as clients:
+        outcomes = list(clients.map(report, range(requests)))
+    elapsed = time.perf_counter() - start
+    
+    succeeded = [t for ok, t in outcomes if ok]
+    failed = [t for ok, t in outcomes if not ok]
+    print(f"{requests} concurrent requests, fake model latency {latency}s")
+    print(f"  wall time:           {elapsed:.2f}s")
+    print(f"  succeeded / failed:  {len(succeeded)} / {len(failed)}")
+    if failed:
+        print(f"  slowest rejection:   {max(failed):.2f}s")
+    print(f"  upstream calls:      {model.calls}")
+    print(f"  max concurrent:      {model.max_concurrent} (cap {executor._executor._max_workers})")
+    print(f"  executor stats:      {executor.stats()}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gemini execution layer benchmark')
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--distinct', type=int, default=4,
+                        help='every Nth request uses a unique prompt; the rest repeat common symptom sets')
+    args = parser.parse_args()
+    run(args.requests, args.latency, args.distinct)
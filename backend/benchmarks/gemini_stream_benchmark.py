@@ -0,0 +1,63 @@
+"""
+Time to first byte for /api/gemini/chat, buffered JSON vs server-sent
+events, against a local fake Gemini model. Also checks that closing a
+stream early releases its execution slot.
+
+Usage (from backend/):
+    python -m benchmarks.gemini_stream_benchmark --requests 5 --latency 1.0
+"""
+
+import argparse
+import time
+
+from flask import Flask
+
+from benchmarks.fake_gemini import FakeModel
+from routes.gemini import gemini_bp
+from services import gemini_service
+
+
+def make_client():
+    app = Flask(__name__)
+    app.register_blueprint(gemini_bp, url_prefix='/api/gemini')
+    return app.test_client()
+
+
+def timed(client, stream):
+    url = '/api/gemini/chat' + ('?stream=1' if stream else '')
+    start = time.perf_counter()
+    response = client.post(url, json={'message': 'Simplify: hypertension'}, buffered=False)
+    body = iter(response.response)
+    next(body)
+    first = time.perf_counter() - start
+    for _ in body:
+        pass
+    total = time.perf_counter() - start
+    response.close()
+    return first, total
+
+
+def run(requests, latency):
+    model = FakeModel(latency=latency)
+    gemini_service.set_model(model)
+    client = make_client()
+    
+    for stream in (False, True):
+        firsts, totals = zip(*(timed(client, stream) for _ in range(requests)))
+        label = 'sse ' if stream else 'json'
+        print(f"{label}  first byte {sum(firsts) / requests:6.3f}s   "
+              f"complete {sum(totals) / requests:6.3f}s")
+    
+    # Abandon a stream after the first chunk, as a disconnecting client would
+    response = client.post('/api/gemini/chat?stream=1', json={'message': 'hi'}, buffered=False)
+    next(iter(response.response))
+    response.close()
+    print(f"upstream streams still open after cancel: {model._running}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=1.0)
+    args = parser.parse_args()
+    run(args.requests, args.latency)
@@ -0,0 +1,97 @@
+"""
+Keyword categorisation over a large batch of synthetic symptom texts:
+the old per-call dict + `any(keyword in text)` scan vs KeywordMatcher.
+Also checks that substring mode (word_boundary=None) finds exactly the
+categories the old scan did, and reports how many texts change under
+the default left word boundary.
+
+Runs short symptom lists, long texts (AI analysis sized) and a large
+synthetic table: the scan grows with the keyword count, the matcher
+does not.
+
+Usage (from backend/):
+    python -m benchmarks.keyword_matcher_benchmark --texts 20000 --keywords 600
+"""
+
+import argparse
+import random
+import time
+
+from services.keyword_matcher import KeywordMatcher
+from services.rule_engine import rule_engine
+
+FILLER = ('since yesterday', 'getting worse', 'mild', 'after lunch', 'at night', 'my child has',
+          'really bad', 'on and off', 'near my ear', 'heartburn', 'twitching', 'clear fluid')
+
+
+def make_table(keywords, categories=30, seed=11):
+    """Pseudo-medical vocabulary of single words and two-word phrases"""
+    rng = random.Random(seed)
+    letters = 'abcdefghilmnoprstuy'
+    words = set()
+    while len(words) < keywords:
+        word = ''.join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+        words.add(word if rng.random() < 0.6 else word + ' ' + rng.choice(FILLER).split()[-1])
+    words = sorted(words)
+    return {f'category_{i}': words[i::categories] for i in range(categories)}
+
+
+def make_texts(count, tables, seed=7):
+    rng = random.Random(seed)
+    vocab = [keyword for table in tables for keywords in table.values() for keyword in keywords]
+    texts = []
+    for _ in range(count):
+        words = rng.sample(vocab, rng.randint(0, 3)) + rng.sample(FILLER, rng.randint(2, 6))
+        rng.shuffle(words)
+        texts.append(' '.join(words))
+    return texts
+
+
+def scan(table, text):
+    """The previous implementation: copy the table, substring-test every keyword"""
+    table = {category: list(keywords) for category, keywords in table.items()}
+    return [category for category, keywords in table.items() if any(keyword in text for keyword in keywords)]
+
+
+def timed(fn, texts):
+    start = time.perf_counter()
+    results = [fn(text) for text in texts]
+    return results, time.perf_counter() - start
+
+
+def run(count, keywords):
+    rules = rule_engine.rules
+    tables = {
+        'emergency': rules.emergency_keywords,
+        'specialization': rules.specialization_keywords,
+        'synthetic': make_table(keywords)
+    }
+    short = make_texts(count, tables.values())
+    # ~25 symptom lists joined: roughly the length of an AI analysis
+    long = [' '.join(short[i:i + 25]) for i in range(0, count, 25)]
+    
+    for name, table, texts in [(name, table, texts) for name, table in tables.items()
+                               for texts in (short, long)]:
+        substring = KeywordMatcher(table, word_boundary=None)
+        left = KeywordMatcher(table)
+        
+        old, old_time = timed(lambda text: scan(table, text), texts)
+        same, same_time = timed(substring.categories, texts)
+        new, new_time = timed(left.categories, texts)
+        
+        mismatches = sum(a != b for a, b in zip(old, same))
+        changed = sum(a != b for a, b in zip(old, new))
+        per_text = 1e6 / len(texts)
+        length = sum(map(len, texts)) // len(texts)
+        print(f"{name} ({sum(len(k) for k in table.values())} keywords, {len(texts)} texts of ~{length} chars)")
+        print(f"  any(in) scan        {old_time * per_text:8.2f} us/text")
+        print(f"  matcher, substring  {same_time * per_text:8.2f} us/text   mismatches vs scan: {mismatches}")
+        print(f"  matcher, left \\b    {new_time * per_text:8.2f} us/text   texts changed vs scan: {changed}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--texts', type=int, default=20000)
+    parser.add_argument('--keywords', type=int, default=600, help='size of the synthetic table')
+    args = parser.parse_args()
+    run(args.texts, args.keywords)
@@ -0,0 +1,87 @@
+"""
+Place details for the facilities a user opens after a nearby search,
+against the local fake Places server: one uncached upstream call per open
+vs the MongoDB details cache with background prefetch, plus the batch
+lookup cold (concurrent upstream calls) and warm (one MongoDB query).
+Needs a running MongoDB (MONGO_URI); the cache lives in a separate
+`claritymd_benchmark` database that is dropped afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.place_details_benchmark --users 20 --opens 5 --latency 0.1
+"""
+
+import argparse
+import time
+
+from benchmarks.fake_places_server import FakePlacesServer
+from benchmarks.places_cache_benchmark import make_users
+from services.google_places_service import GooglePlacesService, places_http
+from services.place_details_cache import PlaceDetailsCache
+from utils.db import client
+
+
+def browse(users, opens, think, get_details):
+    """Nearby search, a pause, then open the nearest `opens` facilities one by one; seconds spent waiting on opens"""
+    waited = 0.0
+    for lat, lng in users:
+        facilities = GooglePlacesService.find_nearby_hospitals(lat, lng)
+        time.sleep(think)
+        for facility in facilities[:opens]:
+            start = time.perf_counter()
+            assert get_details(facility['place_id'])
+            waited += time.perf_counter() - start
+    return waited
+
+
+def run(users, opens, think, latency, batch):
+    from services import google_places_service
+    
+    server = FakePlacesServer(latency=latency).start()
+    places_http.base_url = server.url
+    database = client.claritymd_benchmark
+    database.place_details.drop()
+    database.place_details.create_index('expires_at', expireAfterSeconds=0)
+    cache = PlaceDetailsCache(database.place_details, GooglePlacesService._fetch_place_details)
+    points = make_users(users)
+    total = users * opens
+    print(f"{users} users opening {opens} facilities each, {latency * 1000:.0f} ms upstream latency, "
+          f"{think * 1000:.0f} ms between search and first open")
+    
+    try:
+        google_places_service.place_details_cache = None
+        waited = browse(points, opens, think, GooglePlacesService.get_place_details)
+        print(f"  no cache           {waited / total * 1000:7.1f} ms per open")
+        
+        google_places_service.place_details_cache = cache
+        if google_places_service.places_cache is not None:
+            google_places_service.places_cache.clear()
+        waited = browse(points, opens, think, GooglePlacesService.get_place_details)
+        print(f"  cache + prefetch   {waited / total * 1000:7.1f} ms per open   {cache.stats()}")
+        
+        place_ids = [f'batch-{i:04d}' for i in range(batch)]
+        start = time.perf_counter()
+        serial = [GooglePlacesService._fetch_place_details(place_id) for place_id in place_ids]
+        serial_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        cold = cache.get_many(place_ids)
+        cold_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        warm = cache.get_many(place_ids)
+        warm_seconds = time.perf_counter() - start
+        assert len(cold) == len(warm) == batch and list(cold.values()) == serial == list(warm.values())
+        print(f"  batch of {batch}: one by one {serial_seconds * 1000:.0f} ms   "
+              f"cold {cold_seconds * 1000:.0f} ms   warm {warm_seconds * 1000:.1f} ms")
+    finally:
+        client.drop_database('claritymd_benchmark')
+        server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--opens', type=int, default=5)
+    parser.add_argument('--think', type=float, default=0.3)
+    parser.add_argument('--latency', type=float, default=0.1)
+    parser.add_argument('--batch', type=int, default=20)
+    args = parser.parse_args()
+    run(args.users, args.opens, args.think, args.latency, args.batch)
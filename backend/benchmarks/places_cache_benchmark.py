@@ -0,0 +1,112 @@
+"""
+Nearby-hospital lookups from users clustered around a few hotspots, against
+the local fake Places server: every lookup going upstream vs the geohash
+cell cache. Checks that cached answers still carry each user's own
+distances, then expires every entry and shows stale-while-revalidate
+answering without waiting on the upstream while refreshes run behind.
+
+Usage (from backend/):
+    python -m benchmarks.places_cache_benchmark --users 400 --threads 16 --latency 0.15
+"""
+
+import argparse
+import math
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_places_server import FakePlacesServer
+from services import google_places_service
+from services.google_places_service import GooglePlacesService, places_cache, places_http
+
+HOTSPOTS = [(42.3601, -71.0589), (40.7128, -74.0060), (41.8781, -87.6298), (34.0522, -118.2437)]
+
+
+def make_users(count, spread_km=1.5, seed=7):
+    """count (lat, lng) points within spread_km of a random hotspot"""
+    rng = random.Random(seed)
+    users = []
+    for _ in range(count):
+        lat, lng = rng.choice(HOTSPOTS)
+        distance_km = rng.uniform(0, spread_km)
+        bearing = rng.uniform(0, 2 * math.pi)
+        users.append((
+            lat + distance_km / 111.2 * math.cos(bearing),
+            lng + distance_km / (111.2 * math.cos(math.radians(lat))) * math.sin(bearing)
+        ))
+    return users
+
+
+def timed(lookup, users, threads):
+    def one(user):
+        start = time.perf_counter()
+        facilities = lookup(*user)
+        return time.perf_counter() - start, user, facilities
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(one, users))
+
+
+def uncached(latitude, longitude):
+    facilities = GooglePlacesService._search_nearby(latitude, longitude, 5000, 'hospital')
+    return GooglePlacesService._nearest(facilities, latitude, longitude, 10)
+
+
+def cached(latitude, longitude):
+    return GooglePlacesService.find_nearby_hospitals(latitude, longitude, 5000, 'hospital')
+
+
+def report(label, results, upstream):
+    latencies = sorted(elapsed for elapsed, _, _ in results)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"  {label:<22} p50 {statistics.median(latencies) * 1000:7.1f} ms   "
+          f"p95 {p95 * 1000:7.1f} ms   upstream calls: {upstream}")
+
+
+def run(users, threads, latency):
+    if places_cache is None:
+        raise SystemExit('PLACES_CACHE_ENABLED is off')
+    google_places_service.place_details_cache = None  # no details prefetch
+    google_places_service.facility_index = None
+    points = make_users(users)
+    server = FakePlacesServer(latency=latency).start()
+    places_http.base_url = server.url
+    print(f"{users} lookups from {threads} threads around {len(HOTSPOTS)} hotspots, "
+          f"{latency * 1000:.0f} ms upstream latency, geohash precision {places_cache.precision}")
+    
+    report('no cache', timed(uncached, points, threads), server.requests)
+    
+    before = server.requests
+    results = timed(cached, points, threads)
+    report('cell cache (cold)', results, server.requests - before)
+    
+    # Each user's distances come from their own position, not the cell centre
+    for _, (lat, lng), facilities in results:
+        assert facilities, 'empty answer'
+        for facility in facilities:
+            expected = GooglePlacesService._calculate_distance(
+                lat, lng, facility['location']['lat'], facility['location']['lng'])
+            assert facility['distance'] == expected
+        assert [f['distance'] for f in facilities] == sorted(f['distance'] for f in facilities)
+    
+    before = server.requests
+    report('cell cache (warm)', timed(cached, points, threads), server.requests - before)
+    
+    # Everything past its TTL: answers come from the stale entries, refreshes run behind
+    places_cache.ttl = 1
+    time.sleep(1.1)
+    before = server.requests
+    results = timed(cached, points, threads)
+    places_cache._refresher.shutdown(wait=True)
+    report('stale-while-revalidate', results, server.requests - before)
+    print(f"  {places_cache.stats()}")
+    server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=400)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.15)
+    args = parser.parse_args()
+    run(args.users, args.threads, args.latency)
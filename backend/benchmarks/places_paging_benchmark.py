@@ -0,0 +1,80 @@
+"""
+Nearby search paging against the local fake Places server with three pages
+of 20 per search: the old first-page [:10] truncation vs the nearest k
+across one and all pages, checked against a brute-force sort of every
+place the server holds, with the time and upstream requests each costs.
+
+Usage (from backend/):
+    python -m benchmarks.places_paging_benchmark --queries 20 --k 10 --token-delay 0.2
+"""
+
+import argparse
+import time
+
+from benchmarks.fake_places_server import FakePlacesServer, make_places
+from benchmarks.places_cache_benchmark import make_users
+from config import Config
+from services import google_places_service
+from services.google_places_service import GooglePlacesService
+from utils.http_client import HTTPClient
+
+
+def truth(lat, lng, total, k):
+    """place_ids of the k nearest of every place the server holds for (lat, lng)"""
+    places = sorted(
+        (GooglePlacesService._calculate_distance(
+            lat, lng, p['geometry']['location']['lat'], p['geometry']['location']['lng']), i, p['place_id'])
+        for i, p in enumerate(make_places(lat, lng, total))
+    )
+    return [place_id for _, _, place_id in places[:k]]
+
+
+def truncated(lat, lng, k):
+    """find_nearby_hospitals before paging: first page, first 10, then sorted by distance"""
+    facilities = GooglePlacesService._search_nearby(lat, lng, 5000, 'hospital')[:10]
+    return GooglePlacesService._nearest(facilities, lat, lng, k)
+
+
+def measure(label, lookup, points, expected, server):
+    before = server.requests
+    start = time.perf_counter()
+    found = [lookup(lat, lng) for lat, lng in points]
+    elapsed = (time.perf_counter() - start) / len(points)
+    recall = sum(len(set(f['place_id'] for f in facilities) & set(want))
+                 for facilities, want in zip(found, expected)) / sum(len(want) for want in expected)
+    exact = sum([f['place_id'] for f in facilities] == want for facilities, want in zip(found, expected))
+    print(f"  {label:<22} {elapsed * 1000:7.1f} ms per search   {(server.requests - before) / len(points):4.1f} requests   "
+          f"recall {recall:6.1%}   exact top-k {exact}/{len(points)}")
+
+
+def run(queries, k, latency, token_delay):
+    server = FakePlacesServer(latency=latency, pages=Config.PLACES_MAX_PAGES, token_delay=token_delay).start()
+    google_places_service.places_http = HTTPClient(server.url, timeouts=Config.PLACES_TIMEOUTS)
+    google_places_service.places_cache = None
+    google_places_service.place_details_cache = None
+    google_places_service.facility_index = None
+    # Poll a little early so the not-yet-valid token path is exercised too
+    Config.PLACES_PAGE_TOKEN_DELAY = token_delay / 4
+    
+    points = [(round(lat, 4), round(lng, 4)) for lat, lng in make_users(queries, spread_km=30)]
+    total = server.results * server.pages
+    expected = [truth(lat, lng, total, k) for lat, lng in points]
+    print(f"{queries} searches, {server.pages} pages of {server.results}, k={k}, "
+          f"{latency * 1000:.0f} ms latency, token valid after {token_delay * 1000:.0f} ms")
+    
+    measure('first page [:10] (old)', lambda lat, lng: truncated(lat, lng, k), points, expected, server)
+    measure('top-k of page 1', lambda lat, lng: GooglePlacesService.find_nearby_hospitals(
+        lat, lng, limit=k, pages=1), points, expected, server)
+    measure(f'top-k of {server.pages} pages', lambda lat, lng: GooglePlacesService.find_nearby_hospitals(
+        lat, lng, limit=k, pages=server.pages), points, expected, server)
+    server.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--token-delay', type=float, default=0.2)
+    args = parser.parse_args()
+    run(args.queries, args.k, args.latency, args.token_delay)
@@ -0,0 +1,102 @@
+"""
+Hot reload under load: client threads triage symptoms continuously while
+the rule file is atomically replaced with new versions. Every verdict
+must come from exactly one version (each version tags its actions), and
+throughput with reloads should match throughput without.
+
+Usage (from backend/):
+    python -m benchmarks.rule_reload_benchmark --seconds 3 --threads 4
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from services.emergency_detector import EmergencyDetector
+from services.rule_engine import rule_engine
+
+SYMPTOMS = [['chest pain', 'cold sweat'], ['hives', 'swelling'], ['mild cough'], ['sudden numbness']]
+
+
+def write_version(path, base, version):
+    tables = json.loads(json.dumps(base))
+    tables['version'] = version
+    for rule in tables['emergency'].values():
+        rule['action'] = f"[v{version}] {rule['action']}"
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(tables, f)
+    os.replace(tmp, path)
+
+
+def load(seconds, threads):
+    calls = [0] * threads
+    mixed = [0]
+    stop = threading.Event()
+    
+    def client(slot):
+        i = 0
+        while not stop.is_set():
+            result = EmergencyDetector.detect_emergency(SYMPTOMS[i % len(SYMPTOMS)])
+            tags = {e['action'].split(']')[0] for e in result['emergencies']}
+            if len(tags) > 1:
+                mixed[0] += 1
+            calls[slot] += 1
+            i += 1
+    
+    workers = [threading.Thread(target=client, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return sum(calls) / seconds, mixed[0]
+
+
+def run(seconds, threads, reload_every):
+    with open(rule_engine.path, encoding='utf-8') as f:
+        base = json.load(f)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the live engine at a scratch copy of the rules
+        path = os.path.join(tmp, 'rules.json')
+        write_version(path, base, 1)
+        rule_engine.path = path
+        rule_engine.check_interval = 0.01
+        rule_engine.reload()
+        reloads_before = rule_engine.reloads
+        
+        steady, _ = load(seconds, threads)
+        
+        stop = threading.Event()
+        
+        def writer():
+            version = 2
+            while not stop.wait(reload_every):
+                write_version(path, base, version)
+                version += 1
+        
+        thread = threading.Thread(target=writer)
+        thread.start()
+        reloading, mixed = load(seconds, threads)
+        stop.set()
+        thread.join()
+        
+        metrics = rule_engine.metrics()
+        print(f"no reloads        {steady:10.0f} verdicts/s")
+        print(f"reload every {reload_every * 1000:.0f}ms {reloading:10.0f} verdicts/s   "
+              f"reloads: {metrics['reloads'] - reloads_before}   errors: {metrics['reload_errors']}")
+        print(f"verdicts mixing two versions: {mixed}   live version: {metrics['version']}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--reload-every', type=float, default=0.05)
+    args = parser.parse_args()
+    run(args.seconds, args.threads, args.reload_every)
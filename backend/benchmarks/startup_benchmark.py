@@ -0,0 +1,90 @@
+"""
+Startup-time report for the backend, built on `python -X importtime`.
+
+Imports app.py in a fresh interpreter, then prints the total import time
+and the slowest modules by cumulative time. With --warmup it also times
+app.warmup() (cascades, Gemini model, face pool).
+
+Usage (from backend/):
+    python -m benchmarks.startup_benchmark --top 15 --warmup
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TIMED_IMPORT = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter() - start
+warmup = None
+if {warmup}:
+    start = time.perf_counter()
+    app.warmup()
+    warmup = time.perf_counter() - start
+print(json.dumps({{'import_s': imported, 'warmup_s': warmup}}))
+"""
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` lines into (module, self_us, cumulative_us)"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run(top, warmup, as_json):
+    # Timed pass without -X importtime overhead
+    timed = subprocess.run(
+        [sys.executable, '-c', TIMED_IMPORT.format(warmup=warmup)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    timings = json.loads(timed.stdout.strip().splitlines()[-1])
+    
+    traced = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    modules = parse_importtime(traced.stderr)
+    # Top-level packages only, so nested imports are not counted twice;
+    # app itself is the total reported above
+    roots = {}
+    for name, _, cumulative in modules:
+        root = name.split('.')[0]
+        if root == 'app':
+            continue
+        roots[root] = max(roots.get(root, 0), cumulative)
+    slowest = sorted(roots.items(), key=lambda item: item[1], reverse=True)[:top]
+    
+    if as_json:
+        print(json.dumps({
+            'import_s': timings['import_s'],
+            'warmup_s': timings['warmup_s'],
+            'modules': [{'module': name, 'cumulative_us': us} for name, us in slowest]
+        }, indent=2))
+        return
+    
+    print(f"import app: {timings['import_s'] * 1000:.0f} ms")
+    if timings['warmup_s'] is not None:
+        print(f"app.warmup(): {timings['warmup_s'] * 1000:.0f} ms")
+    print("\nslowest top-level imports (cumulative, from -X importtime):")
+    for name, us in slowest:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backend startup-time report')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--warmup', action='store_true')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    run(args.top, args.warmup, args.json)
@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of FaceDetector._analyze_symmetry against the previous
+single-metric implementation (flip copy + absdiff + np.mean).
+
+Usage (from backend/):
+    python -m benchmarks.symmetry_benchmark --runs 300 --repeats 30
+"""
+
+import argparse
+import timeit
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_faces import make_face
+from services.face_detector import FaceDetector
+
+
+def legacy_symmetry(face_gray):
+    """The asymmetry score as it was computed before the metrics suite"""
+    height, width = face_gray.shape
+    mid = width // 2
+    left_half = face_gray[:, :mid]
+    right_half_flipped = cv2.flip(face_gray[:, mid:], 1)
+    if left_half.shape != right_half_flipped.shape:
+        min_width = min(left_half.shape[1], right_half_flipped.shape[1])
+        left_half = left_half[:, :min_width]
+        right_half_flipped = right_half_flipped[:, :min_width]
+    return float(np.mean(cv2.absdiff(left_half, right_half_flipped)))
+
+
+def best_of(repeats, runs, *functions):
+    """Fastest per-call time of each function, timed in alternation so machine noise hits both alike"""
+    best = [float('inf')] * len(functions)
+    for _ in range(repeats):
+        for i, function in enumerate(functions):
+            best[i] = min(best[i], timeit.timeit(function, number=runs) / runs)
+    return best
+
+
+def run(runs, repeats):
+    detector = FaceDetector()
+    print(f"{'face_px':>7} {'legacy_us':>9} {'suite_us':>9} {'score_match':>11}")
+    for side in (120, 240, 371, 600):
+        gray = make_face(side * 2, side * 2, droop=side // 20)
+        y = x = side // 2
+        roi = gray[y:y + side, x:x + side + 1]  # odd width exercises the center column
+        
+        legacy, suite = best_of(repeats, runs, lambda: legacy_symmetry(roi), lambda: detector._analyze_symmetry(roi, []))
+        match = abs(legacy_symmetry(roi) - detector._analyze_symmetry(roi, [])['asymmetry_score']) < 1e-9
+        print(f"{side:7d} {legacy * 1e6:9.1f} {suite * 1e6:9.1f} {str(match):>11}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Symmetry metrics micro-benchmark')
+    parser.add_argument('--runs', type=int, default=300)
+    parser.add_argument('--repeats', type=int, default=30)
+    args = parser.parse_args()
+    run(args.runs, args.repeats)
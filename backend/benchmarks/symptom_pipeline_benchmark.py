@@ -0,0 +1,73 @@
+"""
+Symptom report latency, sequential stages vs SymptomPipeline, with every
+stage stubbed by a sleep so no MongoDB or Gemini is needed. The pipeline
+should land near the slowest chain (user lookup + LLM), not the sum.
+
+Usage (from backend/):
+    python -m benchmarks.symptom_pipeline_benchmark --lookup 0.05 --llm 1.0 --match 0.3
+"""
+
+import argparse
+import time
+
+from services.symptom_pipeline import SymptomPipeline
+
+
+def make_stages(lookup, emergency, llm, match, is_emergency=False):
+    def medical_history(user_id):
+        time.sleep(lookup)
+        return ['asthma']
+    
+    def detect_emergency(symptoms):
+        time.sleep(emergency)
+        return {'is_emergency': is_emergency, 'emergencies': [], 'recommendation': ''}
+    
+    def analyze(symptoms, history):
+        time.sleep(llm)
+        return {'success': True, 'analysis': 'stub analysis'}
+    
+    def match_doctors(report_data, location):
+        time.sleep(match)
+        return [{'_id': 'd1', 'match_score': 90}]
+    
+    return dict(medical_history=medical_history, detect_emergency=detect_emergency,
+                analyze=analyze, match_doctors=match_doctors)
+
+
+def sequential(stages, data, report_data):
+    """The order the route used before the pipeline"""
+    history = stages['medical_history'](data['user_id'])
+    emergency = stages['detect_emergency'](data['symptoms'])
+    ai_result = stages['analyze'](data['symptoms'], history)
+    matched = [] if emergency['is_emergency'] else stages['match_doctors'](report_data, data['location'])
+    return {'emergency': emergency, 'ai_result': ai_result, 'matched_doctors': matched}
+
+
+def run(lookup, emergency, llm, match, reports):
+    stages = make_stages(lookup, emergency, llm, match)
+    pipeline = SymptomPipeline(**stages)
+    data = {'user_id': 'u1', 'symptoms': ['cough', 'fever'], 'location': {'lat': 40.7, 'lng': -74.0}}
+    report_data = {'symptoms': data['symptoms'], 'severity': 'moderate'}
+    
+    for label, fn in (('sequential', lambda: sequential(stages, data, report_data)),
+                      ('pipeline', lambda: pipeline.run(data, report_data))):
+        start = time.perf_counter()
+        for _ in range(reports):
+            result = fn()
+        elapsed = (time.perf_counter() - start) / reports
+        print(f"{label:11s} {elapsed:6.3f}s per report   doctors: {len(result['matched_doctors'])}")
+    
+    print(f"{'stage sum':11s} {lookup + emergency + llm + match:6.3f}s")
+    print(f"{'slowest':11s} {max(lookup + llm, emergency, match):6.3f}s")
+    pipeline.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--lookup', type=float, default=0.05)
+    parser.add_argument('--emergency', type=float, default=0.01)
+    parser.add_argument('--llm', type=float, default=1.0)
+    parser.add_argument('--match', type=float, default=0.3)
+    parser.add_argument('--reports', type=int, default=3)
+    args = parser.parse_args()
+    run(args.lookup, args.emergency, args.llm, args.match, args.reports)
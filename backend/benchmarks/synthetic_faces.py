@@ -0,0 +1,75 @@
+"""
+Synthetic face frames for benchmarking the OpenCV face analysis.
+The drawn faces are simple enough to generate at any resolution but are
+still picked up by the Haar cascades used in FaceDetector.
+"""
+
+import base64
+
+import cv2
+import numpy as np
+
+
+def make_face(width=640, height=480, droop=0, seed=0, mouth_droop=0, sag=0):
+    """
+    Draw a grayscale frontal face centered in a width x height frame.
+    `droop` shifts the right eye and brow down by that many pixels,
+    `mouth_droop` the right half of the mouth; `sag` darkens the right
+    cheek by that many gray levels, like a slack side of the face.
+    """
+    rng = np.random.default_rng(seed)
+    img = np.full((height, width), 90, np.uint8)
+    
+    cx, cy = width // 2, height // 2
+    fw = int(min(width, height) * 0.28)
+    fh = int(fw * 1.3)
+    cv2.ellipse(img, (cx, cy), (fw, fh), 0, 0, 360, 185, -1)
+    
+    # Eyes and brows
+    ex = int(fw * 0.42)
+    ey = cy - int(fh * 0.22)
+    eye_axes = (max(2, int(fw * 0.16)), max(2, int(fw * 0.08)))
+    brow_y = ey - int(fh * 0.12)
+    brow_thickness = max(2, fw // 25)
+    for side, offset in ((-1, 0), (1, droop)):
+        x = cx + side * ex
+        cv2.ellipse(img, (x, ey + offset), eye_axes, 0, 0, 360, 40, -1)
+        cv2.line(img, (x - eye_axes[0], brow_y + offset), (x + eye_axes[0], brow_y + offset), 60, brow_thickness)
+    
+    if sag:
+        cheek = np.zeros_like(img)
+        cv2.ellipse(cheek, (cx + int(fw * 0.5), cy + int(fh * 0.25)), (int(fw * 0.35), int(fh * 0.3)), 0, 0, 360, sag, -1)
+        img = cv2.subtract(img, cheek)
+    
+    # Nose and mouth
+    cv2.line(img, (cx, ey + eye_axes[1] * 2), (cx, cy + int(fh * 0.15)), 150, max(2, fw // 30))
+    mouth_axes = (int(fw * 0.4), int(fh * 0.08))
+    mouth_y = cy + int(fh * 0.45)
+    if mouth_droop:
+        # Angles run clockwise from +x: 0-90 is the right half of the lower arc
+        cv2.ellipse(img, (cx, mouth_y + mouth_droop), mouth_axes, 0, 0, 90, 70, max(2, fw // 20))
+        cv2.ellipse(img, (cx, mouth_y), mouth_axes, 0, 90, 180, 70, max(2, fw // 20))
+    else:
+        cv2.ellipse(img, (cx, mouth_y), mouth_axes, 0, 0, 180, 70, max(2, fw // 20))
+    
+    img = cv2.GaussianBlur(img, (0, 0), max(1, fw / 60))
+    noise = rng.normal(0, 4, img.shape)
+    return np.clip(img + noise, 0, 255).astype(np.uint8)
+
+
+def encode_jpeg(gray, quality=80):
+    """Encode a frame the way the browser canvas does (JPEG bytes)"""
+    ok, buf = cv2.imencode('.jpg', cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR), [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError('JPEG encoding failed')
+    return buf.tobytes()
+
+
+def to_data_url(jpeg_bytes):
+    """Wrap JPEG bytes in the data URL format sent by the frontend"""
+    return 'data:image/jpeg;base64,' + base64.b64encode(jpeg_bytes).decode('ascii')
+
+
+def make_session(count=20, width=640, height=480, droop=0):
+    """Frames of one stroke-check session, each with different sensor noise"""
+    return [encode_jpeg(make_face(width, height, droop, seed=i)) for i in range(count)]
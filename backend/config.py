@@ -13,12 +13,124 @@ class Config:
     
     # Google Gemini API
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', 8))  # upstream calls at once
+    GEMINI_MAX_QUEUE = int(os.getenv('GEMINI_MAX_QUEUE', 32))  # calls waiting beyond those
+    GEMINI_TIMEOUT = float(os.getenv('GEMINI_TIMEOUT', 30))  # seconds per call
+    GEMINI_QUEUE_TIMEOUT = float(os.getenv('GEMINI_QUEUE_TIMEOUT', 2))  # seconds to wait for a slot
+    
+    # Gemini response cache. near_duplicate is the shingle Jaccard similarity
+    # needed to reuse a response for a slightly different input (None = exact only).
+    # Medical text stays exact-only: one changed letter or symbol can reverse the meaning
+    # ("hypotension" / "hypertension", "HIV+" / "HIV-").
+    GEMINI_CACHE_ENABLED = os.getenv('GEMINI_CACHE_ENABLED', 'true').lower() == 'true'
+    GEMINI_CACHE_POLICIES = {
+        'analyze_symptoms': {'ttl': 6 * 3600, 'max_entries': 1000, 'near_duplicate': None},
+        'translate_medical_terms': {'ttl': 24 * 3600, 'max_entries': 1000, 'near_duplicate': None},
+        'generate_appointment_summary': {'ttl': 3600, 'max_entries': 200, 'near_duplicate': None},
+        'chat': None  # conversational replies are never reused
+    }
     
     # Google Maps API
     GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
+    PLACES_HTTP_POOL_SIZE = int(os.getenv('PLACES_HTTP_POOL_SIZE', 20))  # kept-alive connections
+    PLACES_HTTP_RETRIES = int(os.getenv('PLACES_HTTP_RETRIES', 2))
+    PLACES_BREAKER_THRESHOLD = int(os.getenv('PLACES_BREAKER_THRESHOLD', 5))  # failed calls before failing fast
+    PLACES_BREAKER_RESET = float(os.getenv('PLACES_BREAKER_RESET', 30))  # seconds before a trial call
+    # (connect, read) seconds per Places endpoint
+    PLACES_TIMEOUTS = {
+        '/nearbysearch/json': (3.05, 6),
+        '/details/json': (3.05, 4)
+    }
+    # Nearby Search paging: up to 20 results per page, 3 pages at most. A next_page_token
+    # becomes valid a moment after it is issued; each attempt waits DELAY seconds first
+    PLACES_MAX_PAGES = int(os.getenv('PLACES_MAX_PAGES', 3))
+    PLACES_MAX_RESULTS = int(os.getenv('PLACES_MAX_RESULTS', 60))  # largest limit a caller may ask for
+    PLACES_PAGE_TOKEN_DELAY = float(os.getenv('PLACES_PAGE_TOKEN_DELAY', 1.0))
+    PLACES_PAGE_TOKEN_ATTEMPTS = int(os.getenv('PLACES_PAGE_TOKEN_ATTEMPTS', 4))
+    # Nearby-search cache, one entry per geohash cell + radius + keyword.
+    # Precision 6 cells are ~1.2 x 0.6 km. Entries older than TTL are still
+    # served for STALE_TTL more seconds while a background refresh runs.
+    PLACES_CACHE_ENABLED = os.getenv('PLACES_CACHE_ENABLED', 'true').lower() == 'true'
+    PLACES_CACHE_PRECISION = int(os.getenv('PLACES_CACHE_PRECISION', 6))
+    PLACES_CACHE_TTL = int(os.getenv('PLACES_CACHE_TTL', 15 * 60))
+    PLACES_CACHE_STALE_TTL = int(os.getenv('PLACES_CACHE_STALE_TTL', 6 * 3600))
+    PLACES_CACHE_MAX_ENTRIES = int(os.getenv('PLACES_CACHE_MAX_ENTRIES', 5000))
+    # Place details cache in MongoDB, plus background prefetch of the nearest
+    # PREFETCH facilities after each nearby search (0 = no prefetch)
+    PLACE_DETAILS_CACHE_ENABLED = os.getenv('PLACE_DETAILS_CACHE_ENABLED', 'true').lower() == 'true'
+    PLACE_DETAILS_TTL = int(os.getenv('PLACE_DETAILS_TTL', 24 * 3600))
+    PLACE_DETAILS_PREFETCH = int(os.getenv('PLACE_DETAILS_PREFETCH', 5))
+    PLACE_DETAILS_WORKERS = int(os.getenv('PLACE_DETAILS_WORKERS', 8))
+    PLACE_DETAILS_BATCH_MAX = int(os.getenv('PLACE_DETAILS_BATCH_MAX', 25))
+    PLACE_DETAILS_DB_TIMEOUT = float(os.getenv('PLACE_DETAILS_DB_TIMEOUT', 0.5))  # seconds per cache read/write
+    PLACE_DETAILS_DB_RETRY = float(os.getenv('PLACE_DETAILS_DB_RETRY', 30))  # seconds MongoDB is skipped after a failure
+    # Offline facility index (CSV or GeoJSON of hospitals; disabled when the file is missing).
+    # fallback = used when the Places API returns nothing, race = also used when the API
+    # has not answered within RACE_TIMEOUT seconds, local = never call the API, off = not loaded
+    FACILITY_INDEX_PATH = os.getenv('FACILITY_INDEX_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'facilities.geojson'))
+    FACILITY_INDEX_MODE = os.getenv('FACILITY_INDEX_MODE', 'race')
+    FACILITY_INDEX_RACE_TIMEOUT = float(os.getenv('FACILITY_INDEX_RACE_TIMEOUT', 0.8))  # plus PLACES_PAGE_TOKEN_DELAY per page after the first
+    # Remote searches still running from races; past this, lookups answer locally without one
+    FACILITY_INDEX_RACE_MAX = int(os.getenv('FACILITY_INDEX_RACE_MAX', PLACES_HTTP_POOL_SIZE))
+    FACILITY_INDEX_CELL_DEGREES = float(os.getenv('FACILITY_INDEX_CELL_DEGREES', 0.1))  # spatial grid cell size
     
     # Flask
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     
     # CORS
-    CORS_ORIGINS = ['http://localhost:3000']
\ No newline at end of file
+    CORS_ORIGINS = ['http://localhost:3000']
+    
+    # Startup: heavy services load lazily unless warmed up at import of app.py
+    WARMUP_ON_STARTUP = os.getenv('WARMUP_ON_STARTUP', 'false').lower() == 'true'
+    WARMUP_FACE_DETECTORS = int(os.getenv('WARMUP_FACE_DETECTORS', 2))  # cascade sets to preload
+    
+    # Face detection
+    # Frames wider than this are downscaled for the face search (0 = full resolution)
+    FACE_DETECTION_WIDTH = int(os.getenv('FACE_DETECTION_WIDTH', 320))
+    FACE_BATCH_MAX_FRAMES = int(os.getenv('FACE_BATCH_MAX_FRAMES', 60))
+    FACE_BATCH_DECODE_WORKERS = int(os.getenv('FACE_BATCH_DECODE_WORKERS', 4))
+    
+    # Face analysis result cache, keyed by image content hash (0 entries = disabled)
+    FACE_CACHE_MAX_ENTRIES = int(os.getenv('FACE_CACHE_MAX_ENTRIES', 512))
+    FACE_CACHE_MAX_BYTES = int(os.getenv('FACE_CACHE_MAX_BYTES', 4 * 1024 * 1024))
+    
+    # Face analysis process pool (0 = analyze inline in the request thread)
+    FACE_POOL_SIZE = int(os.getenv('FACE_POOL_SIZE', 0))
+    FACE_POOL_QUEUE_DEPTH = int(os.getenv('FACE_POOL_QUEUE_DEPTH', 16))  # frames waiting beyond busy workers
+    FACE_POOL_SUBMIT_TIMEOUT = float(os.getenv('FACE_POOL_SUBMIT_TIMEOUT', 0.5))  # seconds to wait for a queue slot
+    FACE_POOL_RESULT_TIMEOUT = float(os.getenv('FACE_POOL_RESULT_TIMEOUT', 10))
+    
+    # Face tracking sessions (live stroke check)
+    FACE_TRACKING_WINDOW = int(os.getenv('FACE_TRACKING_WINDOW', 10))  # frames smoothed
+    FACE_SESSION_TTL = int(os.getenv('FACE_SESSION_TTL', 120))  # idle seconds
+    FACE_MAX_SESSIONS = int(os.getenv('FACE_MAX_SESSIONS', 200))
+    
+    # Symptom report pipeline: threads shared by all reports for the concurrent stages
+    SYMPTOM_PIPELINE_WORKERS = int(os.getenv('SYMPTOM_PIPELINE_WORKERS', 16))
+    
+    # Doctor matching: candidates come from this radius first (distance scores nothing beyond 50 km)
+    DOCTOR_MATCH_RADIUS_KM = float(os.getenv('DOCTOR_MATCH_RADIUS_KM', 50))
+    
+    # In-process doctor directory snapshot (off = every lookup queries MongoDB)
+    DOCTOR_DIRECTORY_ENABLED = os.getenv('DOCTOR_DIRECTORY_ENABLED', 'true').lower() == 'true'
+    DOCTOR_DIRECTORY_CHANGE_STREAMS = os.getenv('DOCTOR_DIRECTORY_CHANGE_STREAMS', 'true').lower() == 'true'
+    DOCTOR_DIRECTORY_POLL_INTERVAL = float(os.getenv('DOCTOR_DIRECTORY_POLL_INTERVAL', 30))  # seconds, without change streams
+    DOCTOR_DIRECTORY_CELL_DEGREES = float(os.getenv('DOCTOR_DIRECTORY_CELL_DEGREES', 0.1))  # spatial grid cell size
+    DOCTOR_NEARBY_MAX_RADIUS_KM = float(os.getenv('DOCTOR_NEARBY_MAX_RADIUS_KM', 100))  # /api/doctors/nearby clamps larger radii
+    
+    # Triage rule tables (emergency keywords, specializations, facility search keywords)
+    RULES_PATH = os.getenv('RULES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules', 'triage_rules.json'))
+    RULES_CHECK_INTERVAL = float(os.getenv('RULES_CHECK_INTERVAL', 5))  # seconds between file checks
+    
+    # Bulk emergency triage (queued offline submissions)
+    EMERGENCY_BULK_MAX_ITEMS = int(os.getenv('EMERGENCY_BULK_MAX_ITEMS', 5000))
+    EMERGENCY_BULK_CHUNK = int(os.getenv('EMERGENCY_BULK_CHUNK', 500))  # verdicts computed per streamed chunk
+    
+    # Deferred AI analysis of symptom reports (background job queue)
+    ANALYSIS_JOB_WORKERS = int(os.getenv('ANALYSIS_JOB_WORKERS', 4))
+    ANALYSIS_JOB_RETRIES = int(os.getenv('ANALYSIS_JOB_RETRIES', 3))
+    ANALYSIS_JOB_RETRY_DELAY = float(os.getenv('ANALYSIS_JOB_RETRY_DELAY', 2))  # seconds, doubled per retry
+    ANALYSIS_WAIT_MAX = float(os.getenv('ANALYSIS_WAIT_MAX', 60))  # longest poll/stream on the analysis endpoint
+    # Pending reports this old at startup lost their job with the last process
+    ANALYSIS_RECOVER_ON_STARTUP = os.getenv('ANALYSIS_RECOVER_ON_STARTUP', 'true').lower() == 'true'
+    ANALYSIS_RECOVER_AFTER = float(os.getenv('ANALYSIS_RECOVER_AFTER', 300))  # seconds
\ No newline at end of file
@@ -1,5 +1,6 @@
 import json
 from utils.db import doctors_collection, init_db
+from utils.geo import geo_point
 from datetime import datetime
 
 def seed_database():
@@ -20,6 +21,7 @@ def seed_database():
         doctor['created_at'] = datetime.utcnow()
         doctor['updated_at'] = datetime.utcnow()
         doctor['user_id'] = None  # Not linked to actual user accounts
+        doctor['location']['geo'] = geo_point(doctor['location'].get('coordinates'))
         doctor['availability'] = {
             'monday': ['09:00-17:00'],
             'tuesday': ['09:00-17:00'],
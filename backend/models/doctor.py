@@ -1,9 +1,11 @@
 from datetime import datetime
+from utils.geo import geo_point
 
 class Doctor:
     @staticmethod
     def create(data):
         """Create doctor profile"""
+        coordinates = data.get('coordinates', {'lat': 0, 'lng': 0})
         doctor = {
             'user_id': data['user_id'],
             'name': data['name'],
@@ -16,7 +18,8 @@ class Doctor:
                 'address': data.get('address'),
                 'city': data.get('city'),
                 'state': data.get('state'),
-                'coordinates': data.get('coordinates', {'lat': 0, 'lng': 0})
+                'coordinates': coordinates,
+                'geo': geo_point(coordinates)  # GeoJSON, 2dsphere-indexed
             },
             'availability': data.get('availability', {}),
             'rating': data.get('rating', 0),
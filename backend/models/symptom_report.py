@@ -15,6 +15,7 @@ class SymptomReport:
             'emergency_type': data.get('emergency_type'),
             'matched_doctor_id': None,
             'ai_analysis': None,
+            'ai_analysis_status': None,  # pending, ready, failed
             'created_at': datetime.utcnow()
         }
         return report
\ No newline at end of file
@@ -1,11 +1,22 @@
 from flask import Blueprint, request, jsonify
 from utils.db import doctors_collection
+from utils.geo import geo_near
+from services.doctor_directory import doctor_directory
 from bson import ObjectId
 import requests
 from config import Config
 
 doctors_bp = Blueprint('doctors', __name__)
 
+def _serialize(doctors):
+    """Copies with string ids (directory documents are shared between requests)"""
+    serialized = []
+    for doctor in doctors:
+        doctor = dict(doctor)
+        doctor['_id'] = str(doctor['_id'])
+        serialized.append(doctor)
+    return serialized
+
 @doctors_bp.route('/', methods=['GET'])
 @doctors_bp.route('', methods=['GET'])
 def get_doctors():
@@ -13,16 +24,18 @@ def get_doctors():
     try:
         specialization = request.args.get('specialization')
         
+        if doctor_directory is not None:
+            snapshot = doctor_directory.snapshot
+            doctors = snapshot.specialization([specialization]) if specialization else snapshot.doctors
+            return jsonify({'success': True, 'doctors': _serialize(doctors[:50])}), 200
+        
         query = {}
         if specialization:
             query['specialization'] = specialization
         
         doctors = list(doctors_collection.find(query).limit(50))
         
-        for doctor in doctors:
-            doctor['_id'] = str(doctor['_id'])
-        
-        return jsonify({'success': True, 'doctors': doctors}), 200
+        return jsonify({'success': True, 'doctors': _serialize(doctors)}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
@@ -33,6 +46,10 @@ def search_doctors():
         specialization = request.args.get('specialization')
         city = request.args.get('city')
         
+        if doctor_directory is not None:
+            doctors = doctor_directory.snapshot.search(specialization, city, limit=50)
+            return jsonify({'success': True, 'doctors': _serialize(doctors)}), 200
+        
         query = {}
         if specialization:
             query['specialization'] = {'$regex': specialization, '$options': 'i'}
@@ -41,13 +58,17 @@ def search_doctors():
         
         doctors = list(doctors_collection.find(query).limit(50))
         
-        for doctor in doctors:
-            doctor['_id'] = str(doctor['_id'])
-        
-        return jsonify({'success': True, 'doctors': doctors}), 200
+        return jsonify({'success': True, 'doctors': _serialize(doctors)}), 200
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@doctors_bp.route('/directory/stats', methods=['GET'])
+def get_directory_stats():
+    """In-memory directory snapshot: size, version stamp, refresh mode"""
+    if doctor_directory is None:
+        return jsonify({'success': True, 'enabled': False}), 200
+    return jsonify({'success': True, 'enabled': True, **doctor_directory.stats()}), 200
+
 @doctors_bp.route('/<doctor_id>', methods=['GET'])
 def get_doctor(doctor_id):
     """Get specific doctor"""
@@ -62,43 +83,47 @@ def get_doctor(doctor_id):
 
 @doctors_bp.route('/nearby', methods=['POST'])
 def find_nearby_doctors():
-    """Find doctors nearby using Google Maps API"""
+    """Find doctors nearby, nearest first (directory grid, or the location.geo 2dsphere index)"""
     try:
         data = request.json
         lat = data.get('lat')
         lng = data.get('lng')
-        radius = data.get('radius', 5000)  # 5km default
         specialization = data.get('specialization')
         
-        # Query local database first
-        doctors = list(doctors_collection.find())
+        if lat is None or lng is None:
+            return jsonify({'success': False, 'error': 'lat and lng are required'}), 400
         
-        # Calculate distances and filter
-        nearby_doctors = []
-        for doctor in doctors:
-            doc_coords = doctor.get('location', {}).get('coordinates', {})
-            doc_lat = doc_coords.get('lat', 0)
-            doc_lng = doc_coords.get('lng', 0)
-            
-            # Simple distance calculation (for demo)
-            distance = ((lat - doc_lat)**2 + (lng - doc_lng)**2)**0.5 * 111  # Rough km
-            
-            if distance <= radius / 1000:
-                doctor['distance'] = round(distance, 2)
-                doctor['_id'] = str(doctor['_id'])
-                
-                if specialization:
-                    if doctor.get('specialization') == specialization:
-                        nearby_doctors.append(doctor)
-                else:
-                    nearby_doctors.append(doctor)
+        try:
+            radius = min(float(data.get('radius', 5000)), Config.DOCTOR_NEARBY_MAX_RADIUS_KM * 1000)  # 5km default
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'error': 'radius must be a number of meters'}), 400
+        if not radius > 0:
+            return jsonify({'success': False, 'error': 'radius must be a number of meters'}), 400
         
-        nearby_doctors.sort(key=lambda x: x.get('distance', float('inf')))
+        if doctor_directory is not None:
+            # Grid lookup in the in-memory directory, nearest first
+            nearby_doctors = []
+            for doctor, distance in doctor_directory.snapshot.near(lat, lng, radius / 1000):
+                if specialization and doctor.get('specialization') != specialization:
+                    continue
+                nearby_doctors.append({**doctor, 'distance': distance})
+                if len(nearby_doctors) == 10:
+                    break
+        else:
+            query = {'specialization': specialization} if specialization else None
+            nearby_doctors = list(doctors_collection.aggregate([
+                geo_near(lat, lng, radius / 1000, query),
+                {'$limit': 10}
+            ]))
+        
+        nearby_doctors = _serialize(nearby_doctors)
+        for doctor in nearby_doctors:
+            doctor['distance'] = round(doctor['distance'], 2)
         
         return jsonify({
             'success': True,
-            'doctors': nearby_doctors[:10]
+            'doctors': nearby_doctors
         }), 200
         
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'success': False, 'error': str(e)}), 500
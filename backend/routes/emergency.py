@@ -1,4 +1,6 @@
-from flask import Blueprint, request, jsonify
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from config import Config
 from services.emergency_detector import EmergencyDetector
 from services.stroke_summary_generator import StrokeSummaryGenerator
 from models.stroke_incident import StrokeIncident
@@ -52,6 +54,68 @@ def detect_emergency():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@emergency_bp.route('/detect-bulk', methods=['POST'])
+def detect_emergency_bulk():
+    """
+    Triage many queued symptom submissions in one request.
+    Body: {"submissions": [{"id": ..., "symptoms": [...]}, ...]} (a bare
+    symptom list per submission also works). Responds with NDJSON, one
+    verdict per line in submission order, streamed as chunks are ready.
+    A submission whose symptoms are not a list of strings gets an "error"
+    line instead of a verdict; the rest are still triaged.
+    """
+    try:
+        data = request.json
+        submissions = data.get('submissions') if isinstance(data, dict) else None
+        
+        if not isinstance(submissions, list):
+            return jsonify({'success': False, 'error': 'submissions list is required'}), 400
+        if len(submissions) > Config.EMERGENCY_BULK_MAX_ITEMS:
+            return jsonify({
+                'success': False,
+                'error': f'At most {Config.EMERGENCY_BULK_MAX_ITEMS} submissions per request'
+            }), 413
+        
+        ids = []
+        symptom_lists = []  # None where the submission is malformed
+        for submission in submissions:
+            submission_id = None
+            if isinstance(submission, dict):
+                submission_id = submission.get('id')
+                submission = submission.get('symptoms')
+            if isinstance(submission, str):
+                submission = [submission]
+            elif submission is None:
+                submission = []
+            ids.append(submission_id)
+            valid = isinstance(submission, list) and all(isinstance(symptom, str) for symptom in submission)
+            symptom_lists.append(submission if valid else None)
+        
+        def verdict(index, result):
+            if result is None:
+                return {'index': index, 'id': ids[index], 'error': 'symptoms must be a list of strings'}
+            return {
+                'index': index,
+                'id': ids[index],
+                'emergency_detected': result['is_emergency'],
+                'details': result
+            }
+        
+        def lines():
+            chunk = Config.EMERGENCY_BULK_CHUNK
+            for start in range(0, len(symptom_lists), chunk):
+                batch = symptom_lists[start:start + chunk]
+                results = iter(EmergencyDetector.detect_emergency_batch([s for s in batch if s is not None]))
+                yield ''.join(
+                    json.dumps(verdict(start + offset, None if symptoms is None else next(results))) + '\n'
+                    for offset, symptoms in enumerate(batch)
+                )
+        
+        return Response(stream_with_context(lines()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @emergency_bp.route('/contacts', methods=['GET'])
 def get_emergency_contacts():
     """Get emergency contacts and numbers"""
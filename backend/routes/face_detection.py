@@ -1,35 +1,225 @@
 from flask import Blueprint, request, jsonify
-from services.face_detector import face_detector
+from services.face_detector import borrow_face_detector, result_cache
+from services.face_tracking import face_sessions
+from services.face_detector_pool import get_face_pool, PoolBusyError
+from config import Config
 
 face_detection_bp = Blueprint('face_detection', __name__)
 
+def _upload_buffer(file_storage):
+    """Return the uploaded file's bytes, without copying when it is held in memory"""
+    stream = file_storage.stream
+    if hasattr(stream, 'getbuffer'):
+        return stream.getbuffer()
+    return file_storage.read()
+
+def _is_raw_upload():
+    """True for application/octet-stream or image/* request bodies"""
+    mimetype = request.mimetype or ''
+    return mimetype == 'application/octet-stream' or mimetype.startswith('image/')
+
+def _busy_response():
+    response = jsonify({
+        'success': False,
+        'error': 'Face analysis is busy, please retry'
+    })
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+def _read_frame():
+    """
+    Read a single frame from the request.
+    Returns (image, is_base64), or (None, False) when no image was sent.
+    Accepts:
+      - JSON: { "image": "data:image/jpeg;base64,..." }
+      - multipart/form-data with an "image" file field
+      - raw JPEG/PNG body (application/octet-stream or image/*)
+    """
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('image')
+        return (_upload_buffer(upload), False) if upload is not None else (None, False)
+    
+    if _is_raw_upload():
+        body = request.get_data(cache=False)
+        return (memoryview(body), False) if body else (None, False)
+    
+    data = request.json
+    if not data or 'image' not in data:
+        return None, False
+    return data['image'], True
+
 @face_detection_bp.route('/analyze', methods=['POST'])
 def analyze_face():
     """
-    Analyze face from base64 image
-    Expects: { "image": "data:image/jpeg;base64,..." }
+    Analyze face from an image
+    Expects a JSON base64 image, a multipart "image" file or a raw JPEG/PNG body
     """
     try:
-        data = request.json
-        if not data or 'image' not in data:
+        image, is_base64 = _read_frame()
+        if image is None:
             return jsonify({
                 'success': False,
                 'error': 'No image provided'
             }), 400
         
-        result = face_detector.detect_face_from_base64(data['image'])
+        face_pool = get_face_pool()
+        if face_pool is not None:
+            result = face_pool.detect(image, is_base64)
+        else:
+            with borrow_face_detector() as face_detector:
+                if is_base64:
+                    result = face_detector.detect_face_from_base64(image)
+                else:
+                    result = face_detector.detect_face_from_bytes(image)
         
         if result['success']:
             return jsonify(result), 200
         else:
             return jsonify(result), 200  # Still return 200 but with success: false
             
+    except PoolBusyError:
+        return _busy_response()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@face_detection_bp.route('/analyze-batch', methods=['POST'])
+def analyze_face_batch():
+    """
+    Analyze many frames from one assessment in a single request
+    Expects one of:
+      - JSON: { "images": ["data:image/jpeg;base64,...", ...] }
+      - multipart/form-data with one or more "images" file fields
+    """
+    try:
+        if request.mimetype == 'multipart/form-data':
+            images = [_upload_buffer(upload) for upload in request.files.getlist('images')]
+        else:
+            data = request.json
+            images = data.get('images') if data else None
+        
+        if not images or not isinstance(images, list):
+            return jsonify({
+                'success': False,
+                'error': 'No images provided'
+            }), 400
+        
+        if len(images) > Config.FACE_BATCH_MAX_FRAMES:
+            return jsonify({
+                'success': False,
+                'error': f'Too many frames (max {Config.FACE_BATCH_MAX_FRAMES})'
+            }), 413
+        
+        face_pool = get_face_pool()
+        if face_pool is not None:
+            result = face_pool.detect_batch(images)
+        else:
+            with borrow_face_detector() as face_detector:
+                result = face_detector.detect_faces_batch(
+                    images,
+                    max_workers=Config.FACE_BATCH_DECODE_WORKERS
+                )
+        return jsonify(result), 200
+        
+    except PoolBusyError:
+        return _busy_response()
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@face_detection_bp.route('/sessions', methods=['POST'])
+def create_tracking_session():
+    """
+    Start a live tracking session. Frames posted to the session reuse the
+    previous face box as the search window and get rolling-window scores.
+    """
+    session = face_sessions.create()
+    if session is None:
+        return jsonify({
+            'success': False,
+            'error': 'Too many active sessions'
+        }), 503
+    
+    return jsonify({
+        'success': True,
+        'session_id': session.session_id,
+        'window': face_sessions.window
+    }), 201
+
+@face_detection_bp.route('/sessions/<session_id>/frames', methods=['POST'])
+def analyze_session_frame(session_id):
+    """
+    Analyze the next frame of a tracking session
+    Expects a JSON base64 image, a multipart "image" file or a raw JPEG/PNG body
+    """
+    try:
+        session = face_sessions.get(session_id)
+        if session is None:
+            return jsonify({
+                'success': False,
+                'error': 'Session not found or expired'
+            }), 404
+        
+        image, is_base64 = _read_frame()
+        if image is None:
+            return jsonify({
+                'success': False,
+                'error': 'No image provided'
+            }), 400
+        
+        if is_base64:
+            result = session.process_base64(image)
+        else:
+            result = session.process_bytes(image)
+        
+        return jsonify(result), 200
+        
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@face_detection_bp.route('/sessions/<session_id>', methods=['GET'])
+def get_tracking_session(session_id):
+    """Get frame counts and smoothed scores for a session"""
+    session = face_sessions.get(session_id)
+    if session is None:
+        return jsonify({
+            'success': False,
+            'error': 'Session not found or expired'
+        }), 404
+    
+    return jsonify({'success': True, **session.stats()}), 200
+
+@face_detection_bp.route('/sessions/<session_id>', methods=['DELETE'])
+def close_tracking_session(session_id):
+    """End a tracking session and return its final smoothed scores"""
+    session = face_sessions.close(session_id)
+    if session is None:
+        return jsonify({
+            'success': False,
+            'error': 'Session not found or expired'
+        }), 404
+    
+    return jsonify({'success': True, **session.stats()}), 200
+
+@face_detection_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Hit/miss counters and size of the face analysis result cache"""
+    if result_cache is None:
+        return jsonify({'success': True, 'enabled': False}), 200
+    
+    return jsonify({
+        'success': True,
+        'enabled': True,
+        **result_cache.stats()
+    }), 200
+
 @face_detection_bp.route('/test', methods=['GET'])
 def test():
     """Test endpoint"""
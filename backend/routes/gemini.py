@@ -1,8 +1,53 @@
-from flask import Blueprint, request, jsonify
-from services.gemini_service import GeminiService
+import json
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from services.gemini_service import GeminiService, llm_executor, response_cache
+from services.llm_executor import LLMBusyError
 
 gemini_bp = Blueprint('gemini', __name__)
 
+def _wants_stream(data):
+    """Streaming is opt-in: ?stream=1, {"stream": true} or Accept: text/event-stream"""
+    if request.args.get('stream') in ('1', 'true') or data.get('stream') is True:
+        return True
+    return request.accept_mimetypes.best == 'text/event-stream'
+
+def _sse(payload, event=None):
+    head = f"event: {event}\n" if event else ''
+    return f"{head}data: {json.dumps(payload)}\n\n"
+
+def _stream_chat(message, user_context):
+    """
+    Server-sent events: one `data: {"text": ...}` per chunk, then a `done`
+    or `error` event. A client that disconnects closes the generator,
+    which stops reading from the model.
+    """
+    chunks = GeminiService.chat_stream(message, user_context)
+    
+    # Pull the first chunk before committing to a 200 so a full executor
+    # still gets a proper 503
+    try:
+        first = next(chunks, None)
+    except LLMBusyError as e:
+        return jsonify({'success': False, 'error': str(e)}), 503, {'Retry-After': '1'}
+    
+    def events():
+        try:
+            if first is not None:
+                yield _sse({'text': first})
+            for text in chunks:
+                yield _sse({'text': text})
+            yield _sse({'success': True}, event='done')
+        except Exception as e:
+            yield _sse({'success': False, 'error': str(e)}, event='error')
+        finally:
+            chunks.close()
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @gemini_bp.route('/chat', methods=['POST'])
 def chat():
     """Chat with Gemini AI assistant"""
@@ -19,13 +64,26 @@ def chat():
             'medications': data.get('medications', [])
         }
         
+        if _wants_stream(data):
+            return _stream_chat(message, user_context)
+        
         result = GeminiService.chat(message, user_context)
         
         if result['success']:
             return jsonify(result), 200
+        elif result.get('busy'):
+            return jsonify(result), 503, {'Retry-After': '1'}
         else:
             return jsonify(result), 500
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@gemini_bp.route('/stats', methods=['GET'])
+def get_stats():
+    """Response cache hit rates and latency saved, plus execution layer counters"""
+    return jsonify({
+        'success': True,
+        'cache': response_cache.stats(),
+        'executor': llm_executor.stats()
+    }), 200
@@ -1,8 +1,20 @@
 from flask import Blueprint, request, jsonify
-from services.google_places_service import GooglePlacesService
+from config import Config
+from services.facility_index import facility_index
+from services.google_places_service import GooglePlacesService, place_details_cache, places_cache
 
 places_bp = Blueprint('places', __name__)
 
+def _result_options(data):
+    """(limit, pages, error) from the request body; error is None when both are valid"""
+    limit = data.get('limit', 10)
+    pages = data.get('pages', 1)
+    if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= Config.PLACES_MAX_RESULTS:
+        return None, None, f'limit must be an integer from 1 to {Config.PLACES_MAX_RESULTS}'
+    if not isinstance(pages, int) or isinstance(pages, bool) or not 1 <= pages <= Config.PLACES_MAX_PAGES:
+        return None, None, f'pages must be an integer from 1 to {Config.PLACES_MAX_PAGES}'
+    return limit, pages, None
+
 @places_bp.route('/nearby-hospitals', methods=['POST'])
 def find_nearby_hospitals():
     """Find nearby hospitals based on user location"""
@@ -19,8 +31,12 @@ def find_nearby_hospitals():
                 'error': 'Latitude and longitude are required'
             }), 400
         
+        limit, pages, error = _result_options(data)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        
         facilities = GooglePlacesService.find_nearby_hospitals(
-            latitude, longitude, radius, keyword
+            latitude, longitude, radius, keyword, limit, pages
         )
         
         return jsonify({
@@ -48,8 +64,12 @@ def find_specialized_facilities():
                 'error': 'Latitude and longitude are required'
             }), 400
         
+        limit, pages, error = _result_options(data)
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        
         facilities = GooglePlacesService.find_specialized_facilities(
-            latitude, longitude, specialization, radius
+            latitude, longitude, specialization, radius, limit, pages
         )
         
         return jsonify({
@@ -62,6 +82,35 @@ def find_specialized_facilities():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@places_bp.route('/place-details/batch', methods=['POST'])
+def get_places_details():
+    """Get details for several places in one call"""
+    try:
+        data = request.json or {}
+        place_ids = data.get('place_ids')
+        
+        if not isinstance(place_ids, list) or not place_ids or not all(isinstance(p, str) and p for p in place_ids):
+            return jsonify({
+                'success': False,
+                'error': 'place_ids must be a non-empty list of place IDs'
+            }), 400
+        if len(place_ids) > Config.PLACE_DETAILS_BATCH_MAX:
+            return jsonify({
+                'success': False,
+                'error': f'At most {Config.PLACE_DETAILS_BATCH_MAX} place IDs per request'
+            }), 400
+        
+        details = GooglePlacesService.get_places_details(place_ids)
+        
+        return jsonify({
+            'success': True,
+            'details': details,
+            'missing': [place_id for place_id in dict.fromkeys(place_ids) if place_id not in details]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @places_bp.route('/place-details/<place_id>', methods=['GET'])
 def get_place_details(place_id):
     """Get detailed information about a specific place"""
@@ -81,3 +130,15 @@ def get_place_details(place_id):
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
+
+@places_bp.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Counters of the nearby-search and place details caches and the local facility index"""
+    return jsonify({
+        'success': True,
+        'nearby': {'enabled': False} if places_cache is None else {'enabled': True, **places_cache.stats()},
+        'details': {'enabled': False} if place_details_cache is None else {'enabled': True, **place_details_cache.stats()},
+        'local_index': {'enabled': False} if facility_index is None else {
+            'enabled': True, 'mode': Config.FACILITY_INDEX_MODE, **facility_index.stats()
+        }
+    }), 200
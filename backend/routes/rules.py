@@ -0,0 +1,20 @@
+from flask import Blueprint, jsonify
+from services.rule_engine import rule_engine
+
+rules_bp = Blueprint('rules', __name__)
+
+@rules_bp.route('/metrics', methods=['GET'])
+def get_rule_metrics():
+    """Live rule version, reload counters and per-rule hit counts"""
+    return jsonify({'success': True, **rule_engine.metrics()}), 200
+
+@rules_bp.route('/reload', methods=['POST'])
+def reload_rules():
+    """Reload the rule file now instead of waiting for the next mtime check"""
+    if rule_engine.reload():
+        return jsonify({'success': True, 'version': rule_engine.rules.version}), 200
+    return jsonify({
+        'success': False,
+        'error': rule_engine.last_error,
+        'version': rule_engine.rules.version
+    }), 422
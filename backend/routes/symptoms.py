@@ -1,9 +1,10 @@
-from flask import Blueprint, request, jsonify
-from utils.db import symptom_reports_collection, users_collection
+import json
+import time
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from config import Config
+from utils.db import symptom_reports_collection
 from models.symptom_report import SymptomReport
-from services.gemini_service import GeminiService
-from services.emergency_detector import EmergencyDetector
-from services.doctor_matcher import DoctorMatcher
+from services.symptom_pipeline import symptom_pipeline, analysis_jobs
 from bson import ObjectId
 from datetime import datetime
 
@@ -11,56 +12,133 @@ symptoms_bp = Blueprint('symptoms', __name__)
 
 @symptoms_bp.route('/report', methods=['POST'])
 def create_symptom_report():
-    """Create new symptom report and analyze"""
+    """
+    Create new symptom report and analyze.
+    With "defer_analysis": true the report, emergency verdict and doctors
+    come back at once and the AI analysis is produced in the background;
+    fetch it from /report/<report_id>/analysis.
+    """
     try:
         data = request.json
-        user_id = data.get('user_id')
-        
-        # Get user's medical history
-        user = users_collection.find_one({'_id': ObjectId(user_id)})
-        medical_history = user.get('medical_history', []) if user else []
+        defer_analysis = data.get('defer_analysis') is True
         
         # Create symptom report
         report_data = SymptomReport.create(data)
         
-        # Check for emergency
-        emergency_check = EmergencyDetector.detect_emergency(data.get('symptoms', []))
+        # User lookup + AI analysis, emergency check and doctor match run concurrently
+        result = symptom_pipeline.run(data, report_data, analyze=not defer_analysis)
+        emergency_check = result['emergency']
+        ai_result = result['ai_result']
+        matched_doctors = result['matched_doctors']
+        
         report_data['emergency_detected'] = emergency_check['is_emergency']
         report_data['emergency_type'] = emergency_check.get('emergencies', [{}])[0].get('type') if emergency_check['is_emergency'] else None
         
-        # AI analysis of symptoms
-        ai_result = GeminiService.analyze_symptoms(
-            data.get('symptoms', []),
-            medical_history
-        )
-        
-        if ai_result['success']:
+        if defer_analysis:
+            report_data['ai_analysis_status'] = 'pending'
+        elif ai_result['success']:
             report_data['ai_analysis'] = ai_result['analysis']
+            report_data['ai_analysis_status'] = 'ready'
+        else:
+            report_data['ai_analysis_status'] = 'failed'
         
         # Insert report
         result = symptom_reports_collection.insert_one(report_data)
         report_id = str(result.inserted_id)
         
-        # Match with doctor if not emergency
-        matched_doctors = []
-        if not emergency_check['is_emergency']:
-            user_location = data.get('location')
-            matched_doctors = DoctorMatcher.match_doctor(report_data, user_location)
-            
-            for doctor in matched_doctors:
-                doctor['_id'] = str(doctor['_id'])
+        if defer_analysis:
+            analysis_jobs.enqueue(
+                'analyze_report', report_id,
+                report_id=report_id,
+                user_id=data.get('user_id'),
+                symptoms=data.get('symptoms', [])
+            )
         
         return jsonify({
             'success': True,
             'report_id': report_id,
             'emergency': emergency_check,
-            'ai_analysis': ai_result.get('analysis'),
+            'ai_analysis': ai_result.get('analysis') if ai_result else None,
+            'ai_analysis_status': report_data['ai_analysis_status'],
             'matched_doctors': matched_doctors
         }), 201
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _analysis_state(report_id):
+    report = symptom_reports_collection.find_one(
+        {'_id': ObjectId(report_id)},
+        {'ai_analysis': 1, 'ai_analysis_status': 1, 'ai_analysis_error': 1}
+    )
+    if not report:
+        return None
+    return {
+        'report_id': report_id,
+        'status': report.get('ai_analysis_status') or ('ready' if report.get('ai_analysis') else 'failed'),
+        'ai_analysis': report.get('ai_analysis'),
+        'error': report.get('ai_analysis_error')
+    }
+
+def _stream_analysis(report_id, timeout):
+    """Server-sent events: the current state, then the final one once the job finishes"""
+    def events():
+        deadline = time.monotonic() + timeout
+        state = _analysis_state(report_id)
+        yield f"data: {json.dumps(state)}\n\n"
+        while state['status'] == 'pending' and time.monotonic() < deadline:
+            # In-process jobs wake us as soon as they finish; otherwise re-read every couple of seconds
+            pause = min(2, max(0, deadline - time.monotonic()))
+            job = analysis_jobs.wait(report_id, timeout=pause)
+            state = _analysis_state(report_id)
+            if state['status'] != 'pending':
+                yield f"data: {json.dumps(state)}\n\n"
+                break
+            yield ": waiting\n\n"
+            if job is None or job.finished.is_set():
+                time.sleep(pause)
+        yield "event: done\ndata: {}\n\n"
+    
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@symptoms_bp.route('/report/<report_id>/analysis', methods=['GET'])
+def get_report_analysis(report_id):
+    """
+    AI analysis status of a report: pending, ready or failed.
+    ?wait=<seconds> long-polls while pending; Accept: text/event-stream
+    (or ?stream=1) streams the result when it lands.
+    """
+    try:
+        try:
+            wait = min(float(request.args.get('wait', 0)), Config.ANALYSIS_WAIT_MAX)
+        except ValueError:
+            return jsonify({'success': False, 'error': 'wait must be a number of seconds'}), 400
+        if not wait >= 0:
+            return jsonify({'success': False, 'error': 'wait must be a number of seconds'}), 400
+        
+        state = _analysis_state(report_id)
+        if state is None:
+            return jsonify({'success': False, 'error': 'Report not found'}), 404
+        
+        if request.args.get('stream') in ('1', 'true') or request.accept_mimetypes.best == 'text/event-stream':
+            return _stream_analysis(report_id, Config.ANALYSIS_WAIT_MAX)
+        
+        if state['status'] == 'pending' and wait > 0:
+            analysis_jobs.wait(report_id, timeout=wait)
+            state = _analysis_state(report_id)
+        
+        job = analysis_jobs.get(report_id)
+        if job is not None:
+            state['attempts'] = job.attempts
+        
+        return jsonify({'success': True, **state}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @symptoms_bp.route('/<user_id>/history', methods=['GET'])
 def get_symptom_history(user_id):
     """Get user's symptom report history"""
@@ -0,0 +1,197 @@
+"""
+In-process, read-only snapshot of the doctor directory.
+
+The directory is seeded once and then almost only read, so request
+threads query an immutable DirectorySnapshot (indexes by specialization
+and city, plus a lat/lng grid) instead of MongoDB. A background thread
+rebuilds the snapshot when the collection changes - via a change stream
+when the deployment supports one, otherwise by polling a cheap version
+stamp - and publishes it with one reference assignment, so readers never
+take a lock. Documents in a snapshot are shared: hand out copies before
+adding per-request fields.
+"""
+
+import math
+import re
+import threading
+import time
+
+import pymongo
+
+from config import Config
+from utils.db import doctors_collection
+from utils.geo import grid_cells, haversine_km
+
+
+class DirectorySnapshot:
+    def __init__(self, doctors, version=None, cell_degrees=0.1):
+        self.doctors = doctors  # load (natural) order, shared and read-only
+        self.version = version
+        self.loaded_at = time.time()
+        self.cell_degrees = cell_degrees
+        
+        self.by_specialization = {}
+        self.by_city = {}
+        self.grid = {}
+        for i, doctor in enumerate(doctors):
+            self.by_specialization.setdefault(doctor.get('specialization'), []).append(i)
+            location = doctor.get('location') or {}
+            city = location.get('city')
+            if city:
+                self.by_city.setdefault(city.lower(), []).append(i)
+            coordinates = location.get('coordinates') or {}
+            lat, lng = coordinates.get('lat'), coordinates.get('lng')
+            if lat and lng:
+                self.grid.setdefault(self._cell(lat, lng), []).append(i)
+    
+    def _cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees))
+    
+    def specialization(self, specializations):
+        """Doctors in any of the specializations, in load order"""
+        indexes = sorted(i for spec in specializations for i in self.by_specialization.get(spec, ()))
+        return [self.doctors[i] for i in indexes]
+    
+    def search(self, specialization=None, city=None, limit=50):
+        """Case-insensitive pattern match on specialization and city, like the $regex query"""
+        indexes = None
+        if specialization:
+            pattern = re.compile(specialization, re.IGNORECASE)
+            indexes = {i for spec, found in self.by_specialization.items()
+                       if spec and pattern.search(spec) for i in found}
+        if city:
+            pattern = re.compile(city, re.IGNORECASE)
+            in_city = {i for name, found in self.by_city.items() if pattern.search(name) for i in found}
+            indexes = in_city if indexes is None else indexes & in_city
+        if indexes is None:
+            return self.doctors[:limit]
+        return [self.doctors[i] for i in sorted(indexes)[:limit]]
+    
+    def near(self, lat, lng, radius_km):
+        """(doctor, distance_km) within radius_km, nearest first, from the grid cells the radius touches"""
+        cells = grid_cells(self.grid, self.cell_degrees, lat, lng, radius_km)
+        
+        found = []
+        for cell in cells:
+            for i in self.grid.get(cell, ()):
+                coordinates = self.doctors[i]['location']['coordinates']
+                distance = haversine_km(lat, lng, coordinates['lat'], coordinates['lng'])
+                if distance <= radius_km:
+                    found.append((distance, i))
+        found.sort()
+        return [(self.doctors[i], distance) for distance, i in found]
+
+
+def _load_doctors():
+    return list(doctors_collection.find())
+
+
+def _version_stamp():
+    """Changes on insert (newest _id), delete (count) and update (newest updated_at)"""
+    newest = doctors_collection.find_one(sort=[('_id', pymongo.DESCENDING)], projection={'_id': 1})
+    updated = doctors_collection.find_one(sort=[('updated_at', pymongo.DESCENDING)], projection={'updated_at': 1})
+    return (
+        doctors_collection.count_documents({}),
+        newest and newest['_id'],
+        updated and updated.get('updated_at')
+    )
+
+
+class DoctorDirectory:
+    def __init__(self, loader=_load_doctors, stamp=_version_stamp, watch=doctors_collection.watch,
+                 poll_interval=30, cell_degrees=0.1):
+        self.loader = loader
+        self.stamp = stamp
+        self.watch = watch
+        self.poll_interval = poll_interval
+        self.cell_degrees = cell_degrees
+        self.mode = None  # change_stream or polling, once started
+        self.refreshes = 0
+        self.last_error = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+    
+    @property
+    def snapshot(self):
+        """Current snapshot; the first call loads it and starts the refresher"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self.refresh()
+                    self._start()
+                snapshot = self._snapshot
+        return snapshot
+    
+    def refresh(self):
+        stamp = self.stamp() if self.stamp else None
+        self._snapshot = DirectorySnapshot(self.loader(), stamp, self.cell_degrees)
+        self.refreshes += 1
+        return self._snapshot
+    
+    def _start(self):
+        if self._thread is None and (self.watch or self.poll_interval):
+            self._thread = threading.Thread(target=self._run, name='doctor-directory', daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        if self.watch:
+            try:
+                self.mode = 'change_stream'
+                with self.watch() as stream:
+                    # Catch writes that landed between the first load and opening the stream
+                    if self.stamp and self.stamp() != self._snapshot.version:
+                        self._refresh_safely()
+                    while not self._stop.is_set():
+                        # try_next returns None when idle, letting us notice stop()
+                        if stream.try_next() is not None:
+                            self._refresh_safely()
+                return
+            except Exception as e:
+                # Standalone servers have no change streams; any other failure
+                # must not end the thread either, so both fall back to polling
+                self._failed('Doctor directory change stream failed, polling instead', e)
+        self.mode = 'polling'
+        while not self._stop.wait(self.poll_interval):
+            try:
+                if self.stamp() != self._snapshot.version:
+                    self._refresh_safely()
+            except Exception as e:
+                self._failed('Doctor directory version check failed', e)
+    
+    def _refresh_safely(self):
+        try:
+            self.refresh()
+            self.last_error = None
+        except Exception as e:
+            # Keep serving the previous snapshot
+            self._failed('Doctor directory refresh failed', e)
+    
+    def _failed(self, message, error):
+        self.last_error = str(error)
+        print(f"{message}: {str(error)}")
+    
+    def stop(self):
+        self._stop.set()
+    
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            'loaded': snapshot is not None,
+            'doctors': len(snapshot.doctors) if snapshot else 0,
+            'version': repr(snapshot.version) if snapshot else None,
+            'loaded_at': snapshot.loaded_at if snapshot else None,
+            'mode': self.mode,
+            'refreshes': self.refreshes,
+            'last_error': self.last_error
+        }
+
+
+# None when DOCTOR_DIRECTORY_ENABLED is off: callers query MongoDB directly
+doctor_directory = DoctorDirectory(
+    poll_interval=Config.DOCTOR_DIRECTORY_POLL_INTERVAL,
+    watch=doctors_collection.watch if Config.DOCTOR_DIRECTORY_CHANGE_STREAMS else None,
+    cell_degrees=Config.DOCTOR_DIRECTORY_CELL_DEGREES
+) if Config.DOCTOR_DIRECTORY_ENABLED else None
@@ -1,4 +1,9 @@
 from utils.db import doctors_collection
+from utils.geo import geo_near
+from services.rule_engine import rule_engine
+from services.doctor_scoring import DISTANCE_POINTS, RATING_POINTS, match_scores, top_k
+from services.doctor_directory import doctor_directory
+from config import Config
 import math
 
 class DoctorMatcher:
@@ -22,50 +27,82 @@ class DoctorMatcher:
         specializations = DoctorMatcher._determine_specialization(symptoms, ai_analysis)
         
         # Find doctors with matching specializations
-        doctors = list(doctors_collection.find({
-            'specialization': {'$in': specializations}
-        }))
+        doctors = DoctorMatcher._find_candidates(specializations, user_location)
         
         if not doctors:
             # Fallback to general practitioners
-            doctors = list(doctors_collection.find({
-                'specialization': 'General Practice'
-            }))
-        
-        # Calculate match scores
-        for doctor in doctors:
-            score = DoctorMatcher._calculate_match_score(
-                doctor, 
-                specializations, 
-                user_location, 
-                severity
-            )
-            doctor['match_score'] = score
-            
-            # Calculate distance
-            if user_location:
-                doctor_loc = doctor.get('location', {}).get('coordinates', {})
-                distance = DoctorMatcher._calculate_distance(
-                    user_location.get('lat'), 
-                    user_location.get('lng'),
-                    doctor_loc.get('lat', 0),
-                    doctor_loc.get('lng', 0)
-                )
-                doctor['distance'] = distance
-            else:
-                doctor['distance'] = None
-        
-        # Sort by match score (highest first)
-        doctors.sort(key=lambda x: x.get('match_score', 0), reverse=True)
-        
-        # Return top 10 matches
-        return doctors[:10]
+            doctors = DoctorMatcher._find_candidates(['General Practice'], user_location)
+        
+        # Score every candidate in one vectorized pass, then rank only the top 10
+        scores, distances = match_scores(doctors, specializations, user_location)
+        
+        matches = []
+        for i in top_k(scores, 10):
+            # Candidates may be shared snapshot documents
+            doctor = dict(doctors[i])
+            doctor['match_score'] = int(scores[i])
+            # Same haversine distance the score used (inf without coordinates)
+            doctor['distance'] = float(distances[i]) if distances is not None else None
+            matches.append(doctor)
+        
+        return matches
+    
+    @staticmethod
+    def _find_candidates(specializations, user_location, limit=10):
+        """
+        Doctors in the specializations (treat them as read-only).
+        From the in-memory directory when enabled: every one of them, no
+        database round-trip. Otherwise from MongoDB: with a location, those
+        within DOCTOR_MATCH_RADIUS_KM come from a $geoNear on the 2dsphere
+        index, nearest first, and the rest of the specialization is added
+        only where it could still rank (see _outside_query).
+        """
+        if doctor_directory is not None:
+            return doctor_directory.snapshot.specialization(specializations)
+        
+        query = {'specialization': {'$in': specializations}}
+        lat = user_location.get('lat') if user_location else None
+        lng = user_location.get('lng') if user_location else None
+        if not lat or not lng:
+            return list(doctors_collection.find(query))
+        
+        doctors = list(doctors_collection.aggregate([
+            geo_near(lat, lng, Config.DOCTOR_MATCH_RADIUS_KM, query)
+        ]))
+        outside = DoctorMatcher._outside_query(doctors, specializations, user_location, limit)
+        if outside is not None:
+            # Sparse area, doctors without location.geo, or weak nearby scores: top up from the wider pool
+            nearby_ids = [doctor['_id'] for doctor in doctors]
+            doctors += list(doctors_collection.find({**query, **outside, '_id': {'$nin': nearby_ids}}))
+        return doctors
+    
+    @staticmethod
+    def _outside_query(nearby, specializations, user_location, limit):
+        """
+        Filter for the doctors beyond the radius that could still beat the
+        limit-th nearby score, or None when none can. Out there a doctor
+        scores at most 40 (specialization) + the distance points just past
+        the radius + its rating points + 10 (availability), so only ratings
+        worth enough points are fetched. The top scores then match a full
+        scan; which of several equally scored doctors is kept may differ.
+        """
+        if len(nearby) < limit:
+            return {}
+        scores, _ = match_scores(nearby, specializations, user_location)
+        cutoff = scores[top_k(scores, limit)[-1]]
+        radius = Config.DOCTOR_MATCH_RADIUS_KM
+        best_unrated = 40 + next((points for bound, points in DISTANCE_POINTS if bound > radius), 0) + 10
+        if best_unrated > cutoff:
+            return {}
+        ratings = [bound for bound, points in RATING_POINTS if best_unrated + points > cutoff]
+        return {'rating': {'$gte': min(ratings)}} if ratings else None
     
     @staticmethod
     def _calculate_match_score(doctor, needed_specializations, user_location, severity):
         """
         Calculate match score for a doctor
         Score range: 0-100
+        Per-doctor reference for services/doctor_scoring.match_scores
         """
         score = 0
         
@@ -99,7 +136,7 @@ class DoctorMatcher:
             score += 15  # Default if no location
         
         # 3. Rating Score (20 points)
-        rating = doctor.get('rating', 0)
+        rating = doctor.get('rating', 0) or 0
         if rating >= 4.5:
             score += 20
         elif rating >= 4.0:
@@ -119,24 +156,12 @@ class DoctorMatcher:
     @staticmethod
     def _determine_specialization(symptoms, ai_analysis):
         """Determine medical specialization based on symptoms"""
-        symptom_text = ' '.join(symptoms).lower() + ' ' + ai_analysis.lower()
-        
-        specializations = {
-            'Cardiology': ['heart', 'chest pain', 'palpitation', 'blood pressure'],
-            'Neurology': ['headache', 'dizziness', 'numbness', 'stroke', 'seizure'],
-            'Orthopedics': ['bone', 'joint', 'fracture', 'sprain', 'back pain'],
-            'Dermatology': ['skin', 'rash', 'acne', 'itch'],
-            'Pulmonology': ['breathing', 'cough', 'asthma', 'chest'],
-            'Gastroenterology': ['stomach', 'abdominal', 'nausea', 'diarrhea'],
-            'ENT': ['ear', 'nose', 'throat', 'hearing', 'sinus'],
-            'Ophthalmology': ['eye', 'vision', 'sight'],
-            'Pediatrics': ['child', 'infant', 'baby']
-        }
+        symptom_text = ' '.join(symptoms).lower() + ' ' + (ai_analysis or '').lower()
         
-        matches = []
-        for spec, keywords in specializations.items():
-            if any(keyword in symptom_text for keyword in keywords):
-                matches.append(spec)
+        # Keyword table from the triage rule file
+        rules = rule_engine.rules
+        matches = rules.specialization_matcher.categories(symptom_text)
+        rules.record_hits('specializations', matches)
         
         return matches if matches else ['General Practice']
     
@@ -0,0 +1,100 @@
+"""
+Columnar scoring for DoctorMatcher.
+
+Candidate lat/lng, rating, availability and specialization points are
+pulled into NumPy arrays once, then distance and the full match score
+are computed in one vectorized pass. Thresholds and points are the same
+as DoctorMatcher._calculate_match_score, which stays as the per-doctor
+reference; top_k() reproduces the stable "sort by score, keep input
+order on ties" ranking without sorting every candidate.
+"""
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+# (upper bound, points), checked in order like the if/elif chains
+DISTANCE_POINTS = [(5, 30), (10, 25), (20, 15), (50, 5)]
+RATING_POINTS = [(4.5, 20), (4.0, 15), (3.5, 10), (3.0, 5)]
+
+
+_EMPTY = {}
+
+
+def _columns(doctors, needed_specializations):
+    """One pass over the candidate dicts into plain lists, then arrays"""
+    needed = set(needed_specializations)
+    spec_points, lats, lngs, ratings, accepting = [], [], [], [], []
+    for doctor in doctors:
+        specialization = doctor.get('specialization', '')
+        spec_points.append(40 if specialization in needed else 20 if specialization == 'General Practice' else 0)
+        coordinates = doctor.get('location', _EMPTY).get('coordinates', _EMPTY)
+        # Missing coordinates become 0, which the distance treats as unknown
+        lats.append(coordinates.get('lat', 0) or 0)
+        lngs.append(coordinates.get('lng', 0) or 0)
+        ratings.append(doctor.get('rating', 0) or 0)
+        accepting.append(bool(doctor.get('availability', _EMPTY).get('accepting_new_patients', True)))
+    return (
+        np.array(spec_points, dtype=np.int64),
+        np.array(lats, dtype=np.float64),
+        np.array(lngs, dtype=np.float64),
+        np.array(ratings, dtype=np.float64),
+        np.array(accepting, dtype=bool)
+    )
+
+
+def haversine_km(lat, lng, lats, lngs):
+    """Distances from (lat, lng) to each point; inf where any coordinate is 0/missing"""
+    if not lat or not lng:
+        return np.full(len(lats), np.inf)
+    lat1, lng1 = np.radians(lat), np.radians(lng)
+    lat2, lng2 = np.radians(lats), np.radians(lngs)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    distances = EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+    distances[(lats == 0) | (lngs == 0)] = np.inf
+    return distances
+
+
+def _step_points(values, steps, compare):
+    """Points for the first (bound, points) step the value satisfies, else 0"""
+    points = np.zeros(len(values), dtype=np.int64)
+    for bound, step_points in reversed(steps):
+        points[compare(values, bound)] = step_points
+    return points
+
+
+def match_scores(doctors, needed_specializations, user_location):
+    """
+    Integer scores (0-100) for every candidate, plus their distances
+    (None without a user location).
+    """
+    scores, lats, lngs, ratings, accepting = _columns(doctors, needed_specializations)
+    
+    distances = None
+    if user_location:
+        distances = haversine_km(user_location.get('lat'), user_location.get('lng'), lats, lngs)
+        scores += _step_points(distances, DISTANCE_POINTS, np.less)
+    else:
+        scores += 15  # Default if no location
+    
+    scores += _step_points(ratings, RATING_POINTS, np.greater_equal)
+    scores += np.where(accepting, 10, 0)
+    
+    return scores, distances
+
+
+def top_k(scores, k):
+    """
+    Indices of the k best scores, highest first, earlier candidates first
+    on ties (what a stable descending sort would give).
+    """
+    n = len(scores)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    # Unique key per candidate: score dominates, input position breaks ties
+    keys = -scores.astype(np.int64) * n + np.arange(n)
+    if k < n:
+        keys_idx = np.argpartition(keys, k - 1)[:k]
+    else:
+        keys_idx = np.arange(n)
+    return keys_idx[np.argsort(keys[keys_idx], kind='stable')]
@@ -1,28 +1,38 @@
+from services.rule_engine import rule_engine
+
 class EmergencyDetector:
+    """Keywords and actions come from the triage rule file (services/rule_engine.py)"""
+    
     @staticmethod
     def detect_emergency(symptoms):
         """Detect if symptoms indicate emergency"""
         
-        emergency_keywords = {
-            'stroke': ['facial droop', 'arm weakness', 'speech difficulty', 'sudden numbness', 
-                      'confusion', 'trouble seeing', 'severe headache', 'loss of balance'],
-            'heart_attack': ['chest pain', 'shortness of breath', 'pain in arm', 'jaw pain',
-                           'cold sweat', 'nausea', 'lightheaded'],
-            'severe_allergic_reaction': ['difficulty breathing', 'swelling', 'hives', 'throat closing'],
-            'severe_bleeding': ['heavy bleeding', 'blood loss', 'deep cut'],
-            'unconscious': ['unconscious', 'unresponsive', 'passed out']
-        }
-        
         symptoms_text = ' '.join([s.lower() for s in symptoms])
         
+        rules = rule_engine.rules
+        return EmergencyDetector._verdict(rules, rules.emergency_matcher.match(symptoms_text))
+    
+    @staticmethod
+    def detect_emergency_batch(symptom_lists):
+        """detect_emergency() for many symptom lists at once, results in input order"""
+        texts = [' '.join([s.lower() for s in symptoms]) for symptoms in symptom_lists]
+        
+        # One rule version for the whole batch
+        rules = rule_engine.rules
+        return [EmergencyDetector._verdict(rules, matches) for matches in rules.emergency_matcher.match_many(texts)]
+    
+    @staticmethod
+    def _verdict(rules, matches):
+        rules.record_hits('emergency', matches)
+        
         detected_emergencies = []
-        for emergency_type, keywords in emergency_keywords.items():
-            if any(keyword in symptoms_text for keyword in keywords):
-                detected_emergencies.append({
-                    'type': emergency_type,
-                    'severity': 'critical',
-                    'action': EmergencyDetector._get_emergency_action(emergency_type)
-                })
+        for emergency_type, keywords in matches.items():
+            detected_emergencies.append({
+                'type': emergency_type,
+                'severity': 'critical',
+                'action': EmergencyDetector._get_emergency_action(emergency_type, rules),
+                'matched_keywords': keywords
+            })
         
         if detected_emergencies:
             return {
@@ -38,13 +48,7 @@ class EmergencyDetector:
         }
     
     @staticmethod
-    def _get_emergency_action(emergency_type):
+    def _get_emergency_action(emergency_type, rules=None):
         """Get recommended action for emergency type"""
-        actions = {
-            'stroke': 'Call 911 immediately. Note time symptoms started. DO NOT drive yourself.',
-            'heart_attack': 'Call 911. Chew aspirin if available. Sit down and stay calm.',
-            'severe_allergic_reaction': 'Call 911. Use EpiPen if available.',
-            'severe_bleeding': 'Call 911. Apply pressure to wound. Elevate if possible.',
-            'unconscious': 'Call 911 immediately. Check breathing. Begin CPR if trained.'
-        }
-        return actions.get(emergency_type, 'Call 911 immediately')
\ No newline at end of file
+        rules = rules or rule_engine.rules
+        return rules.emergency_actions.get(emergency_type, rules.emergency_default_action)
@@ -1,11 +1,40 @@
 import cv2
 import numpy as np
 import base64
-from io import BytesIO
-from PIL import Image
+import hashlib
+from config import Config
+from utils.cache import LRUCache
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+
+@lru_cache(maxsize=64)
+def _profile_bands(height, bands, columns):
+    """Start rows, end rows and 1 / (rows * columns) of the symmetry profile bands for a face size"""
+    edges = (np.arange(bands + 1) * height) // bands
+    ends = np.maximum(edges[1:], edges[:-1] + 1)
+    return edges[:-1], ends, 1.0 / ((ends - edges[:-1]) * columns)
 
 class FaceDetector:
-    def __init__(self):
+    # Fraction of the previous face size added on each side of a tracking window
+    TRACKING_MARGIN = 0.25
+    # Number of horizontal bands in the symmetry row profile
+    SYMMETRY_PROFILE_BANDS = 16
+    # detectMultiScale (scaleFactor, minNeighbors) for each cascade
+    FACE_PARAMS = (1.3, 5)
+    EYE_PARAMS = (1.1, 10)
+    SMILE_PARAMS = (1.8, 20)
+    # Mean left/right difference above which droop is reported
+    DROOP_THRESHOLD = 15
+    
+    def __init__(self, detection_width=None, result_cache=None):
+        # Width the frame is downscaled to before the full-frame face search.
+        # None or 0 searches at full resolution.
+        self.detection_width = detection_width
+        # Optional LRUCache of results keyed by image content and parameters
+        self.result_cache = result_cache
+        
         # Load pre-trained Haar Cascade for face detection
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
         self.eye_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_eye.xml')
@@ -17,56 +46,22 @@ class FaceDetector:
         Returns: dict with detection results
         """
         try:
-            # Decode base64 image
-            image_data = base64.b64decode(base64_image.split(',')[1] if ',' in base64_image else base64_image)
-            image = Image.open(BytesIO(image_data))
-            
-            # Convert to numpy array and then to BGR for OpenCV
-            img_array = np.array(image)
-            if len(img_array.shape) == 2:  # Grayscale
-                gray = img_array
-                img_bgr = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-            else:  # RGB or RGBA
-                if img_array.shape[2] == 4:  # RGBA
-                    img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGBA2BGR)
-                else:  # RGB
-                    img_bgr = cv2.cvtColor(img_array, cv2.COLOR_RGB2BGR)
-                gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
-            
-            # Detect faces
-            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
-            
-            if len(faces) == 0:
-                return {
-                    'success': False,
-                    'faces_detected': 0,
-                    'message': 'No face detected'
-                }
-            
-            # Analyze the first detected face
-            (x, y, w, h) = faces[0]
-            face_roi_gray = gray[y:y+h, x:x+w]
-            face_roi_color = img_bgr[y:y+h, x:x+w]
-            
-            # Detect eyes
-            eyes = self.eye_cascade.detectMultiScale(face_roi_gray, 1.1, 10)
-            
-            # Detect smile
-            smiles = self.smile_cascade.detectMultiScale(face_roi_gray, 1.8, 20)
-            
-            # Analyze facial symmetry
-            symmetry_analysis = self._analyze_symmetry(face_roi_gray, eyes)
+            return self._analyze_cached(self._base64_bytes(base64_image))
             
+        except Exception as e:
             return {
-                'success': True,
-                'faces_detected': int(len(faces)),
-                'face_box': {'x': int(x), 'y': int(y), 'width': int(w), 'height': int(h)},
-                'eyes_detected': int(len(eyes)),
-                'smile_detected': bool(len(smiles) > 0),
-                'symmetry': symmetry_analysis,
-                'droop_detected': bool(symmetry_analysis['asymmetry_score'] > 15),
-                'confidence': 'high' if len(eyes) == 2 else 'medium'
+                'success': False,
+                'error': str(e)
             }
+    
+    def detect_face_from_bytes(self, image_bytes):
+        """
+        Detect face and analyze symmetry from raw JPEG/PNG bytes
+        (multipart or application/octet-stream uploads)
+        Returns: dict with detection results
+        """
+        try:
+            return self._analyze_cached(image_bytes)
             
         except Exception as e:
             return {
@@ -74,27 +69,279 @@ class FaceDetector:
                 'error': str(e)
             }
     
+    def detect_faces_batch(self, images, max_workers=4):
+        """
+        Analyze many frames from one stroke check in a single call.
+        Each frame may be a base64 string or raw image bytes. Frames are
+        decoded on a thread pool while the cascades run on the frames that
+        are already decoded, so decode and detection overlap.
+        Returns: dict with per-frame results (in input order) and an
+        aggregated asymmetry verdict
+        """
+        def decode(image):
+            # Returns (cache key, gray frame, cached result, error)
+            try:
+                image_bytes = self._base64_bytes(image) if isinstance(image, str) else image
+                key = self._cache_key(image_bytes)
+                cached = self.result_cache.get(key) if key is not None else None
+                if cached is not None:
+                    return key, None, dict(cached), None
+                return key, self._decode_bytes(image_bytes), None, None
+            except Exception as e:
+                return None, None, None, e
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # executor.map yields in input order as soon as each frame is ready
+            for key, gray, cached, error in executor.map(decode, images):
+                if error is not None:
+                    results.append({'success': False, 'error': str(error)})
+                    continue
+                if cached is not None:
+                    results.append(cached)
+                    continue
+                try:
+                    results.append(self._store(key, self._analyze_gray(gray)))
+                except Exception as e:
+                    results.append({'success': False, 'error': str(e)})
+        
+        return {
+            'success': True,
+            'frames': results,
+            'summary': self._aggregate_results(results)
+        }
+    
+    def _analyze_cached(self, image_bytes):
+        """Decode and analyze raw image bytes, reusing the result for identical frames"""
+        key = self._cache_key(image_bytes)
+        if key is not None:
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return dict(cached)
+        return self._store(key, self._analyze_gray(self._decode_bytes(image_bytes)))
+    
+    def _cache_key(self, image_bytes):
+        """Content hash of the image plus every parameter that changes the result"""
+        if self.result_cache is None:
+            return None
+        return self.result_key(image_bytes, self.detection_width)
+    
+    @classmethod
+    def result_key(cls, image_bytes, detection_width):
+        digest = hashlib.blake2b(memoryview(image_bytes), digest_size=16).digest()
+        return (digest, detection_width or 0, cls.FACE_PARAMS, cls.EYE_PARAMS,
+                cls.SMILE_PARAMS, cls.DROOP_THRESHOLD)
+    
+    def _store(self, key, result):
+        if key is not None:
+            self.result_cache.set(key, result)
+            return dict(result)
+        return result
+    
+    @staticmethod
+    def _base64_bytes(base64_image):
+        """Raw image bytes from a base64 string or data URL"""
+        return base64.b64decode(base64_image.split(',')[1] if ',' in base64_image else base64_image)
+    
+    def _decode_base64(self, base64_image):
+        """Decode a base64 image (optionally a data URL) to a grayscale array"""
+        return self._decode_bytes(self._base64_bytes(base64_image))
+    
+    def _decode_bytes(self, image_bytes):
+        """
+        Decode JPEG/PNG bytes straight to grayscale.
+        Accepts bytes, bytearray or memoryview; np.frombuffer wraps the
+        buffer without copying and cv2.imdecode writes a single gray plane.
+        """
+        buffer = np.frombuffer(memoryview(image_bytes), dtype=np.uint8)
+        gray = cv2.imdecode(buffer, cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError('Could not decode image')
+        return gray
+    
+    def _analyze_gray(self, gray, search_box=None):
+        """
+        Run the face, eye and smile cascades and symmetry analysis on a grayscale frame.
+        search_box restricts the face search to the area around a previous face.
+        """
+        # Detect faces (on a downscaled copy, boxes mapped back to full resolution)
+        faces = self._detect_faces(gray, search_box)
+        
+        if len(faces) == 0:
+            return {
+                'success': False,
+                'faces_detected': 0,
+                'message': 'No face detected'
+            }
+        
+        # Analyze the first detected face on the full-resolution ROI
+        (x, y, w, h) = faces[0]
+        face_roi_gray = gray[y:y+h, x:x+w]
+        
+        if search_box is None:
+            eye_region, mouth_region = face_roi_gray, face_roi_gray
+        else:
+            # Tracked frames: eyes sit in the upper part of the face and the
+            # mouth in the lower half, so only those bands are searched.
+            # The eye band starts at the ROI top so eye coordinates are unchanged.
+            eye_region = face_roi_gray[:int(h * 0.6)]
+            mouth_region = face_roi_gray[h // 2:]
+        
+        # Detect eyes
+        eyes = self.eye_cascade.detectMultiScale(eye_region, *self.EYE_PARAMS)
+        
+        # Detect smile
+        smiles = self.smile_cascade.detectMultiScale(mouth_region, *self.SMILE_PARAMS)
+        
+        # Analyze facial symmetry
+        symmetry_analysis = self._analyze_symmetry(face_roi_gray, eyes)
+        
+        return {
+            'success': True,
+            'faces_detected': int(len(faces)),
+            'face_box': {'x': int(x), 'y': int(y), 'width': int(w), 'height': int(h)},
+            'eyes_detected': int(len(eyes)),
+            'smile_detected': bool(len(smiles) > 0),
+            'symmetry': symmetry_analysis,
+            'droop_detected': bool(symmetry_analysis['asymmetry_score'] > self.DROOP_THRESHOLD),
+            'confidence': 'high' if len(eyes) == 2 else 'medium'
+        }
+    
+    def _detect_faces(self, gray, search_box=None):
+        """
+        Run the face cascade on a copy downscaled to detection_width and map
+        the boxes back to full-resolution coordinates.
+        With a search_box (x, y, w, h) from the previous frame, only a margin
+        around it is searched and only at scales close to the previous face.
+        """
+        height, width = gray.shape[:2]
+        scale = 1.0
+        if self.detection_width and width > self.detection_width:
+            scale = width / self.detection_width
+        
+        region = gray
+        x0, y0 = 0, 0
+        size_limits = {}
+        if search_box is not None:
+            x, y, w, h = search_box
+            margin_x, margin_y = int(w * self.TRACKING_MARGIN), int(h * self.TRACKING_MARGIN)
+            x0, y0 = max(0, x - margin_x), max(0, y - margin_y)
+            x1, y1 = min(width, x + w + margin_x), min(height, y + h + margin_y)
+            region = gray[y0:y1, x0:x1]
+            
+            side = min(w, h) / scale
+            size_limits = {
+                'minSize': (int(side * 0.7), int(side * 0.7)),
+                'maxSize': (int(side * 1.4), int(side * 1.4))
+            }
+        
+        if scale > 1.0:
+            region_h, region_w = region.shape[:2]
+            region = cv2.resize(
+                region,
+                (max(1, int(round(region_w / scale))), max(1, int(round(region_h / scale)))),
+                interpolation=cv2.INTER_AREA
+            )
+        
+        faces = self.face_cascade.detectMultiScale(region, *self.FACE_PARAMS, **size_limits)
+        if len(faces) == 0 or (scale == 1.0 and search_box is None):
+            return faces
+        
+        faces = np.rint(faces * scale).astype(int)
+        faces[:, 0] += x0
+        faces[:, 1] += y0
+        # Keep boxes inside the frame after rounding
+        faces[:, 0] = np.clip(faces[:, 0], 0, width - 1)
+        faces[:, 1] = np.clip(faces[:, 1], 0, height - 1)
+        faces[:, 2] = np.minimum(faces[:, 2], width - faces[:, 0])
+        faces[:, 3] = np.minimum(faces[:, 3], height - faces[:, 1])
+        return faces
+    
+    @staticmethod
+    def _aggregate_results(results):
+        """
+        Combine per-frame results into one verdict for the whole assessment.
+        Droop is reported when at least half of the frames with a face show it,
+        so a single noisy frame does not flip the outcome.
+        """
+        analyzed = [r for r in results if r.get('success')]
+        if not analyzed:
+            return {
+                'frames_total': len(results),
+                'frames_analyzed': 0,
+                'droop_detected': False,
+                'message': 'No face detected'
+            }
+        
+        scores = np.array([r['symmetry']['asymmetry_score'] for r in analyzed])
+        eye_scores = np.array([r['symmetry']['eye_asymmetry'] for r in analyzed])
+        droop_frames = sum(1 for r in analyzed if r['droop_detected'])
+        droop_ratio = droop_frames / len(analyzed)
+        
+        return {
+            'frames_total': len(results),
+            'frames_analyzed': len(analyzed),
+            'droop_frames': droop_frames,
+            'droop_ratio': round(droop_ratio, 3),
+            'mean_asymmetry_score': float(scores.mean()),
+            'median_asymmetry_score': float(np.median(scores)),
+            'max_asymmetry_score': float(scores.max()),
+            'mean_eye_asymmetry': float(eye_scores.mean()),
+            'droop_detected': bool(droop_ratio >= 0.5)
+        }
+    
     def _analyze_symmetry(self, face_gray, eyes):
         """
-        Analyze facial symmetry by comparing left and right halves
+        Analyze facial symmetry by comparing the left half with the mirrored right half.
+        All metrics come from one absolute-difference pass plus a row-subsampled
+        pass. The only copies are the mirrored right halves: cv2.flip is several
+        times faster than letting OpenCV copy a negative-stride view. On small
+        faces the cost is dominated by the fixed per-call overhead of the dozen
+        or so OpenCV/NumPy calls, so they are kept to as few as possible.
         """
         height, width = face_gray.shape
         
-        # Split face into left and right halves
+        # Column k of the left half is compared with column width-1-k
+        # (an odd center column is skipped)
         mid = width // 2
+        columns = max(mid, 1)
         left_half = face_gray[:, :mid]
-        right_half = face_gray[:, mid:]
-        right_half_flipped = cv2.flip(right_half, 1)
+        right_half_mirrored = cv2.flip(face_gray[:, width - mid:], 1)
+        diff = cv2.absdiff(left_half, right_half_mirrored)
+        
+        # Exact integer row sums; every region mean is two lookups in the cumsum
+        row_sums = cv2.reduce(diff, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S)
+        cumulative = np.zeros(height + 1, dtype=np.int64)
+        np.cumsum(row_sums.ravel(), out=cumulative[1:])
+        
+        def region_mean(start, end):
+            end = max(end, start + 1)
+            return float(cumulative[end] - cumulative[start]) / ((end - start) * columns)
+        
+        asymmetry_score = region_mean(0, height)
+        
+        # Per-row asymmetry profile, averaged into horizontal bands top to bottom
+        starts, ends, scale = _profile_bands(height, self.SYMMETRY_PROFILE_BANDS, columns)
+        row_profile = (cumulative[ends] - cumulative[starts]) * scale
         
-        # Resize to match if needed
-        if left_half.shape != right_half_flipped.shape:
-            min_width = min(left_half.shape[1], right_half_flipped.shape[1])
-            left_half = left_half[:, :min_width]
-            right_half_flipped = right_half_flipped[:, :min_width]
+        # Eye band and mouth band as fractions of the face height
+        eye_region_asymmetry = region_mean(int(height * 0.2), int(height * 0.5))
+        mouth_region_asymmetry = region_mean(int(height * 0.6), int(height * 0.9))
         
-        # Calculate difference
-        diff = cv2.absdiff(left_half, right_half_flipped)
-        asymmetry_score = np.mean(diff)
+        # Gradient and histogram asymmetry on every 8th row (a strided view).
+        # Vertical gradients pick up eyelid and mouth-corner lines at different heights.
+        # One Sobel pass over the whole sampled face, mirrored afterwards; only the
+        # center columns differ from filtering each half (real neighbors, not a border)
+        sampled = face_gray[::8]
+        sampled_left = sampled[:, :mid]
+        gradient = cv2.convertScaleAbs(cv2.Sobel(sampled, cv2.CV_16S, 0, 1))
+        gradient_asymmetry = cv2.mean(cv2.absdiff(gradient[:, :mid], cv2.flip(gradient[:, width - mid:], 1)))[0]
+        
+        # Half the L1 distance between the normalized intensity histograms (0 to 1);
+        # mirroring does not change a histogram, so the right half is not flipped here
+        left_hist = cv2.calcHist([sampled_left], [0], None, [32], [0, 256])
+        right_hist = cv2.calcHist([sampled[:, width - mid:]], [0], None, [32], [0, 256])
+        histogram_asymmetry = cv2.norm(left_hist, right_hist, cv2.NORM_L1) / (2 * max(sampled_left.size, 1))
         
         # Analyze eye positions if detected
         eye_asymmetry = 0
@@ -111,8 +358,39 @@ class FaceDetector:
             'asymmetry_score': float(asymmetry_score),
             'eye_asymmetry': float(eye_asymmetry),
             'left_right_difference': float(asymmetry_score),
-            'droop_indicator': bool(eye_asymmetry > 10)
+            'droop_indicator': bool(eye_asymmetry > 10),
+            'row_profile': np.round(row_profile, 3).tolist(),
+            'eye_region_asymmetry': float(eye_region_asymmetry),
+            'mouth_region_asymmetry': float(mouth_region_asymmetry),
+            'gradient_asymmetry': float(gradient_asymmetry),
+            'histogram_asymmetry': float(histogram_asymmetry)
         }
 
-# Global instance
-face_detector = FaceDetector()
+# Results shared by all detectors in this process (None when disabled)
+result_cache = LRUCache(
+    max_entries=Config.FACE_CACHE_MAX_ENTRIES,
+    max_bytes=Config.FACE_CACHE_MAX_BYTES
+) if Config.FACE_CACHE_MAX_ENTRIES > 0 else None
+
+# Idle detectors, created on first demand and shared between request threads.
+# A CascadeClassifier must not be used by two threads at once, so each
+# request borrows a detector for the duration of its analysis.
+_idle_detectors = queue.LifoQueue()
+
+@contextmanager
+def borrow_face_detector():
+    """Lend a FaceDetector to the calling thread, loading the cascades only if none is idle"""
+    try:
+        detector = _idle_detectors.get_nowait()
+    except queue.Empty:
+        detector = FaceDetector(Config.FACE_DETECTION_WIDTH, result_cache)
+    try:
+        yield detector
+    finally:
+        _idle_detectors.put(detector)
+
+def warmup(count=1):
+    """Load cascades for `count` detectors ahead of the first requests"""
+    missing = count - _idle_detectors.qsize()
+    for _ in range(max(0, missing)):
+        _idle_detectors.put(FaceDetector(Config.FACE_DETECTION_WIDTH, result_cache))
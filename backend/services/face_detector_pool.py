@@ -0,0 +1,181 @@
+"""
+Process pool backend for FaceDetector.
+Each worker process loads the Haar cascades once in its initializer, so
+CPU-heavy frames run outside the Flask request thread and across cores.
+A semaphore bounds in-flight plus queued frames; when it is exhausted
+submit() waits briefly and then raises PoolBusyError (backpressure).
+"""
+
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import cv2
+
+from config import Config
+from services.face_detector import FaceDetector, result_cache
+
+# Per-process detector, created by _init_worker
+_worker_detector = None
+
+
+def _init_worker(detection_width):
+    global _worker_detector
+    # One OpenCV thread per process; parallelism comes from the pool
+    cv2.setNumThreads(1)
+    _worker_detector = FaceDetector(detection_width)
+
+
+def _analyze_bytes(image_bytes):
+    return _worker_detector.detect_face_from_bytes(image_bytes)
+
+
+def _completed(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class PoolBusyError(Exception):
+    """Raised when the pool queue stays full for longer than the submit timeout"""
+
+
+class FaceDetectorPool:
+    def __init__(self, workers, queue_depth, detection_width=None,
+                 submit_timeout=0.5, result_timeout=10, result_cache=None):
+        self.workers = workers
+        self.detection_width = detection_width
+        # Checked in this process, so cache hits never reach a worker
+        self.result_cache = result_cache
+        self.queue_depth = queue_depth
+        self.submit_timeout = submit_timeout
+        self.result_timeout = result_timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_depth)
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            # spawn: forking a threaded web server is not safe
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(detection_width,)
+        )
+    
+    def submit(self, image, is_base64=False, timeout=None):
+        """
+        Queue one frame for analysis and return a Future for its result dict.
+        Raises PoolBusyError when no queue slot frees up within the timeout
+        (submit_timeout by default).
+        """
+        try:
+            # Decoding base64 here also sends fewer bytes to the worker
+            image_bytes = FaceDetector._base64_bytes(image) if is_base64 else image
+        except Exception as e:
+            return _completed({'success': False, 'error': str(e)})
+        
+        key = None
+        if self.result_cache is not None:
+            key = FaceDetector.result_key(image_bytes, self.detection_width)
+            cached = self.result_cache.get(key)
+            if cached is not None:
+                return _completed(dict(cached))
+        
+        if timeout is None:
+            timeout = self.submit_timeout
+        if not self._slots.acquire(timeout=timeout):
+            raise PoolBusyError('Face analysis queue is full')
+        
+        try:
+            # memoryviews cannot be pickled to the worker
+            future = self._executor.submit(_analyze_bytes, bytes(image_bytes))
+        except Exception:
+            self._slots.release()
+            raise
+        
+        future.add_done_callback(lambda _: self._slots.release())
+        if key is not None:
+            future.add_done_callback(lambda done: self._store(key, done))
+        return future
+    
+    def _store(self, key, future):
+        """Cache a finished worker result unless the frame failed to decode or analyze"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if 'error' not in result:
+            self.result_cache.set(key, result)
+    
+    def detect(self, image, is_base64=False):
+        """Analyze one frame in the pool and wait for the result"""
+        return self.submit(image, is_base64).result(timeout=self.result_timeout)
+    
+    def detect_batch(self, images):
+        """
+        Analyze frames from one assessment across the pool.
+        A batch may be larger than the queue: when no slot is free, the
+        oldest frame of this batch is awaited before submitting more.
+        Returns the same shape as FaceDetector.detect_faces_batch.
+        """
+        results = [None] * len(images)
+        pending = deque()
+        
+        def collect():
+            index, future = pending.popleft()
+            try:
+                results[index] = future.result(timeout=self.result_timeout)
+            except Exception as e:
+                results[index] = {'success': False, 'error': str(e)}
+        
+        for index, image in enumerate(images):
+            while True:
+                try:
+                    # Only the first frame waits on other requests; later frames
+                    # make room by draining this batch
+                    future = self.submit(image, isinstance(image, str), timeout=0 if pending else None)
+                    pending.append((index, future))
+                    break
+                except PoolBusyError:
+                    if not pending:
+                        raise
+                    collect()
+        
+        while pending:
+            collect()
+        
+        return {
+            'success': True,
+            'frames': results,
+            'summary': FaceDetector._aggregate_results(results)
+        }
+    
+    def warmup(self):
+        """Start every worker process so the cascades are loaded before traffic arrives"""
+        futures = [self._executor.submit(cv2.getNumThreads) for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global pool, started on first use; disabled (inline analysis) when FACE_POOL_SIZE is 0
+_face_pool = None
+_face_pool_lock = threading.Lock()
+
+
+def get_face_pool():
+    """Return the shared FaceDetectorPool, or None when the pool is disabled"""
+    global _face_pool
+    if Config.FACE_POOL_SIZE <= 0:
+        return None
+    if _face_pool is None:
+        with _face_pool_lock:
+            if _face_pool is None:
+                _face_pool = FaceDetectorPool(
+                    Config.FACE_POOL_SIZE,
+                    Config.FACE_POOL_QUEUE_DEPTH,
+                    detection_width=Config.FACE_DETECTION_WIDTH,
+                    submit_timeout=Config.FACE_POOL_SUBMIT_TIMEOUT,
+                    result_timeout=Config.FACE_POOL_RESULT_TIMEOUT,
+                    result_cache=result_cache
+                )
+    return _face_pool
@@ -0,0 +1,145 @@
+"""
+Face tracking sessions for the live stroke check.
+Each session remembers the last face box so the next frame only searches
+around it, and smooths the asymmetry scores over a rolling window.
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+
+import numpy as np
+
+from config import Config
+from services.face_detector import FaceDetector, borrow_face_detector
+
+
+class FaceTrackingSession:
+    """Per-client tracking state for a sequence of frames"""
+    
+    def __init__(self, detector=None, window=10):
+        self.session_id = uuid.uuid4().hex
+        # None borrows a shared detector for each frame
+        self.detector = detector
+        self.face_box = None
+        self.asymmetry_scores = deque(maxlen=window)
+        self.eye_scores = deque(maxlen=window)
+        self.frames = 0
+        self.tracked_frames = 0
+        self.last_seen = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def process_base64(self, base64_image):
+        return self._process(lambda detector: detector._decode_base64(base64_image))
+    
+    def process_bytes(self, image_bytes):
+        return self._process(lambda detector: detector._decode_bytes(image_bytes))
+    
+    def _process(self, decode):
+        if self.detector is not None:
+            return self._track(self.detector, decode)
+        with borrow_face_detector() as detector:
+            return self._track(detector, decode)
+    
+    def _track(self, detector, decode):
+        try:
+            gray = decode(detector)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+        
+        with self.lock:
+            self.last_seen = time.monotonic()
+            self.frames += 1
+            
+            result = None
+            if self.face_box is not None:
+                result = detector._analyze_gray(gray, search_box=self.face_box)
+                if result['success']:
+                    self.tracked_frames += 1
+            # Tracking lost (or first frame): fall back to a full-frame search
+            if result is None or not result['success']:
+                result = detector._analyze_gray(gray)
+                tracked = False
+            else:
+                tracked = True
+            
+            if result['success']:
+                box = result['face_box']
+                self.face_box = (box['x'], box['y'], box['width'], box['height'])
+                self.asymmetry_scores.append(result['symmetry']['asymmetry_score'])
+                self.eye_scores.append(result['symmetry']['eye_asymmetry'])
+            else:
+                self.face_box = None
+            
+            result['session_id'] = self.session_id
+            result['tracked'] = tracked
+            result['smoothed'] = self._smoothed()
+            return result
+    
+    def _smoothed(self):
+        """Rolling-window view of the droop indicators"""
+        if not self.asymmetry_scores:
+            return {'frames': 0, 'droop_detected': False}
+        
+        asymmetry = float(np.mean(self.asymmetry_scores))
+        eye_asymmetry = float(np.mean(self.eye_scores))
+        return {
+            'frames': len(self.asymmetry_scores),
+            'asymmetry_score': asymmetry,
+            'eye_asymmetry': eye_asymmetry,
+            'droop_indicator': bool(eye_asymmetry > 10),
+            'droop_detected': bool(asymmetry > FaceDetector.DROOP_THRESHOLD)
+        }
+    
+    def stats(self):
+        return {
+            'session_id': self.session_id,
+            'frames': self.frames,
+            'tracked_frames': self.tracked_frames,
+            'smoothed': self._smoothed()
+        }
+
+
+class FaceTrackingSessions:
+    """In-process session registry with idle expiry"""
+    
+    def __init__(self, window=10, ttl=120, max_sessions=200):
+        self.window = window
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = {}
+        self._lock = threading.Lock()
+    
+    def create(self):
+        """Start a new session. Returns None when the registry is full."""
+        with self._lock:
+            self._expire()
+            if len(self._sessions) >= self.max_sessions:
+                return None
+            session = FaceTrackingSession(window=self.window)
+            self._sessions[session.session_id] = session
+            return session
+    
+    def get(self, session_id):
+        with self._lock:
+            self._expire()
+            return self._sessions.get(session_id)
+    
+    def close(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None)
+    
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        expired = [sid for sid, s in self._sessions.items() if s.last_seen < cutoff]
+        for sid in expired:
+            del self._sessions[sid]
+
+
+# Global registry
+face_sessions = FaceTrackingSessions(
+    window=Config.FACE_TRACKING_WINDOW,
+    ttl=Config.FACE_SESSION_TTL,
+    max_sessions=Config.FACE_MAX_SESSIONS
+)
@@ -0,0 +1,185 @@
+"""
+Offline index of medical facilities, so nearby-hospital lookups have an
+answer that does not depend on the network.
+
+Facilities come from a CSV or GeoJSON file (FACILITY_INDEX_PATH), for
+example an export of a public hospital dataset. Field names are matched
+case-insensitively. CSV columns are name, address, latitude/lat,
+longitude/lng/lon, and optionally id/place_id, type/types (';'-separated),
+rating and status. GeoJSON is a FeatureCollection of Points with the same
+names as properties. Rows with status CLOSED are skipped.
+
+The index is a flat lat/lng grid over an immutable list of facility dicts
+in the same shape as Places results, marked source='local'. A lookup only
+looks at the cells the radius touches (or, for a radius wider than the
+occupied grid, at the occupied cells), which takes microseconds. The
+remote API ranks by keyword relevance; here the keyword only filters:
+facilities whose name or types share a word with it are kept, and when
+none in range do, all of them are used, so an emergency lookup always
+gets the nearest ones.
+"""
+
+import csv
+import json
+import math
+import os
+import re
+import threading
+
+from config import Config
+from utils.geo import EARTH_RADIUS_KM, grid_cells
+
+_WORD = re.compile(r'[a-z]{3,}')
+
+
+class FacilityIndexError(ValueError):
+    pass
+
+
+def _field(row, *names):
+    """First non-empty value among names, case-insensitive"""
+    lowered = {str(key).lower(): value for key, value in row.items()}
+    for name in names:
+        value = lowered.get(name)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def _facility(row, lat, lng, number):
+    if str(_field(row, 'status') or '').upper() == 'CLOSED':
+        return None
+    try:
+        lat, lng = float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+    if not lat or not lng or not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        return None
+    
+    types = _field(row, 'types', 'type') or 'hospital'
+    if isinstance(types, str):
+        types = [t.strip().lower().replace(' ', '_') for t in types.split(';') if t.strip()]
+    try:
+        rating = float(_field(row, 'rating'))
+    except (TypeError, ValueError):
+        rating = None
+    return {
+        'place_id': str(_field(row, 'place_id', 'id') or f'local-{number}'),
+        'name': _field(row, 'name'),
+        'address': _field(row, 'address', 'vicinity'),
+        'location': {'lat': lat, 'lng': lng},
+        'rating': rating,
+        'user_ratings_total': None,
+        'open_now': None,
+        'types': list(types),
+        'source': 'local'
+    }
+
+
+def load_facilities(path):
+    """Facility dicts from a .csv or .geojson/.json file"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ('.csv', '.geojson', '.json'):
+        raise FacilityIndexError(f'Unsupported facility file type: {extension}')
+    
+    facilities = []
+    try:
+        if extension == '.csv':
+            with open(path, newline='', encoding='utf-8') as f:
+                for number, row in enumerate(csv.DictReader(f)):
+                    facilities.append(_facility(
+                        row, _field(row, 'latitude', 'lat'), _field(row, 'longitude', 'lng', 'lon'), number))
+        else:
+            with open(path, encoding='utf-8') as f:
+                collection = json.load(f)
+            for number, feature in enumerate(collection.get('features', [])):
+                geometry = feature.get('geometry') or {}
+                if geometry.get('type') != 'Point':
+                    continue
+                lng, lat = geometry['coordinates'][:2]
+                facilities.append(_facility(feature.get('properties') or {}, lat, lng, number))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise FacilityIndexError(f'Could not load {path}: {e}') from e
+    return [facility for facility in facilities if facility]
+
+
+class FacilityIndex:
+    def __init__(self, facilities, cell_degrees=0.1):
+        self.facilities = facilities  # shared and read-only
+        self.cell_degrees = cell_degrees
+        self.grid = {}
+        self.words = []
+        # Radians and cos(lat) per facility, so a lookup is a few multiplications per candidate
+        self._lat = []
+        self._lng = []
+        self._cos_lat = []
+        for i, facility in enumerate(facilities):
+            location = facility['location']
+            self.grid.setdefault(self._cell(location['lat'], location['lng']), []).append(i)
+            self._lat.append(math.radians(location['lat']))
+            self._lng.append(math.radians(location['lng']))
+            self._cos_lat.append(math.cos(self._lat[-1]))
+            self.words.append(frozenset(_WORD.findall(
+                f"{facility.get('name') or ''} {' '.join(facility.get('types') or [])}".lower().replace('_', ' '))))
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.keyword_fallbacks = 0
+    
+    def _cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lng / self.cell_degrees))
+    
+    def nearby(self, latitude, longitude, radius=5000, keyword=None, limit=10):
+        """Up to limit facilities within radius meters, nearest first (no distance field)"""
+        lat, lng = float(latitude), float(longitude)
+        radius_km = float(radius) / 1000
+        cells = grid_cells(self.grid, self.cell_degrees, lat, lng, radius_km)
+        
+        # Compare haversine terms instead of distances: same order, no asin/sqrt
+        lat_r, lng_r = math.radians(lat), math.radians(lng)
+        cos_lat = math.cos(lat_r)
+        limit_term = math.sin(min(radius_km / (2 * EARTH_RADIUS_KM), math.pi / 2)) ** 2
+        lats, lngs, cosines, sin = self._lat, self._lng, self._cos_lat, math.sin
+        found = []
+        for cell in cells:
+            for i in self.grid.get(cell, ()):
+                term = sin((lats[i] - lat_r) / 2) ** 2 + cos_lat * cosines[i] * sin((lngs[i] - lng_r) / 2) ** 2
+                if term <= limit_term:
+                    found.append((term, i))
+        
+        wanted = set(_WORD.findall((keyword or '').lower()))
+        matching = [(term, i) for term, i in found if wanted & self.words[i]] if wanted else found
+        with self._lock:
+            self.lookups += 1
+            if wanted and not matching and found:
+                self.keyword_fallbacks += 1
+        matching = matching or found
+        matching.sort()
+        return [self.facilities[i] for _, i in matching[:limit]]
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'facilities': len(self.facilities),
+                'cells': len(self.grid),
+                'lookups': self.lookups,
+                'keyword_fallbacks': self.keyword_fallbacks
+            }
+
+
+def load_index(path, cell_degrees=0.1):
+    """FacilityIndex for the file at path, or None when there is no file"""
+    if not path or not os.path.exists(path):
+        print(f"Local facility index disabled: no dataset at {path}")
+        return None
+    try:
+        index = FacilityIndex(load_facilities(path), cell_degrees)
+    except FacilityIndexError as e:
+        print(f"Local facility index disabled: {str(e)}")
+        return None
+    print(f"✅ Local facility index: {len(index.facilities)} facilities from {path}")
+    return index
+
+
+facility_index = load_index(
+    Config.FACILITY_INDEX_PATH, Config.FACILITY_INDEX_CELL_DEGREES
+) if Config.FACILITY_INDEX_MODE != 'off' else None
@@ -1,8 +1,61 @@
-import google.generativeai as genai
+import threading
+import time
 from config import Config
+from services.llm_cache import ResponseCache
+from services.llm_executor import LLMBusyError, LLMExecutor
 
-genai.configure(api_key=Config.GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-2.5-flash')
+# Created on first use so workers that never call Gemini skip the SDK import
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """Configure google.generativeai and build the shared GenerativeModel on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=Config.GEMINI_API_KEY)
+                _model = genai.GenerativeModel('gemini-2.5-flash')
+    return _model
+
+def set_model(model):
+    """Replace the model, e.g. with a local fake that has generate_content(prompt)"""
+    global _model
+    with _model_lock:
+        _model = model
+
+def warmup():
+    """Import the SDK and build the model ahead of the first request"""
+    get_model()
+
+# Shared by every GeminiService call: caps concurrent upstream calls,
+# applies timeouts and coalesces identical prompts already in flight
+llm_executor = LLMExecutor(
+    get_model,
+    max_concurrency=Config.GEMINI_MAX_CONCURRENCY,
+    max_queue=Config.GEMINI_MAX_QUEUE,
+    timeout=Config.GEMINI_TIMEOUT,
+    queue_timeout=Config.GEMINI_QUEUE_TIMEOUT
+)
+
+# Per-method exact and near-duplicate response caches (see Config.GEMINI_CACHE_POLICIES)
+response_cache = ResponseCache(Config.GEMINI_CACHE_POLICIES if Config.GEMINI_CACHE_ENABLED else {})
+
+def generate_text(method, prompt, cache_input):
+    """
+    Response text for `prompt`, served from the method's cache when possible.
+    cache_input is the part of the request that identifies it (not the prompt
+    template), so near-duplicate matching compares only what the user sent.
+    """
+    cached = response_cache.get(method, cache_input)
+    if cached is not None:
+        return cached
+    
+    start = time.perf_counter()
+    text = llm_executor.generate(prompt).text
+    response_cache.put(method, cache_input, text, time.perf_counter() - start)
+    return text
 
 class GeminiService:
     @staticmethod
@@ -25,11 +78,14 @@ Provide:
 Use simple, reassuring language. No medical jargon.
 """
         
+        cache_input = ' '.join(
+            str(appointment_data.get(field, 'N/A')) for field in ('diagnosis', 'prescription', 'doctor_notes')
+        )
+        
         try:
-            response = model.generate_content(prompt)
             return {
                 'success': True,
-                'summary': response.text
+                'summary': generate_text('generate_appointment_summary', prompt, cache_input)
             }
         except Exception as e:
             return {
@@ -56,11 +112,14 @@ Provide:
 Be helpful but cautious. Always recommend seeing a doctor.
 """
         
+        # Order-insensitive, so the same symptom list always hits the same entry
+        cache_input = 'symptoms ' + ' ; '.join(sorted(s.lower() for s in symptoms)) + \
+            ' history ' + ' ; '.join(sorted(h.lower() for h in (medical_history or [])))
+        
         try:
-            response = model.generate_content(prompt)
             return {
                 'success': True,
-                'analysis': response.text
+                'analysis': generate_text('analyze_symptoms', prompt, cache_input)
             }
         except Exception as e:
             return {
@@ -80,10 +139,9 @@ Use everyday words. Explain like talking to a friend.
 """
         
         try:
-            response = model.generate_content(prompt)
             return {
                 'success': True,
-                'translation': response.text
+                'translation': generate_text('translate_medical_terms', prompt, medical_text)
             }
         except Exception as e:
             return {
@@ -94,6 +152,49 @@ Use everyday words. Explain like talking to a friend.
     @staticmethod
     def chat(message, user_context=None):
         """Interactive chat with personalized health context"""
+        prompt = GeminiService._chat_prompt(message, user_context)
+        
+        try:
+            return {
+                'success': True,
+                'response': generate_text('chat', prompt, prompt)
+            }
+        except LLMBusyError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'busy': True  # the route answers 503 so the client retries
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def chat_stream(message, user_context=None):
+        """
+        Stream a chat reply as text chunks while it is generated.
+        Closing the generator (the client disconnected) stops reading from
+        the model and releases the execution slot.
+        """
+        prompt = GeminiService._chat_prompt(message, user_context)
+        
+        with llm_executor.reserve() as request_options:
+            response = get_model().generate_content(prompt, stream=True, request_options=request_options)
+            try:
+                for chunk in response:
+                    text = chunk.text
+                    if text:
+                        yield text
+            finally:
+                # Stop the upstream stream if the caller went away mid-reply
+                close = getattr(response, 'close', None)
+                if callable(close):
+                    close()
+    
+    @staticmethod
+    def _chat_prompt(message, user_context):
         medical_history = user_context.get('medical_history', []) if user_context else []
         medications = user_context.get('medications', []) if user_context else []
         
@@ -113,14 +214,4 @@ Patient Question: {message}
 Provide a helpful, empathetic response. Use simple language. If it's serious, recommend seeing a doctor. Be conversational but professional.
 """
         
-        try:
-            response = model.generate_content(prompt)
-            return {
-                'success': True,
-                'response': response.text
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e)
-            }
\ No newline at end of file
+        return prompt
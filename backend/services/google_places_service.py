@@ -3,8 +3,18 @@ Google Places API Service
 Find nearby hospitals, clinics, and medical facilities
 """
 
-import requests
+import heapq
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+
 from config import Config
+from services.facility_index import facility_index
+from services.place_details_cache import PlaceDetailsCache
+from services.places_cache import PlacesCache
+from services.rule_engine import rule_engine
+from utils.db import place_details_collection
+from utils.http_client import HTTPClient
 
 class GooglePlacesService:
     """Service for finding nearby medical facilities using Google Places API"""
@@ -12,7 +22,7 @@ class GooglePlacesService:
     BASE_URL = "https://maps.googleapis.com/maps/api/place"
     
     @staticmethod
-    def find_nearby_hospitals(latitude, longitude, radius=5000, keyword="hospital"):
+    def find_nearby_hospitals(latitude, longitude, radius=5000, keyword="hospital", limit=10, pages=1):
         """
         Find nearby hospitals using Google Places API
         
@@ -21,14 +31,80 @@ class GooglePlacesService:
             longitude: User's longitude
             radius: Search radius in meters (default 5km)
             keyword: Search keyword (hospital, clinic, emergency room, etc.)
+            limit: Number of facilities to return, nearest first (default 10)
+            pages: Result pages of up to 20 to retrieve (default 1, at most PLACES_MAX_PAGES)
         
         Returns:
             List of nearby medical facilities with details
         """
         try:
-            # Nearby Search API
-            url = f"{GooglePlacesService.BASE_URL}/nearbysearch/json"
+            pages = max(1, min(int(pages), Config.PLACES_MAX_PAGES))
+            facilities = GooglePlacesService._nearby_facilities(latitude, longitude, radius, keyword, limit, pages)
+            facilities = GooglePlacesService._nearest(facilities, latitude, longitude, limit, radius)
+            
+            # The user is likely to open the nearest few next
+            if place_details_cache is not None and Config.PLACE_DETAILS_PREFETCH:
+                place_details_cache.prefetch([
+                    facility['place_id'] for facility in facilities[:Config.PLACE_DETAILS_PREFETCH]
+                    if facility.get('source') != 'local'
+                ])
+            
+            return facilities
             
+        except Exception as e:
+            print(f"Error fetching nearby hospitals: {str(e)}")
+            return []
+    
+    @staticmethod
+    def _nearby_facilities(latitude, longitude, radius, keyword, limit, pages):
+        """Facilities without distance from the Places API and/or the local index, per FACILITY_INDEX_MODE"""
+        mode = Config.FACILITY_INDEX_MODE if facility_index is not None else 'off'
+        if mode == 'local':
+            return facility_index.nearby(latitude, longitude, radius, keyword, limit)
+        
+        if mode == 'race':
+            # The API's answer is richer, so it wins if it arrives in time; a late call
+            # keeps running and still fills the cache for the next lookup. With every
+            # slot held by a slow upstream, answer locally rather than queue another.
+            # Every page after the first waits PLACES_PAGE_TOKEN_DELAY for its token,
+            # so the race allows that on top, or a multi-page search could never win.
+            facilities = []
+            timeout = Config.FACILITY_INDEX_RACE_TIMEOUT + (pages - 1) * Config.PLACES_PAGE_TOKEN_DELAY
+            if _race_slots.acquire(blocking=False):
+                remote = _race_pool.submit(GooglePlacesService._race_remote, latitude, longitude, radius, keyword, pages)
+                try:
+                    facilities = remote.result(timeout=timeout)
+                except FuturesTimeoutError:
+                    pass
+        else:
+            facilities = GooglePlacesService._remote_nearby(latitude, longitude, radius, keyword, pages)
+        
+        if not facilities and mode in ('race', 'fallback'):
+            facilities = facility_index.nearby(latitude, longitude, radius, keyword, limit)
+        return facilities
+    
+    @staticmethod
+    def _race_remote(latitude, longitude, radius, keyword, pages):
+        try:
+            return GooglePlacesService._remote_nearby(latitude, longitude, radius, keyword, pages)
+        finally:
+            _race_slots.release()
+    
+    @staticmethod
+    def _remote_nearby(latitude, longitude, radius, keyword, pages):
+        if places_cache is not None:
+            # Shared per geohash cell; distances are still the user's own
+            return places_cache.lookup(latitude, longitude, radius, keyword, pages)
+        return GooglePlacesService._search_nearby(latitude, longitude, radius, keyword, pages)
+    
+    @staticmethod
+    def _search_nearby(latitude, longitude, radius, keyword, pages=1):
+        """
+        Nearby Search around a point, following next_page_token for up to pages
+        pages; every result, without distance, [] on any error on the first page
+        """
+        try:
+            # Nearby Search API
             params = {
                 'location': f"{latitude},{longitude}",
                 'radius': radius,
@@ -37,46 +113,88 @@ class GooglePlacesService:
                 'key': Config.GOOGLE_MAPS_API_KEY
             }
             
-            response = requests.get(url, params=params)
+            response = places_http.get('/nearbysearch/json', params=params)
             data = response.json()
             
             if data.get('status') != 'OK':
                 print(f"Google Places API error: {data.get('status')}")
                 return []
             
-            facilities = []
-            for place in data.get('results', [])[:10]:  # Limit to top 10
-                facility = {
-                    'place_id': place.get('place_id'),
-                    'name': place.get('name'),
-                    'address': place.get('vicinity'),
-                    'location': {
-                        'lat': place.get('geometry', {}).get('location', {}).get('lat'),
-                        'lng': place.get('geometry', {}).get('location', {}).get('lng')
-                    },
-                    'rating': place.get('rating'),
-                    'user_ratings_total': place.get('user_ratings_total'),
-                    'open_now': place.get('opening_hours', {}).get('open_now'),
-                    'types': place.get('types', []),
-                    'distance': None  # Will be calculated
-                }
-                
-                # Calculate distance
-                facility['distance'] = GooglePlacesService._calculate_distance(
-                    latitude, longitude,
-                    facility['location']['lat'], facility['location']['lng']
-                )
-                
-                facilities.append(facility)
-            
-            # Sort by distance
-            facilities.sort(key=lambda x: x.get('distance', float('inf')))
-            
-            return facilities
-            
         except Exception as e:
             print(f"Error fetching nearby hospitals: {str(e)}")
             return []
+        
+        facilities = [GooglePlacesService._facility(place) for place in data.get('results', [])]
+        
+        # Each token comes with the previous page, so pages are fetched in order;
+        # a failure on a later page keeps what has been retrieved so far
+        for _ in range(pages - 1):
+            token = data.get('next_page_token')
+            if not token:
+                break
+            try:
+                data = GooglePlacesService._next_page(token)
+            except Exception as e:
+                print(f"Error fetching next page of nearby hospitals: {str(e)}")
+                break
+            if data.get('status') != 'OK':
+                print(f"Google Places API error on next page: {data.get('status')}")
+                break
+            facilities.extend(GooglePlacesService._facility(place) for place in data.get('results', []))
+        
+        return facilities
+    
+    @staticmethod
+    def _next_page(token):
+        """Page for a next_page_token; Places answers INVALID_REQUEST until a fresh token becomes valid"""
+        params = {'pagetoken': token, 'key': Config.GOOGLE_MAPS_API_KEY}
+        for _ in range(Config.PLACES_PAGE_TOKEN_ATTEMPTS):
+            time.sleep(Config.PLACES_PAGE_TOKEN_DELAY)
+            data = places_http.get('/nearbysearch/json', params=params).json()
+            if data.get('status') != 'INVALID_REQUEST':
+                break
+        return data
+    
+    @staticmethod
+    def _facility(place):
+        """Facility dict for a Nearby Search result"""
+        return {
+            'place_id': place.get('place_id'),
+            'name': place.get('name'),
+            'address': place.get('vicinity'),
+            'location': {
+                'lat': place.get('geometry', {}).get('location', {}).get('lat'),
+                'lng': place.get('geometry', {}).get('location', {}).get('lng')
+            },
+            'rating': place.get('rating'),
+            'user_ratings_total': place.get('user_ratings_total'),
+            'open_now': place.get('opening_hours', {}).get('open_now'),
+            'types': place.get('types', [])
+        }
+    
+    @staticmethod
+    def _nearest(facilities, latitude, longitude, limit, radius=None):
+        """
+        Copies of the limit facilities nearest the user, with distance, nearest
+        first; with radius (meters), only those within it (cached searches are
+        made from the cell centre with a wider radius)
+        """
+        max_km = float(radius) / 1000 if radius is not None else float('inf')
+        distances = []
+        for i, facility in enumerate(facilities):
+            distance = GooglePlacesService._calculate_distance(
+                latitude, longitude,
+                facility['location']['lat'], facility['location']['lng'],
+                digits=None
+            )
+            if distance <= max_km:
+                distances.append((round(distance, 2), i))
+        
+        # Bounded heap of size limit; ties keep the API's order
+        return [
+            {**facilities[i], 'distance': distance}
+            for distance, i in heapq.nsmallest(limit, distances)
+        ]
     
     @staticmethod
     def get_place_details(place_id):
@@ -89,16 +207,42 @@ class GooglePlacesService:
         Returns:
             Detailed place information
         """
+        if place_details_cache is not None:
+            return place_details_cache.get(place_id)
+        return GooglePlacesService._fetch_place_details(place_id)
+    
+    @staticmethod
+    def get_places_details(place_ids):
+        """
+        Get details for several places at once
+        
+        Args:
+            place_ids: Google Place IDs
+        
+        Returns:
+            Dict of place_id -> detailed place information; unknown places are left out
+        """
+        if place_details_cache is not None:
+            return place_details_cache.get_many(place_ids)
+        
+        details = {}
+        for place_id in dict.fromkeys(place_ids):
+            result = GooglePlacesService._fetch_place_details(place_id)
+            if result:
+                details[place_id] = result
+        return details
+    
+    @staticmethod
+    def _fetch_place_details(place_id):
+        """Place Details API call; {} when unknown or on any error"""
         try:
-            url = f"{GooglePlacesService.BASE_URL}/details/json"
-            
             params = {
                 'place_id': place_id,
                 'fields': 'name,formatted_address,formatted_phone_number,opening_hours,website,rating,reviews',
                 'key': Config.GOOGLE_MAPS_API_KEY
             }
             
-            response = requests.get(url, params=params)
+            response = places_http.get('/details/json', params=params)
             data = response.json()
             
             if data.get('status') == 'OK':
@@ -111,8 +255,8 @@ class GooglePlacesService:
             return {}
     
     @staticmethod
-    def _calculate_distance(lat1, lon1, lat2, lon2):
-        """Calculate distance between two coordinates in kilometers"""
+    def _calculate_distance(lat1, lon1, lat2, lon2, digits=2):
+        """Calculate distance between two coordinates in kilometers (digits=None: unrounded)"""
         import math
         
         if not all([lat1, lon1, lat2, lon2]):
@@ -127,10 +271,10 @@ class GooglePlacesService:
         a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
         c = 2 * math.asin(math.sqrt(a))
         
-        return round(R * c, 2)  # Distance in km, rounded to 2 decimals
+        return round(R * c, digits) if digits is not None else R * c  # Distance in km, rounded to 2 decimals by default
     
     @staticmethod
-    def find_specialized_facilities(latitude, longitude, specialization, radius=10000):
+    def find_specialized_facilities(latitude, longitude, specialization, radius=10000, limit=10, pages=1):
         """
         Find medical facilities based on specialization
         
@@ -139,21 +283,51 @@ class GooglePlacesService:
             longitude: User's longitude
             specialization: Medical specialization (cardiology, neurology, etc.)
             radius: Search radius in meters
+            limit: Number of facilities to return, nearest first
+            pages: Result pages to retrieve
         
         Returns:
             List of specialized medical facilities
         """
-        keywords_map = {
-            'Cardiology': 'cardiology heart center',
-            'Neurology': 'neurology brain center',
-            'Orthopedics': 'orthopedic bone joint',
-            'Pediatrics': 'pediatric children hospital',
-            'Emergency': 'emergency room urgent care',
-            'General Practice': 'clinic medical center'
-        }
-        
-        keyword = keywords_map.get(specialization, 'medical center')
+        # Search keyword per specialization, from the triage rule file
+        rules = rule_engine.rules
+        keyword = rules.facility_keywords.get(specialization, rules.facility_default_keyword)
+        rules.record_hits('facility_keywords', [specialization if specialization in rules.facility_keywords else 'default'])
         
         return GooglePlacesService.find_nearby_hospitals(
-            latitude, longitude, radius, keyword
+            latitude, longitude, radius, keyword, limit, pages
         )
+
+
+# Pooled keep-alive session with timeouts, retries and a circuit breaker per endpoint
+places_http = HTTPClient(
+    GooglePlacesService.BASE_URL,
+    pool_size=Config.PLACES_HTTP_POOL_SIZE,
+    timeouts=Config.PLACES_TIMEOUTS,
+    retries=Config.PLACES_HTTP_RETRIES,
+    breaker_threshold=Config.PLACES_BREAKER_THRESHOLD,
+    breaker_reset=Config.PLACES_BREAKER_RESET
+)
+
+# Nearby searches shared per geohash cell, served stale while refreshing
+places_cache = PlacesCache(
+    GooglePlacesService._search_nearby,
+    precision=Config.PLACES_CACHE_PRECISION,
+    ttl=Config.PLACES_CACHE_TTL,
+    stale_ttl=Config.PLACES_CACHE_STALE_TTL,
+    max_entries=Config.PLACES_CACHE_MAX_ENTRIES
+) if Config.PLACES_CACHE_ENABLED else None
+
+# Details persisted per place_id in MongoDB, prefetched after nearby searches
+place_details_cache = PlaceDetailsCache(
+    place_details_collection,
+    GooglePlacesService._fetch_place_details,
+    ttl=Config.PLACE_DETAILS_TTL,
+    workers=Config.PLACE_DETAILS_WORKERS,
+    db_timeout=Config.PLACE_DETAILS_DB_TIMEOUT,
+    db_retry=Config.PLACE_DETAILS_DB_RETRY
+) if Config.PLACE_DETAILS_CACHE_ENABLED else None
+
+# Remote searches racing the local facility index
+_race_pool = ThreadPoolExecutor(max_workers=Config.PLACES_HTTP_POOL_SIZE, thread_name_prefix='places-race')
+_race_slots = threading.BoundedSemaphore(Config.FACILITY_INDEX_RACE_MAX)  # races whose remote call is still out
@@ -0,0 +1,131 @@
+"""
+Background job queue for work the client should not wait on.
+Jobs are keyed: enqueueing a key that is already queued, running or
+done returns the existing job instead of running it twice. A failing
+handler is retried with exponential backoff up to max_retries.
+
+LocalJobQueue runs jobs on a thread pool inside the web process. It is
+the only backend for now, and what tests and single-process deployments
+use; anything with the same enqueue/get/wait/stats interface can stand in.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Job:
+    def __init__(self, key, name, payload):
+        self.key = key
+        self.name = name
+        self.payload = payload
+        self.status = 'queued'  # queued, running, retrying, done, failed
+        self.attempts = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished = threading.Event()
+    
+    def to_dict(self):
+        return {
+            'key': self.key,
+            'name': self.name,
+            'status': self.status,
+            'attempts': self.attempts,
+            'error': self.error
+        }
+
+
+class LocalJobQueue:
+    def __init__(self, workers=2, max_retries=3, retry_delay=1.0, keep_finished=1000):
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.keep_finished = keep_finished
+        self._handlers = {}  # name -> (handler, on_failure)
+        self._jobs = OrderedDict()  # key -> Job, oldest first
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='jobs')
+        self.retries = 0
+        self.failures = 0
+    
+    def register(self, name, handler, on_failure=None):
+        """on_failure(job) runs once a job has used up its retries"""
+        self._handlers[name] = (handler, on_failure)
+    
+    def enqueue(self, name, key, **payload):
+        """Queue handler `name` with payload, once per key. Failed jobs may be re-queued."""
+        if name not in self._handlers:
+            raise KeyError(f'No handler registered for job {name!r}')
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != 'failed':
+                return job
+            job = Job(key, name, payload)
+            self._jobs[key] = job
+            self._jobs.move_to_end(key)
+            self._prune()
+        self._executor.submit(self._run, job)
+        return job
+    
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+    
+    def wait(self, key, timeout=None):
+        """Block until the job finishes (done or failed); returns it, or None if unknown"""
+        job = self.get(key)
+        if job is not None:
+            job.finished.wait(timeout)
+        return job
+    
+    def _run(self, job):
+        job.status = 'running'
+        job.attempts += 1
+        try:
+            handler, on_failure = self._handlers[job.name]
+            job.result = handler(**job.payload)
+            job.status = 'done'
+            job.error = None
+        except Exception as e:
+            job.error = str(e)
+            if job.attempts > self.max_retries:
+                job.status = 'failed'
+                with self._lock:
+                    self.failures += 1
+                if on_failure is not None:
+                    try:
+                        on_failure(job)
+                    except Exception:
+                        pass
+            else:
+                job.status = 'retrying'
+                with self._lock:
+                    self.retries += 1
+                # Back off without holding a worker thread
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                timer = threading.Timer(delay, self._executor.submit, (self._run, job))
+                timer.daemon = True
+                timer.start()
+                return
+        job.finished.set()
+    
+    def _prune(self):
+        """Forget the oldest finished jobs beyond keep_finished (caller holds the lock)"""
+        finished = [key for key, job in self._jobs.items() if job.finished.is_set()]
+        for key in finished[:max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[key]
+    
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                'jobs': counts,
+                'retries': self.retries,
+                'failures': self.failures
+            }
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,112 @@
+"""
+Precompiled multi-keyword matcher for the symptom keyword tables.
+
+All keywords of a table are folded into one trie-shaped regex, tried at
+every candidate start position through a zero-width lookahead, so one
+pass over the text finds every keyword occurrence, overlapping ones
+included. At a given position the regex yields the longest keyword;
+shorter keywords that are prefixes of it ("chest" in "chest pain") are
+credited from a table built once at load.
+
+word_boundary:
+    'left'  keywords must start a word, but may end mid-word
+            ("itch" matches "itching", "ear" does not match "heart")
+    'both'  keywords must be whole words or phrases
+    None    plain substring matching
+"""
+
+import re
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _trie_pattern(words, end=''):
+    """
+    Regex for a set of words, shaped like their trie so each position is
+    tried once per character. `end` is asserted after every word.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+    
+    def build(node):
+        ends_here = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return end
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if ends_here:
+            # Longer branches first: the longest keyword wins, shorter ones are prefixes of it
+            return '(?:' + body + '|' + end + ')' if end else '(?:' + body + ')?'
+        return body
+    
+    return build(trie)
+
+
+class KeywordMatcher:
+    def __init__(self, categories, word_boundary='left'):
+        """categories: {category: [keyword, ...]}; category order is kept in results"""
+        if word_boundary not in ('left', 'both', None):
+            raise ValueError(f'Unknown word_boundary {word_boundary!r}')
+        self.word_boundary = word_boundary
+        self.category_order = list(categories)
+        
+        # keyword -> categories it belongs to
+        self._categories = {}
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                self._categories.setdefault(keyword.lower(), []).append(category)
+        
+        keywords = sorted(self._categories, key=len, reverse=True)
+        whole_words = word_boundary == 'both'
+        # keyword -> itself plus every shorter keyword it starts with (that
+        # also ends a word, for 'both'), longest first
+        self._prefixes = {
+            keyword: [
+                other for other in keywords
+                if keyword.startswith(other)
+                and not (whole_words and other != keyword and _is_word_char(keyword[len(other)]))
+            ]
+            for keyword in keywords
+        }
+        
+        left = r'(?<!\w)' if word_boundary in ('left', 'both') else ''
+        right = r'(?!\w)' if whole_words else ''
+        self._pattern = re.compile(left + '(?=(' + _trie_pattern(keywords, right) + '))') if keywords else None
+    
+    def match(self, text):
+        """
+        {category: [matched keywords in text order]} for every category hit,
+        ordered like the table. Matching is case-insensitive.
+        """
+        if self._pattern is None or not text:
+            return {}
+        found = {}
+        # findall does the scan in C; only distinct keywords reach Python
+        for longest in dict.fromkeys(self._pattern.findall(text.lower())):
+            for keyword in self._prefixes[longest]:
+                for category in self._categories[keyword]:
+                    hits = found.setdefault(category, [])
+                    if keyword not in hits:
+                        hits.append(keyword)
+        
+        return {category: found[category] for category in self.category_order if category in found}
+    
+    def match_many(self, texts):
+        """match() for each text, in order; repeated texts are matched once"""
+        seen = {}
+        results = []
+        for text in texts:
+            result = seen.get(text)
+            if result is None:
+                result = seen[text] = self.match(text)
+            results.append(result)
+        return results
+    
+    def categories(self, text):
+        return list(self.match(text))
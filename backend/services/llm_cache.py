@@ -0,0 +1,195 @@
+"""
+Tiered response cache for GeminiService.
+
+Exact tier: LRU with TTL keyed on the method name and a normalized form
+of the method's input. Near-duplicate tier (optional per method): an
+inverted index of character shingles that returns a cached response
+whose input has Jaccard similarity above the method's threshold.
+Everything is local and CPU-only.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+from utils.cache import LRUCache
+
+_WHITESPACE = re.compile(r'\s+')
+# Symbols that change clinical meaning ("HIV+" / "HIV-", "BP > 140" / "BP < 140")
+# stay in the key as separate tokens; other punctuation is dropped
+_SYMBOLS = re.compile(r'([+\-<>/%=])')
+_PUNCTUATION = re.compile(r'[^\w\s+\-<>/%=]')
+# Words a near-duplicate may add or drop; negations are deliberately not here
+_STOP_WORDS = frozenset(
+    'a an the and or of to for in on at by is are was were be been has have had '
+    'my me i you your please this that it its'.split()
+)
+
+
+def normalize(text):
+    """Lowercase, drop punctuation except meaningful symbols and collapse whitespace"""
+    text = _SYMBOLS.sub(r' \1 ', _PUNCTUATION.sub(' ', text.lower()))
+    return _WHITESPACE.sub(' ', text).strip()
+
+
+def guard_signature(text):
+    """
+    Every token of normalized text outside a small stop-word list, in order.
+    Near-duplicates must match these exactly, so a different dose, symbol,
+    negation or term (hypotension / hypertension) never shares a response.
+    """
+    return tuple(token for token in text.split(' ') if token not in _STOP_WORDS)
+
+
+def shingles(text, size=4):
+    """Set of overlapping character n-grams of normalized text"""
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class ShingleIndex:
+    """Bounded LRU of (shingle set, value) with an inverted index for similarity lookup"""
+    
+    def __init__(self, max_entries=500, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (shingle set, signature, value, expires_at)
+        self._postings = defaultdict(set)  # shingle -> keys
+        self._lock = threading.Lock()
+    
+    def add(self, key, text, value):
+        grams = shingles(text)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (grams, guard_signature(text), value, expires_at)
+            for gram in grams:
+                self._postings[gram].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def find(self, text, threshold):
+        """
+        Most similar live entry with Jaccard >= threshold and the same guard
+        signature, as (value, similarity), or None
+        """
+        grams = shingles(text)
+        signature = guard_signature(text)
+        now = time.monotonic()
+        with self._lock:
+            overlap = defaultdict(int)
+            for gram in grams:
+                for key in self._postings.get(gram, ()):
+                    overlap[key] += 1
+            
+            best_key, best_score = None, threshold
+            for key, shared in overlap.items():
+                entry_grams, entry_signature, _, expires_at = self._entries[key]
+                if entry_signature != signature or (expires_at is not None and expires_at <= now):
+                    continue
+                score = shared / (len(grams) + len(entry_grams) - shared)
+                if score >= best_score:
+                    best_key, best_score = key, score
+            
+            if best_key is None:
+                return None
+            self._entries.move_to_end(best_key)
+            return self._entries[best_key][2], best_score
+    
+    def _remove(self, key):
+        grams, _, _, _ = self._entries.pop(key)
+        for gram in grams:
+            keys = self._postings.get(gram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._postings[gram]
+    
+    def __len__(self):
+        return len(self._entries)
+
+
+class MethodCache:
+    """Exact and near-duplicate tiers for one GeminiService method"""
+    
+    def __init__(self, ttl, max_entries, near_duplicate=None):
+        self.near_duplicate = near_duplicate
+        self.exact = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.similar = ShingleIndex(max_entries=max_entries, ttl=ttl) if near_duplicate else None
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.miss_seconds = 0.0  # upstream time spent on misses
+    
+    def get(self, cache_input):
+        key = normalize(cache_input)
+        value = self.exact.get(key)
+        if value is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return value
+        
+        if self.similar is not None:
+            match = self.similar.find(key, self.near_duplicate)
+            if match is not None:
+                with self._lock:
+                    self.near_hits += 1
+                return match[0]
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def put(self, cache_input, value, elapsed):
+        key = normalize(cache_input)
+        self.exact.set(key, value)
+        if self.similar is not None:
+            self.similar.add(key, key, value)
+        with self._lock:
+            self.miss_seconds += elapsed
+    
+    def stats(self):
+        with self._lock:
+            hits = self.exact_hits + self.near_hits
+            lookups = hits + self.misses
+            average_miss = self.miss_seconds / self.misses if self.misses else 0.0
+            return {
+                'exact_hits': self.exact_hits,
+                'near_duplicate_hits': self.near_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                'entries': self.exact.stats()['entries'],
+                'average_miss_seconds': round(average_miss, 3),
+                # Every hit saved roughly one average upstream call
+                'latency_saved_seconds': round(hits * average_miss, 3)
+            }
+
+
+class ResponseCache:
+    """
+    Per-method caches built from a policy dict:
+        {'method': {'ttl': seconds, 'max_entries': n, 'near_duplicate': 0.9 or None}}
+    Methods missing from the dict, or mapped to None, are not cached.
+    """
+    
+    def __init__(self, policies):
+        self._methods = {
+            method: MethodCache(policy.get('ttl'), policy.get('max_entries', 500), policy.get('near_duplicate'))
+            for method, policy in policies.items() if policy
+        }
+    
+    def get(self, method, cache_input):
+        cache = self._methods.get(method)
+        return cache.get(cache_input) if cache else None
+    
+    def put(self, method, cache_input, value, elapsed):
+        cache = self._methods.get(method)
+        if cache:
+            cache.put(cache_input, value, elapsed)
+    
+    def stats(self):
+        return {method: cache.stats() for method, cache in self._methods.items()}
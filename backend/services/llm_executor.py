@@ -0,0 +1,132 @@
+"""
+Bounded execution layer for LLM calls.
+generate_content runs on a small thread pool instead of in the request
+thread. A semaphore caps running plus queued calls, every call has a
+timeout, and identical prompts already in flight share one upstream call.
+The timeout is also passed to the SDK, so a call that outlives it frees
+its pool thread and slot instead of holding them until the upstream answers.
+Streamed responses run on the request thread and take their slots from a
+separate semaphore, so they cannot starve pooled calls (or each other)
+beyond max_concurrency.
+"""
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+
+class LLMBusyError(Exception):
+    """Raised when no execution slot frees up within the queue timeout"""
+
+
+class LLMTimeoutError(Exception):
+    """Raised when a call does not finish within its timeout"""
+
+
+class LLMExecutor:
+    def __init__(self, model_factory, max_concurrency=8, max_queue=32,
+                 timeout=30, queue_timeout=2):
+        # Called for every request so the model can be created lazily or swapped
+        self.model_factory = model_factory
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='llm')
+        self._slots = threading.BoundedSemaphore(max_concurrency + max_queue)
+        self._stream_slots = threading.BoundedSemaphore(max_concurrency)
+        self._inflight = {}  # prompt -> Future
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.timeouts = 0
+    
+    def submit(self, prompt, **kwargs):
+        """
+        Start (or join) a call for `prompt` and return a Future of the response.
+        Raises LLMBusyError when the queue stays full for queue_timeout seconds.
+        """
+        key = (prompt, tuple(sorted(kwargs.items())))
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+        
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise LLMBusyError('Too many AI requests in progress, please retry')
+        
+        with self._lock:
+            # Another thread may have started the same prompt while we waited
+            future = self._inflight.get(key)
+            if future is not None:
+                self._slots.release()
+                self.coalesced += 1
+                return future
+            future = self._executor.submit(self._call, prompt, kwargs)
+            self._inflight[key] = future
+            self.calls += 1
+        
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+    
+    def generate(self, prompt, timeout=None, **kwargs):
+        """Blocking call that returns the model response or raises LLMTimeoutError"""
+        future = self.submit(prompt, **kwargs)
+        try:
+            return future.result(timeout=timeout or self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise LLMTimeoutError(f'AI request timed out after {timeout or self.timeout}s')
+    
+    async def generate_async(self, prompt, timeout=None, **kwargs):
+        """asyncio variant of generate()"""
+        future = asyncio.wrap_future(self.submit(prompt, **kwargs))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self.timeouts += 1
+            raise LLMTimeoutError(f'AI request timed out after {timeout or self.timeout}s')
+    
+    @contextmanager
+    def reserve(self):
+        """
+        Hold one stream slot for a call made outside the pool (e.g. a
+        streamed response consumed by the request thread). Yields the
+        request_options to pass to generate_content so the SDK applies
+        the executor timeout. Raises LLMBusyError like submit().
+        """
+        if not self._stream_slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise LLMBusyError('Too many AI requests in progress, please retry')
+        with self._lock:
+            self.calls += 1
+        try:
+            yield {'timeout': self.timeout}
+        finally:
+            self._stream_slots.release()
+    
+    def _call(self, prompt, kwargs):
+        kwargs.setdefault('request_options', {'timeout': self.timeout})
+        return self.model_factory().generate_content(prompt, **kwargs)
+    
+    def _finish(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        self._slots.release()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'in_flight': len(self._inflight)
+            }
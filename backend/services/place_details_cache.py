@@ -0,0 +1,161 @@
+"""
+Persistent cache for Places details, one MongoDB document per place_id:
+
+    {'_id': place_id, 'details': {...}, 'fetched_at': datetime, 'expires_at': datetime}
+
+A TTL index on expires_at (expireAfterSeconds=0) lets MongoDB purge old
+entries; reads also filter on expires_at, since the TTL monitor only runs
+about once a minute. Storing the expiry per document means changing the
+TTL setting never conflicts with the existing index.
+
+Misses for the same place_id share one upstream call, batches read
+everything cached in one query and fetch the rest concurrently, and
+prefetch() warms the cache in the background after a nearby search. A
+failed MongoDB read or write is logged and treated as a miss. Each
+operation gets db_timeout seconds, server selection included, and after
+a failure MongoDB is skipped for db_retry seconds, then tried again with
+one call, so an unreachable database costs one short wait rather than
+pymongo's 30 s server selection on every lookup.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pymongo
+from pymongo.errors import PyMongoError
+
+from utils.http_client import CircuitBreaker
+
+
+class PlaceDetailsCache:
+    def __init__(self, collection, fetch, ttl=24 * 3600, workers=8, db_timeout=0.5, db_retry=30.0):
+        """fetch(place_id) -> details dict, {} when the place is unknown or the call failed"""
+        self.collection = collection
+        self.fetch = fetch
+        self.ttl = ttl
+        self.db_timeout = db_timeout
+        self._db = CircuitBreaker(failure_threshold=1, reset_timeout=db_retry)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='place-details')
+        self._inflight = {}  # place_id -> Future of the running upstream call
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.prefetched = 0
+        self.upstream_calls = 0
+        self.store_errors = 0
+        self.db_skipped = 0
+    
+    def get(self, place_id):
+        """Details for one place, {} if unknown"""
+        return self.get_many([place_id]).get(place_id, {})
+    
+    def get_many(self, place_ids):
+        """{place_id: details} for every id that resolved; unknown places are left out"""
+        place_ids = list(dict.fromkeys(place_ids))
+        found = self._read(place_ids)
+        missing = [place_id for place_id in place_ids if place_id not in found]
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+        
+        futures = {place_id: self._load(place_id) for place_id in missing}
+        for place_id, future in futures.items():
+            details = future.result()
+            if details:
+                found[place_id] = details
+        return {place_id: found[place_id] for place_id in place_ids if place_id in found}
+    
+    def prefetch(self, place_ids):
+        """Warm the cache for place_ids in the background; returns immediately"""
+        place_ids = [place_id for place_id in dict.fromkeys(place_ids) if place_id]
+        if place_ids:
+            self._pool.submit(self._prefetch, place_ids)
+    
+    def _prefetch(self, place_ids):
+        missing = [place_id for place_id in place_ids if place_id not in self._read(place_ids)]
+        with self._lock:
+            self.prefetched += len(missing)
+        for place_id in missing:
+            self._load(place_id)
+    
+    def _db_allowed(self):
+        if self._db.allow():
+            return True
+        with self._lock:
+            self.db_skipped += 1
+        return False
+    
+    def _read(self, place_ids):
+        if not self._db_allowed():
+            return {}
+        try:
+            with pymongo.timeout(self.db_timeout):
+                cursor = self.collection.find(
+                    {'_id': {'$in': place_ids}, 'expires_at': {'$gt': datetime.utcnow()}},
+                    {'details': 1}
+                )
+                found = {doc['_id']: doc['details'] for doc in cursor}
+        except PyMongoError as e:
+            self._db.record_failure()
+            print(f"Place details cache read failed: {str(e)}")
+            return {}
+        self._db.record_success()
+        return found
+    
+    def _load(self, place_id):
+        """Future for the upstream call for place_id, started on the pool unless one is running"""
+        with self._lock:
+            future = self._inflight.get(place_id)
+            if future is not None:
+                return future
+            future = self._inflight[place_id] = Future()
+            self.upstream_calls += 1
+        self._pool.submit(self._fetch, place_id, future)
+        return future
+    
+    def _fetch(self, place_id, future):
+        try:
+            details = self.fetch(place_id)
+            if details:
+                self._store(place_id, details)
+            future.set_result(details)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[place_id]
+    
+    def _store(self, place_id, details):
+        if not self._db_allowed():
+            return
+        now = datetime.utcnow()
+        try:
+            with pymongo.timeout(self.db_timeout):
+                self.collection.replace_one(
+                    {'_id': place_id},
+                    {'details': details, 'fetched_at': now, 'expires_at': now + timedelta(seconds=self.ttl)},
+                    upsert=True
+                )
+        except PyMongoError as e:
+            self._db.record_failure()
+            with self._lock:
+                self.store_errors += 1
+            print(f"Place details cache write failed: {str(e)}")
+            return
+        self._db.record_success()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'prefetched': self.prefetched,
+                'upstream_calls': self.upstream_calls,
+                'store_errors': self.store_errors,
+                'db': self._db.state,
+                'db_skipped': self.db_skipped
+            }
@@ -0,0 +1,136 @@
+"""
+Spatial cache for Places nearby searches.
+
+Queries snap to a geohash cell and are keyed on (cell, radius, keyword,
+pages), so everyone in the same ~1 km cell shares one upstream search, made from
+the cell centre with the radius widened by the centre-to-corner distance, so
+the search circle covers every user's own circle in the cell. Entries hold
+facility lists without distances; callers compute each user's distance
+locally from the cached coordinates and drop what lies beyond their radius.
+
+Stale-while-revalidate: a fresh entry (younger than ttl) is served as is;
+a stale one (up to ttl + stale_ttl) is served immediately while a single
+background refresh runs, so a lookup only waits on the upstream when the
+cell has no recent answer at all. Concurrent misses for the same key
+share one upstream call. Empty results are not stored: the search returns
+[] on upstream errors too, and a stale answer beats none.
+"""
+
+import math
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from utils.cache import LRUCache
+from utils.geo import geohash, geohash_bounds, geohash_center, haversine_km
+
+MAX_SEARCH_RADIUS = 50000  # meters, the Places Nearby Search limit
+
+
+class PlacesCache:
+    def __init__(self, fetch, precision=6, ttl=600, stale_ttl=3600, max_entries=2000, refresh_workers=2):
+        """
+        fetch(latitude, longitude, radius, keyword, pages) -> list of facility dicts,
+        called with the cell centre and the widened radius on misses and refreshes.
+        """
+        self.fetch = fetch
+        self.precision = precision
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = LRUCache(max_entries=max_entries, ttl=ttl + stale_ttl)  # key -> (fetched_at, facilities)
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix='places-refresh')
+        self._inflight = {}  # key -> Future of the running upstream call
+        self._lock = threading.Lock()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.upstream_calls = 0
+    
+    def key(self, latitude, longitude, radius, keyword, pages=1):
+        return geohash(float(latitude), float(longitude), self.precision), int(radius), keyword, pages
+    
+    @staticmethod
+    def search_radius(cell, radius):
+        """Radius around the cell centre that covers radius meters from anywhere in the cell"""
+        south, west, north, east = geohash_bounds(cell)
+        latitude, longitude = geohash_center(cell)
+        # The corner nearer the equator is the farther one
+        corner = max(haversine_km(latitude, longitude, corner_lat, east) for corner_lat in (south, north))
+        return min(radius + math.ceil(corner * 1000), MAX_SEARCH_RADIUS)
+    
+    def lookup(self, latitude, longitude, radius, keyword, pages=1):
+        """Cached facilities (no distance field) for the cell containing (latitude, longitude)"""
+        key = self.key(latitude, longitude, radius, keyword, pages)
+        entry = self._entries.get(key)
+        if entry is not None:
+            fetched_at, facilities = entry
+            if time.monotonic() - fetched_at < self.ttl:
+                with self._lock:
+                    self.fresh_hits += 1
+            else:
+                with self._lock:
+                    self.stale_hits += 1
+                self._revalidate(key)
+            return facilities
+        
+        with self._lock:
+            self.misses += 1
+        return self._load(key).result()
+    
+    def _revalidate(self, key):
+        with self._lock:
+            if key in self._inflight:
+                return
+            future = self._inflight[key] = Future()  # claimed before queueing, so refreshes never pile up
+            self.refreshes += 1
+            self.upstream_calls += 1
+        self._refresher.submit(self._fetch, key, future)
+    
+    def _load(self, key):
+        """Run the upstream call for key, or join the one already running"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = Future()
+            self.upstream_calls += 1
+        self._fetch(key, future)
+        return future
+    
+    def _fetch(self, key, future):
+        cell, radius, keyword, pages = key
+        latitude, longitude = geohash_center(cell)
+        try:
+            facilities = self.fetch(latitude, longitude, self.search_radius(cell, radius), keyword, pages)
+            if facilities:
+                self._entries.set(key, (time.monotonic(), facilities))
+            else:
+                stale = self._entries.get(key)
+                facilities = stale[1] if stale is not None else facilities
+            future.set_result(facilities)
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            hits = self.fresh_hits + self.stale_hits
+            lookups = hits + self.misses
+            return {
+                'entries': self._entries.stats()['entries'],
+                'precision': self.precision,
+                'ttl': self.ttl,
+                'stale_ttl': self.stale_ttl,
+                'fresh_hits': self.fresh_hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                'refreshes': self.refreshes,
+                'upstream_calls': self.upstream_calls
+            }
@@ -0,0 +1,162 @@
+"""
+Triage rule tables loaded from a versioned JSON file (rules/triage_rules.json):
+emergency keywords and actions, symptom -> specialization keywords, and
+the Places search keyword per specialization.
+
+Each load is validated and compiled into an immutable RuleSet, then
+swapped in with a single reference assignment, so readers always see
+one complete version and never take a lock to match. Every worker
+re-checks the file's mtime at most every RULES_CHECK_INTERVAL seconds
+and reloads on change; a file that fails to parse or validate is
+reported in metrics and the previous version stays live.
+Replace the file atomically (write a temp file, then rename) when editing.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+from config import Config
+from services.keyword_matcher import KeywordMatcher
+
+
+class RuleError(ValueError):
+    pass
+
+
+def _string_list(value, where):
+    if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+        raise RuleError(f'{where} must be a list of non-empty strings')
+    return value
+
+
+def _table(tables, name):
+    value = tables.get(name) or {}
+    if not isinstance(value, dict):
+        raise RuleError(f'{name} must be an object')
+    return value
+
+
+class RuleSet:
+    def __init__(self, tables):
+        if not isinstance(tables, dict) or 'version' not in tables:
+            raise RuleError('Rule file must be an object with a version')
+        self.version = tables['version']
+        
+        emergency = _table(tables, 'emergency')
+        self.emergency_keywords = {}
+        self.emergency_actions = {}
+        for emergency_type, rule in emergency.items():
+            if not isinstance(rule, dict) or not isinstance(rule.get('action'), str):
+                raise RuleError(f'emergency.{emergency_type} needs keywords and an action')
+            self.emergency_keywords[emergency_type] = _string_list(rule.get('keywords'), f'emergency.{emergency_type}.keywords')
+            self.emergency_actions[emergency_type] = rule['action']
+        self.emergency_default_action = tables.get('emergency_default_action', 'Call 911 immediately')
+        
+        self.specialization_keywords = {
+            specialization: _string_list(keywords, f'specializations.{specialization}')
+            for specialization, keywords in _table(tables, 'specializations').items()
+        }
+        
+        self.facility_keywords = _table(tables, 'facility_keywords')
+        if not all(isinstance(keyword, str) for keyword in self.facility_keywords.values()):
+            raise RuleError('facility_keywords values must be strings')
+        self.facility_default_keyword = tables.get('facility_default_keyword', 'medical center')
+        
+        self.emergency_matcher = KeywordMatcher(self.emergency_keywords)
+        self.specialization_matcher = KeywordMatcher(self.specialization_keywords)
+        
+        self.loaded_at = time.time()
+        self._hits = Counter()  # (table, category) -> matches under this version
+        self._hits_lock = threading.Lock()
+    
+    def record_hits(self, table, categories):
+        if categories:
+            with self._hits_lock:
+                for category in categories:
+                    self._hits[(table, category)] += 1
+    
+    def hits(self):
+        with self._hits_lock:
+            counts = {}
+            for (table, category), count in self._hits.items():
+                counts.setdefault(table, {})[category] = count
+            return counts
+
+
+class RuleEngine:
+    def __init__(self, path, check_interval=5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.reload_errors = 0
+        self.last_error = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._rules = None
+        self.reload()
+        if self._rules is None:
+            raise RuleError(f'Could not load rules from {path}: {self.last_error}')
+    
+    @property
+    def rules(self):
+        """The live RuleSet; re-checks the file at most every check_interval seconds"""
+        if self.check_interval is not None and time.monotonic() - self._checked_at >= self.check_interval:
+            self._check_file()
+        return self._rules
+    
+    def _check_file(self):
+        with self._lock:
+            if time.monotonic() - self._checked_at < self.check_interval:
+                return  # another thread just checked
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                self.last_error = str(e)
+                return
+            if mtime == self._mtime:
+                return
+        self.reload()
+    
+    def reload(self):
+        """Load, validate and compile the file, then swap it in. Returns True on success."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                # Remembered even if the file turns out broken, so it isn't re-parsed every interval
+                self._mtime = os.stat(self.path).st_mtime_ns
+                with open(self.path, encoding='utf-8') as f:
+                    rules = RuleSet(json.load(f))
+            except Exception as e:
+                # Anything a bad file can raise; the previous version stays live
+                self.reload_errors += 1
+                self.last_error = str(e)
+                return False
+            self._rules = rules
+            self.reloads += 1
+            self.last_error = None
+            return True
+    
+    def metrics(self):
+        rules = self._rules
+        return {
+            'version': rules.version,
+            'path': self.path,
+            'loaded_at': rules.loaded_at,
+            'reloads': self.reloads,
+            'reload_errors': self.reload_errors,
+            'last_error': self.last_error,
+            'rule_counts': {
+                'emergency': sum(len(keywords) for keywords in rules.emergency_keywords.values()),
+                'specializations': sum(len(keywords) for keywords in rules.specialization_keywords.values()),
+                'facility_keywords': len(rules.facility_keywords)
+            },
+            'hits': rules.hits()
+        }
+
+
+rule_engine = RuleEngine(Config.RULES_PATH, Config.RULES_CHECK_INTERVAL)
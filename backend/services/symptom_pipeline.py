@@ -0,0 +1,158 @@
+"""
+Concurrent stages behind a symptom report.
+Only the AI analysis depends on an earlier step (it needs the user's
+medical history); the emergency check and the preliminary doctor match
+work from the reported symptoms alone. So the user lookup and the LLM
+call run as one chain while the other two stages run beside it, and a
+report takes about as long as its slowest chain rather than the sum of
+every step.
+
+With analyze=False the LLM chain is skipped; the route hands it to
+analysis_jobs instead and the result is written back to the report.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from config import Config
+from services.doctor_matcher import DoctorMatcher
+from services.emergency_detector import EmergencyDetector
+from services.gemini_service import GeminiService
+from services.job_queue import LocalJobQueue
+from utils.db import symptom_reports_collection, users_collection
+
+
+def find_medical_history(user_id):
+    user = users_collection.find_one({'_id': ObjectId(user_id)})
+    return user.get('medical_history', []) if user else []
+
+
+def preliminary_match(report_data, user_location):
+    """Match on the keyword-derived specializations, without waiting for the AI analysis"""
+    doctors = DoctorMatcher.match_doctor({**report_data, 'ai_analysis': ''}, user_location)
+    for doctor in doctors:
+        doctor['_id'] = str(doctor['_id'])
+    return doctors
+
+
+class SymptomPipeline:
+    """
+    Stages are plain callables so they can be swapped out (benchmarks,
+    stubs). run() returns the same pieces the sequential route produced.
+    """
+    
+    def __init__(self, medical_history=find_medical_history,
+                 detect_emergency=EmergencyDetector.detect_emergency,
+                 analyze=GeminiService.analyze_symptoms,
+                 match_doctors=preliminary_match,
+                 max_workers=Config.SYMPTOM_PIPELINE_WORKERS):
+        self.medical_history = medical_history
+        self.detect_emergency = detect_emergency
+        self.analyze = analyze
+        self.match_doctors = match_doctors
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='symptoms')
+    
+    def run(self, data, report_data, analyze=True):
+        """
+        Returns {'emergency', 'ai_result', 'matched_doctors'}; ai_result is
+        None when analyze is False. The doctor match is started
+        speculatively and dropped for emergencies.
+        Exceptions from any stage propagate to the caller.
+        """
+        symptoms = data.get('symptoms', [])
+        
+        analysis = None
+        if analyze:
+            analysis = self._executor.submit(self._history_then_analyze, data.get('user_id'), symptoms)
+        doctors = self._executor.submit(self.match_doctors, dict(report_data), data.get('location'))
+        
+        # Keyword check is cheap; run it on the request thread meanwhile
+        emergency = self.detect_emergency(symptoms)
+        if emergency['is_emergency']:
+            doctors.cancel()
+            matched_doctors = []
+        else:
+            matched_doctors = doctors.result()
+        
+        return {
+            'emergency': emergency,
+            'ai_result': analysis.result() if analysis else None,
+            'matched_doctors': matched_doctors
+        }
+    
+    def _history_then_analyze(self, user_id, symptoms):
+        return self.analyze(symptoms, self.medical_history(user_id))
+    
+    def analyze_report(self, report_id, user_id, symptoms):
+        """Background job: run the AI analysis and store it on the report"""
+        report_filter = {'_id': ObjectId(report_id)}
+        # Another worker or process may already have finished this report
+        if symptom_reports_collection.find_one({**report_filter, 'ai_analysis_status': 'ready'}, {'_id': 1}):
+            return
+        
+        ai_result = self._history_then_analyze(user_id, symptoms)
+        if not ai_result['success']:
+            raise RuntimeError(ai_result.get('error', 'AI analysis failed'))
+        
+        symptom_reports_collection.update_one(report_filter, {'$set': {
+            'ai_analysis': ai_result['analysis'],
+            'ai_analysis_status': 'ready'
+        }})
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _analysis_failed(job):
+    symptom_reports_collection.update_one(
+        {'_id': ObjectId(job.key), 'ai_analysis_status': {'$ne': 'ready'}},
+        {'$set': {'ai_analysis_status': 'failed', 'ai_analysis_error': job.error}}
+    )
+
+
+symptom_pipeline = SymptomPipeline()
+
+# Deferred analyses, keyed by report id
+analysis_jobs = LocalJobQueue(
+    workers=Config.ANALYSIS_JOB_WORKERS,
+    max_retries=Config.ANALYSIS_JOB_RETRIES,
+    retry_delay=Config.ANALYSIS_JOB_RETRY_DELAY
+)
+analysis_jobs.register('analyze_report', symptom_pipeline.analyze_report, on_failure=_analysis_failed)
+
+
+def recover_pending_analyses(older_than=Config.ANALYSIS_RECOVER_AFTER):
+    """
+    Re-queue deferred analyses lost with a previous process: reports still
+    pending older_than seconds after they were created. Each report is
+    claimed with a conditional update so several workers starting at once
+    queue it only once, and a report that is still pending after one
+    re-queue is marked failed instead of being retried on every restart.
+    Returns (requeued, failed).
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=older_than)
+    stale = {'ai_analysis_status': 'pending', 'created_at': {'$lt': cutoff}}
+    
+    failed = symptom_reports_collection.update_many(
+        {**stale, 'ai_analysis_requeued_at': {'$lt': cutoff}},
+        {'$set': {'ai_analysis_status': 'failed', 'ai_analysis_error': 'Analysis lost in a restart'}}
+    ).modified_count
+    
+    requeued = 0
+    for report in symptom_reports_collection.find(
+            {**stale, 'ai_analysis_requeued_at': {'$exists': False}}, {'user_id': 1, 'symptoms': 1}):
+        claimed = symptom_reports_collection.update_one(
+            {'_id': report['_id'], 'ai_analysis_status': 'pending', 'ai_analysis_requeued_at': {'$exists': False}},
+            {'$set': {'ai_analysis_requeued_at': datetime.utcnow()}}
+        )
+        if claimed.modified_count:
+            report_id = str(report['_id'])
+            analysis_jobs.enqueue('analyze_report', report_id, report_id=report_id,
+                                  user_id=report.get('user_id'), symptoms=report.get('symptoms', []))
+            requeued += 1
+    
+    if requeued or failed:
+        print(f"Recovered pending analyses: {requeued} re-queued, {failed} marked failed")
+    return requeued, failed
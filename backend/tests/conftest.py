@@ -0,0 +1,12 @@
+"""
+Run from backend/:  python -m pytest -q
+
+Tests use local fakes only (benchmarks/fake_gemini.py, the fake Places
+server, in-memory stand-ins); nothing needs MongoDB, network or API keys.
+Tests of MongoDB queries use mongomock and are skipped without it.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
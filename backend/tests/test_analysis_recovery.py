@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+import threading
+
+import pytest
+from flask import Flask
+
+from services import symptom_pipeline
+
+mongomock = pytest.importorskip('mongomock')
+
+
+class RecordingQueue:
+    def __init__(self):
+        self.enqueued = []
+
+    def enqueue(self, name, key, **payload):
+        self.enqueued.append((name, key, payload))
+
+
+@pytest.fixture
+def reports(monkeypatch):
+    collection = mongomock.MongoClient().db.symptom_reports
+    monkeypatch.setattr(symptom_pipeline, 'symptom_reports_collection', collection)
+    monkeypatch.setattr(symptom_pipeline, 'analysis_jobs', RecordingQueue())
+    return collection
+
+
+def add_report(collection, status, age, **extra):
+    return str(collection.insert_one({
+        'user_id': 'u1', 'symptoms': ['cough'], 'ai_analysis_status': status,
+        'created_at': datetime.utcnow() - timedelta(seconds=age), **extra
+    }).inserted_id)
+
+
+def test_stale_pending_reports_are_requeued_once(reports):
+    stale = add_report(reports, 'pending', age=600)
+    add_report(reports, 'pending', age=10)  # its job may still be running elsewhere
+    add_report(reports, 'ready', age=600)
+
+    assert symptom_pipeline.recover_pending_analyses(older_than=300) == (1, 0)
+    assert symptom_pipeline.analysis_jobs.enqueued == [
+        ('analyze_report', stale, {'report_id': stale, 'user_id': 'u1', 'symptoms': ['cough']})
+    ]
+    # A second worker starting at the same time finds it already claimed
+    assert symptom_pipeline.recover_pending_analyses(older_than=300) == (0, 0)
+
+
+def test_report_lost_again_after_requeue_is_marked_failed(reports):
+    report_id = add_report(reports, 'pending', age=3600,
+                           ai_analysis_requeued_at=datetime.utcnow() - timedelta(seconds=600))
+
+    assert symptom_pipeline.recover_pending_analyses(older_than=300) == (0, 1)
+    report = reports.find_one()
+    assert report['ai_analysis_status'] == 'failed'
+    assert symptom_pipeline.analysis_jobs.enqueued == []
+    assert str(report['_id']) == report_id
+
+
+@pytest.mark.parametrize('wait', ['abc', '-1', 'nan'])
+def test_bad_wait_is_a_400(wait):
+    from routes.symptoms import symptoms_bp
+    app = Flask(__name__)
+    app.register_blueprint(symptoms_bp, url_prefix='/api/symptoms')
+    response = app.test_client().get(f'/api/symptoms/report/{"0" * 24}/analysis?wait={wait}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_recovery_starts_from_startup_hook_not_import(monkeypatch):
+    started = threading.Event()
+    monkeypatch.setattr(symptom_pipeline, 'recover_pending_analyses', started.set)
+    import app
+
+    assert not started.wait(0.2)  # importing app must not touch MongoDB
+    monkeypatch.setattr(app, 'recover_pending_analyses', started.set)
+    app.start_background_jobs()
+    assert started.wait(1)
@@ -0,0 +1,132 @@
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+
+from config import Config
+from services.doctor_directory import DirectorySnapshot, DoctorDirectory
+from utils.geo import haversine_km
+
+
+class Source:
+    """Loader and version stamp over a plain list; fail_* make the next calls raise"""
+
+    def __init__(self):
+        self.doctors = [{'_id': 1, 'specialization': 'Cardiology'}]
+        self.fail_loads = 0
+        self.fail_stamps = 0
+
+    def load(self):
+        if self.fail_loads:
+            self.fail_loads -= 1
+            raise KeyError('corrupt document')
+        return list(self.doctors)
+
+    def stamp(self):
+        if self.fail_stamps:
+            self.fail_stamps -= 1
+            raise TypeError('bad stamp')
+        return len(self.doctors)
+
+
+def broken_watch():
+    raise AttributeError('not a change stream')
+
+
+def wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def directory_thread(directory):
+    return next(t for t in threading.enumerate() if t is directory._thread)
+
+
+def test_watch_failure_falls_back_to_polling():
+    source = Source()
+    directory = DoctorDirectory(source.load, source.stamp, broken_watch, poll_interval=0.02)
+    assert len(directory.snapshot.doctors) == 1
+
+    assert wait_for(lambda: directory.mode == 'polling')
+    assert 'not a change stream' in directory.last_error
+    source.doctors.append({'_id': 2, 'specialization': 'Neurology'})
+    assert wait_for(lambda: len(directory.snapshot.doctors) == 2)
+    directory.stop()
+
+
+def test_refresh_and_stamp_errors_keep_the_thread_alive():
+    source = Source()
+    directory = DoctorDirectory(source.load, source.stamp, None, poll_interval=0.02)
+    first = directory.snapshot
+    thread = directory_thread(directory)
+
+    source.fail_stamps = 2
+    source.fail_loads = 2
+    source.doctors.append({'_id': 2, 'specialization': 'Neurology'})
+    assert wait_for(lambda: directory.snapshot is not first)
+
+    assert thread.is_alive()
+    assert len(directory.snapshot.doctors) == 2
+    assert directory.last_error is None
+    directory.stop()
+
+
+def make_snapshot(count=2000, seed=5):
+    rng = random.Random(seed)
+    doctors = [{
+        '_id': i, 'specialization': 'Cardiology',
+        'location': {'coordinates': {'lat': rng.uniform(-89.9, 89.9), 'lng': rng.uniform(-180, 180)}}
+    } for i in range(count)]
+    return DirectorySnapshot(doctors)
+
+
+def brute_force(snapshot, lat, lng, radius_km):
+    found = []
+    for doctor in snapshot.doctors:
+        coordinates = doctor['location']['coordinates']
+        distance = haversine_km(lat, lng, coordinates['lat'], coordinates['lng'])
+        if distance <= radius_km:
+            found.append((distance, doctor['_id']))
+    return sorted(found)
+
+
+@pytest.mark.parametrize('lat, lng, radius_km', [
+    (42.36, -71.06, 5), (42.36, -71.06, 800), (10, 20, 20000), (89.9, 0, 300), (-45, 170, 5000),
+    (-17.7, 179.95, 400), (60, -179.9, 1500), (-85, 30, 700)
+])
+def test_near_matches_a_full_scan(lat, lng, radius_km):
+    snapshot = make_snapshot()
+    near = [(distance, doctor['_id']) for doctor, distance in snapshot.near(lat, lng, radius_km)]
+    assert near == brute_force(snapshot, lat, lng, radius_km)
+
+
+def test_huge_radius_only_visits_occupied_cells():
+    snapshot = make_snapshot()
+    start = time.perf_counter()
+    assert len(snapshot.near(0, 0, 1e6)) == len(snapshot.doctors)
+    # A cell-by-cell scan of a 1e6 km box is ~6.5 million lookups
+    assert time.perf_counter() - start < 0.5
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from routes import doctors
+    monkeypatch.setattr(doctors, 'doctor_directory', SimpleNamespace(snapshot=make_snapshot()))
+    app = Flask(__name__)
+    app.register_blueprint(doctors.doctors_bp, url_prefix='/api/doctors')
+    return app.test_client()
+
+
+def test_nearby_route_clamps_and_validates_the_radius(client):
+    response = client.post('/api/doctors/nearby', json={'lat': 0, 'lng': 0, 'radius': 1e12})
+    assert response.status_code == 200
+    assert all(doctor['distance'] <= Config.DOCTOR_NEARBY_MAX_RADIUS_KM for doctor in response.get_json()['doctors'])
+
+    for radius in ('far', -5, 0, None, float('nan')):
+        response = client.post('/api/doctors/nearby', json={'lat': 0, 'lng': 0, 'radius': radius})
+        assert response.status_code == 400, radius
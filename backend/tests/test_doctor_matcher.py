@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+from config import Config
+from services import doctor_matcher
+from services.doctor_matcher import DoctorMatcher
+from services.doctor_scoring import haversine_km, match_scores, top_k
+
+mongomock = pytest.importorskip('mongomock')
+
+USER = {'lat': 42.3601, 'lng': -71.0589}
+SPECIALIZATIONS = ['Cardiology']
+
+
+class GeoCollection:
+    """mongomock collection plus the one $geoNear stage DoctorMatcher runs"""
+
+    def __init__(self, doctors):
+        self.collection = mongomock.MongoClient().db.doctors
+        self.collection.insert_many(doctors)
+        self.finds = []
+
+    def find(self, query):
+        self.finds.append(query)
+        return self.collection.find(query)
+
+    def aggregate(self, pipeline):
+        stage = pipeline[0]['$geoNear']
+        lng, lat = stage['near']['coordinates']
+        nearby = []
+        for doctor in self.collection.find(stage['query']):
+            coordinates = doctor['location']['coordinates']
+            distance = float(haversine_km(lat, lng, [coordinates['lat']], [coordinates['lng']])[0])
+            if distance <= Config.DOCTOR_MATCH_RADIUS_KM:
+                nearby.append((distance, doctor))
+        return [doctor for _, doctor in sorted(nearby, key=lambda pair: pair[0])]
+
+
+def make_doctors(count, near_km, far_km, seed):
+    rng = random.Random(seed)
+    doctors = []
+    for i in range(count):
+        km = rng.uniform(*(near_km if i % 2 else far_km))
+        doctors.append({
+            'name': f'Dr {i}',
+            'specialization': 'Cardiology',
+            'location': {'coordinates': {'lat': USER['lat'] + km / 111.2, 'lng': USER['lng']}},
+            'rating': rng.choice([None, 2.0, 3.2, 3.7, 4.2, 4.8]),
+            'availability': {'accepting_new_patients': rng.random() < 0.5}
+        })
+    return doctors
+
+
+def best_scores(doctors, limit=10):
+    scores, _ = match_scores(doctors, SPECIALIZATIONS, USER)
+    return sorted(int(scores[i]) for i in top_k(scores, limit))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_prefilter_keeps_the_full_scan_top_scores(monkeypatch, seed):
+    doctors = make_doctors(60, near_km=(0, 49), far_km=(51, 300), seed=seed)
+    collection = GeoCollection(doctors)
+    monkeypatch.setattr(doctor_matcher, 'doctors_collection', collection)
+    monkeypatch.setattr(doctor_matcher, 'doctor_directory', None)
+
+    candidates = DoctorMatcher._find_candidates(SPECIALIZATIONS, USER)
+    assert best_scores(candidates) == best_scores(list(collection.collection.find()))
+
+
+def test_strong_nearby_doctors_skip_the_wider_scan(monkeypatch):
+    doctors = make_doctors(40, near_km=(0, 4), far_km=(60, 300), seed=1)
+    for doctor in doctors[1::2]:
+        doctor.update(rating=4.9, availability={'accepting_new_patients': True})  # 100 points each
+    collection = GeoCollection(doctors)
+    monkeypatch.setattr(doctor_matcher, 'doctors_collection', collection)
+    monkeypatch.setattr(doctor_matcher, 'doctor_directory', None)
+
+    candidates = DoctorMatcher._find_candidates(SPECIALIZATIONS, USER)
+    assert len(candidates) == 20
+    assert collection.finds == []
+
+
+def make_messy_doctors(count, seed):
+    """Doctors with the gaps real documents have: no location, 0/None coordinates, None ratings"""
+    rng = random.Random(seed)
+    doctors = []
+    for i in range(count):
+        doctor = {'name': f'Dr {i}', 'specialization': rng.choice(['Cardiology', 'General Practice', 'Dermatology'])}
+        shape = rng.random()
+        if shape < 0.7:
+            km = rng.uniform(0, 80)
+            doctor['location'] = {'coordinates': {'lat': USER['lat'] + km / 111.2, 'lng': USER['lng']}}
+        elif shape < 0.8:
+            doctor['location'] = {'coordinates': {'lat': 0, 'lng': USER['lng']}}
+        elif shape < 0.9:
+            doctor['location'] = {'coordinates': {'lat': None, 'lng': None}}
+        if rng.random() < 0.8:
+            doctor['rating'] = rng.choice([None, 0, 2.9, 3.0, 3.5, 4.0, 4.49, 4.5, 5.0])
+        if rng.random() < 0.8:
+            doctor['availability'] = {'accepting_new_patients': rng.random() < 0.5}
+        doctors.append(doctor)
+    return doctors
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('user', [USER, None, {}, {'lat': USER['lat'], 'lng': None}])
+def test_match_scores_agree_with_the_per_doctor_reference(seed, user):
+    doctors = make_messy_doctors(200, seed)
+    scores, distances = match_scores(doctors, SPECIALIZATIONS, user)
+
+    expected = [DoctorMatcher._calculate_match_score(doctor, SPECIALIZATIONS, user, 'moderate') for doctor in doctors]
+    assert scores.tolist() == expected
+    if not user:
+        assert distances is None
+        return
+    for doctor, distance in zip(doctors, distances):
+        coordinates = doctor.get('location', {}).get('coordinates', {})
+        reference = DoctorMatcher._calculate_distance(user.get('lat'), user.get('lng'),
+                                                      coordinates.get('lat', 0), coordinates.get('lng', 0))
+        assert distance == pytest.approx(reference)
+
+
+@pytest.mark.parametrize('user', [USER, None])
+def test_match_doctor_reports_the_scored_distance(monkeypatch, user):
+    doctors = make_messy_doctors(50, seed=3)
+    monkeypatch.setattr(DoctorMatcher, '_find_candidates', staticmethod(lambda *args: doctors))
+    monkeypatch.setattr(DoctorMatcher, '_determine_specialization', staticmethod(lambda *args: SPECIALIZATIONS))
+
+    matches = DoctorMatcher.match_doctor({'symptoms': ['chest pain']}, user)
+    scores, distances = match_scores(doctors, SPECIALIZATIONS, user)
+    assert len(matches) == 10
+    for match, i in zip(matches, top_k(scores, 10)):
+        assert match['name'] == doctors[i]['name']
+        assert match['distance'] == (None if user is None else float(distances[i]))
+        assert 'distance' not in doctors[i]  # shared documents stay untouched
@@ -0,0 +1,43 @@
+import json
+
+import pytest
+from flask import Flask
+
+from routes.emergency import emergency_bp
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(emergency_bp, url_prefix='/api/emergency')
+    return app.test_client()
+
+
+def verdicts(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_malformed_submissions_get_their_own_error_line(client):
+    response = client.post('/api/emergency/detect-bulk', json={'submissions': [
+        {'id': 'a', 'symptoms': ['chest pain', 'shortness of breath']},
+        {'id': 'b', 'symptoms': 5},
+        {'id': 'c', 'symptoms': ['cough', 7]},
+        7,
+        'mild headache',
+        {'id': 'f'},
+    ]})
+    assert response.status_code == 200
+    lines = verdicts(response)
+
+    assert [line['index'] for line in lines] == [0, 1, 2, 3, 4, 5]
+    assert [line['id'] for line in lines] == ['a', 'b', 'c', None, None, 'f']
+    assert lines[0]['emergency_detected'] is True
+    for line in lines[1:4]:
+        assert 'error' in line and 'details' not in line
+    assert lines[4]['emergency_detected'] is False
+    assert lines[5]['emergency_detected'] is False
+
+
+def test_submissions_must_be_a_list(client):
+    response = client.post('/api/emergency/detect-bulk', json={'submissions': 'chest pain'})
+    assert response.status_code == 400
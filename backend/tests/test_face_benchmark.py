@@ -0,0 +1,34 @@
+import copy
+
+from benchmarks.face_benchmark import DROOP_LEVELS, compare
+from benchmarks.synthetic_faces import encode_jpeg, make_face
+from services.face_detector import FaceDetector
+
+
+def test_corpus_has_cases_on_both_sides_of_the_threshold():
+    detector = FaceDetector(320)
+    width, height = 640, 480
+    verdicts = []
+    for droop, mouth_droop, sag in (DROOP_LEVELS[0], DROOP_LEVELS[-1]):
+        face = make_face(width, height, droop=int(droop * height), mouth_droop=int(mouth_droop * height), sag=sag)
+        result = detector.detect_face_from_bytes(encode_jpeg(face))
+        assert result['success']
+        verdicts.append(result['droop_detected'])
+    assert verdicts == [False, True]
+
+
+def make_report(score, droop):
+    verdict = {'group': 'g', 'face': True, 'droop': droop, 'asymmetry_score': score}
+    return {
+        'parameters': {},
+        'results': {'640x480': {'p95_ms': 10.0, 'detection_rate': 1.0, 'droop_rate': float(droop)}},
+        'verdicts': {'640x480': {'g/base': verdict}}
+    }
+
+
+def test_compare_flags_flips_and_score_drift():
+    baseline = make_report(20.0, True)
+    assert not compare(copy.deepcopy(baseline), baseline, 0.2, 0.5)
+    assert compare(make_report(20.0, False), baseline, 0.2, 0.5)  # threshold raised
+    assert compare(make_report(17.0, True), baseline, 0.2, 0.5)  # same verdict, score drifted
+    assert not compare(make_report(20.3, True), baseline, 0.2, 0.5)
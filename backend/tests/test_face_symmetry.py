@@ -0,0 +1,23 @@
+import pytest
+
+from benchmarks.symmetry_benchmark import legacy_symmetry
+from benchmarks.synthetic_faces import make_face
+from services.face_detector import FaceDetector
+
+
+@pytest.mark.parametrize('side, extra', [(120, 0), (121, 1), (240, 1), (371, 0)])
+def test_asymmetry_score_matches_the_single_metric_path(side, extra):
+    gray = make_face(side * 2, side * 2, droop=side // 20)
+    roi = gray[side // 2:side // 2 + side, side // 2:side // 2 + side + extra]
+    symmetry = FaceDetector()._analyze_symmetry(roi, [])
+
+    assert symmetry['asymmetry_score'] == pytest.approx(legacy_symmetry(roi), abs=1e-9)
+    assert len(symmetry['row_profile']) == FaceDetector.SYMMETRY_PROFILE_BANDS
+    assert 0 <= symmetry['histogram_asymmetry'] <= 1
+    assert symmetry['gradient_asymmetry'] >= 0
+
+
+def test_tiny_face_has_a_full_profile():
+    roi = make_face(20, 20)[:5, :7]
+    symmetry = FaceDetector()._analyze_symmetry(roi, [])
+    assert len(symmetry['row_profile']) == FaceDetector.SYMMETRY_PROFILE_BANDS
@@ -0,0 +1,147 @@
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import Config
+from services import google_places_service
+from services.facility_index import FacilityIndex, FacilityIndexError, load_facilities
+from services.google_places_service import GooglePlacesService
+
+BOSTON = (42.3601, -71.0589)
+
+
+def make_facilities(count, seed=3):
+    rng = random.Random(seed)
+    facilities = []
+    for i in range(count):
+        lat = BOSTON[0] + rng.uniform(-0.3, 0.3)
+        lng = BOSTON[1] + rng.uniform(-0.3, 0.3)
+        facilities.append({
+            'place_id': f'local-{i}',
+            'name': f'{"Urgent Care" if i % 3 else "General Hospital"} {i}',
+            'location': {'lat': lat, 'lng': lng},
+            'types': ['doctor'] if i % 3 else ['hospital'],
+            'source': 'local'
+        })
+    return facilities
+
+
+def test_load_csv_and_geojson(tmp_path):
+    csv_path = tmp_path / 'facilities.csv'
+    csv_path.write_text('Name,Address,Latitude,Longitude,Status\n'
+                        'Open Hospital,1 Main St,42.36,-71.05,OPEN\n'
+                        'Closed Hospital,2 Main St,42.37,-71.06,CLOSED\n'
+                        'No Coordinates,3 Main St,,\n', encoding='utf-8')
+    assert [f['name'] for f in load_facilities(str(csv_path))] == ['Open Hospital']
+
+    geojson_path = tmp_path / 'facilities.geojson'
+    geojson_path.write_text(json.dumps({'type': 'FeatureCollection', 'features': [
+        {'geometry': {'type': 'Point', 'coordinates': [-71.05, 42.36]},
+         'properties': {'NAME': 'Geo Hospital', 'id': 'h1', 'types': 'hospital; emergency room'}},
+        {'geometry': {'type': 'Polygon', 'coordinates': []}, 'properties': {'name': 'Area'}},
+    ]}), encoding='utf-8')
+    [facility] = load_facilities(str(geojson_path))
+    assert facility['place_id'] == 'h1'
+    assert facility['location'] == {'lat': 42.36, 'lng': -71.05}
+    assert facility['types'] == ['hospital', 'emergency_room']
+
+    with pytest.raises(FacilityIndexError):
+        load_facilities(str(tmp_path / 'facilities.txt'))
+
+
+@pytest.mark.parametrize('radius', [1000, 5000, 20000])
+def test_nearby_matches_a_brute_force_scan(radius):
+    facilities = make_facilities(2000)
+    index = FacilityIndex(facilities)
+    lat, lng = BOSTON
+    expected = sorted(
+        (GooglePlacesService._calculate_distance(lat, lng, f['location']['lat'], f['location']['lng']), f['place_id'])
+        for f in facilities
+    )
+    expected = [place_id for distance, place_id in expected if distance <= radius / 1000][:10]
+    assert [f['place_id'] for f in index.nearby(lat, lng, radius, limit=10)] == expected
+
+
+
+def test_huge_radius_only_visits_occupied_cells():
+    facilities = make_facilities(500)
+    index = FacilityIndex(facilities)
+    start = time.perf_counter()
+    assert len(index.nearby(*BOSTON, 1e9, limit=1000)) == len(facilities)
+    # A cell-by-cell scan of a 1e6 km box is ~6.5 million lookups
+    assert time.perf_counter() - start < 0.5
+
+
+def test_nearby_crosses_the_antimeridian():
+    facilities = [
+        {'place_id': 'east', 'location': {'lat': -17.7, 'lng': 179.98}},
+        {'place_id': 'west', 'location': {'lat': -17.7, 'lng': -179.98}},
+        {'place_id': 'far', 'location': {'lat': -17.7, 'lng': -179.5}}
+    ]
+    index = FacilityIndex(facilities)
+    assert [f['place_id'] for f in index.nearby(-17.7, 179.99, 5000)] == ['east', 'west']
+    assert [f['place_id'] for f in index.nearby(-17.7, -179.99, 5000)] == ['west', 'east']
+
+def test_keyword_filters_and_falls_back_to_everything():
+    index = FacilityIndex(make_facilities(300))
+    hospitals = index.nearby(*BOSTON, 20000, 'hospital')
+    assert hospitals and all('Hospital' in f['name'] for f in hospitals)
+    assert len(index.nearby(*BOSTON, 20000, 'dermatology')) == 10
+    assert index.stats()['keyword_fallbacks'] == 1
+
+
+@pytest.fixture
+def race(monkeypatch):
+    """Race mode over a local index, with a remote search that waits for `release`"""
+    release = threading.Event()
+    calls = []
+
+    def remote(latitude, longitude, radius, keyword, pages):
+        calls.append(latitude)
+        release.wait(5)
+        return [{'place_id': 'remote', 'location': {'lat': latitude, 'lng': longitude}}]
+
+    monkeypatch.setattr(google_places_service, 'facility_index', FacilityIndex(make_facilities(300)))
+    monkeypatch.setattr(google_places_service, '_race_pool', ThreadPoolExecutor(max_workers=8))
+    monkeypatch.setattr(google_places_service, '_race_slots', threading.BoundedSemaphore(2))
+    monkeypatch.setattr(GooglePlacesService, '_remote_nearby', staticmethod(remote))
+    monkeypatch.setattr(Config, 'FACILITY_INDEX_MODE', 'race')
+    monkeypatch.setattr(Config, 'FACILITY_INDEX_RACE_TIMEOUT', 0.05)
+    yield release, calls
+    release.set()
+
+
+def lookup():
+    return GooglePlacesService._nearby_facilities(*BOSTON, 5000, 'hospital', 10, 1)
+
+
+def test_race_answers_locally_and_caps_outstanding_remote_calls(race):
+    release, calls = race
+    for _ in range(5):
+        facilities = lookup()
+        assert facilities and all(f['source'] == 'local' for f in facilities)
+    assert len(calls) == 2  # the other three found every slot taken
+
+    release.set()
+    google_places_service._race_pool.shutdown(wait=True)  # late calls finish and free their slots
+    google_places_service._race_pool = ThreadPoolExecutor(max_workers=8)
+    assert [f['place_id'] for f in lookup()] == ['remote']
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize('pages', [1, 3])
+def test_race_allows_for_page_token_delays(race, monkeypatch, pages):
+    delay = 0.1
+
+    def remote(latitude, longitude, radius, keyword, pages):
+        time.sleep((pages - 1) * delay + 0.01)  # the least a multi-page search can take
+        return [{'place_id': 'remote', 'location': {'lat': latitude, 'lng': longitude}}]
+
+    monkeypatch.setattr(Config, 'PLACES_PAGE_TOKEN_DELAY', delay)
+    monkeypatch.setattr(GooglePlacesService, '_remote_nearby', staticmethod(remote))
+    facilities = GooglePlacesService._nearby_facilities(*BOSTON, 5000, 'hospital', 10, pages)
+    assert [f['place_id'] for f in facilities] == ['remote']
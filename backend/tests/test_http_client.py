@@ -0,0 +1,90 @@
+import time
+
+import pytest
+import requests
+
+from benchmarks.fake_places_server import FakePlacesServer
+from utils.http_client import CircuitBreaker, CircuitOpenError, HTTPClient
+
+ENDPOINT = '/maps/api/place/details/json'
+
+
+@pytest.fixture
+def server():
+    server = FakePlacesServer().start()
+    yield server
+    server.stop()
+
+
+def make_client(url='http://127.0.0.1:9', **kwargs):
+    options = {'retries': 2, 'backoff': 0, 'breaker_threshold': 2, 'breaker_reset': 0.1}
+    options.update(kwargs)
+    return HTTPClient(url, **options)
+
+
+def raising(error, calls=None):
+    def get(*args, **kwargs):
+        if calls is not None:
+            calls.append(1)
+        raise error('boom')
+    return get
+
+
+def test_ok_response_closes_the_breaker(server):
+    client = make_client(server.url)
+    assert client.get(ENDPOINT, params={'place_id': 'abcd'}).json()['status'] == 'OK'
+    assert client.stats()['breakers'][ENDPOINT] == 'closed'
+
+
+def test_retryable_status_is_retried_then_counted(server):
+    server.mode = 'error'
+    client = make_client(server.url)
+    with pytest.raises(requests.HTTPError):
+        client.get(ENDPOINT)
+    assert server.requests == 3
+    assert client.stats()['failures'] == 1
+
+
+@pytest.mark.parametrize('error', [requests.TooManyRedirects, requests.exceptions.InvalidURL,
+                                   requests.exceptions.ChunkedEncodingError, ValueError])
+def test_other_errors_are_not_retried_but_open_the_breaker(monkeypatch, error):
+    client = make_client()
+    attempts = []
+    monkeypatch.setattr(client.session, 'get', raising(error, attempts))
+
+    for _ in range(2):
+        with pytest.raises(error):
+            client.get(ENDPOINT)
+    assert len(attempts) == 2
+    with pytest.raises(CircuitOpenError):
+        client.get(ENDPOINT)
+    assert client.stats()['breakers'][ENDPOINT] == 'open'
+
+
+def test_failed_half_open_probe_reopens(monkeypatch, server):
+    client = make_client(server.url, breaker_threshold=1)
+    monkeypatch.setattr(client.session, 'get', raising(requests.TooManyRedirects))
+    with pytest.raises(requests.TooManyRedirects):
+        client.get(ENDPOINT)
+    time.sleep(0.12)
+    with pytest.raises(requests.TooManyRedirects):
+        client.get(ENDPOINT)  # the half-open trial fails too
+    assert client.stats()['breakers'][ENDPOINT] == 'open'
+
+    monkeypatch.undo()
+    time.sleep(0.12)
+    assert client.get(ENDPOINT, params={'place_id': 'abcd'}).status_code == 200
+    assert client.stats()['breakers'][ENDPOINT] == 'closed'
+
+
+def test_lost_half_open_probe_expires():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()  # the trial call, which never reports back
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.state == 'closed'
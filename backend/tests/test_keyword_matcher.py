@@ -0,0 +1,85 @@
+import pytest
+
+from benchmarks.keyword_matcher_benchmark import make_table, make_texts, scan
+from services.emergency_detector import EmergencyDetector
+from services.keyword_matcher import KeywordMatcher
+from services.rule_engine import rule_engine
+
+TABLE = {
+    'cardiac': ['chest', 'chest pain', 'heart', 'pain in arm'],
+    'pain': ['pain', 'arm pain'],
+    'ent': ['ear', 'ear pain'],
+    'skin': ['itch', 'hives']
+}
+
+
+def test_prefix_keywords_are_credited():
+    matches = KeywordMatcher(TABLE).match('Crushing CHEST PAIN since noon')
+    assert matches == {'cardiac': ['chest pain', 'chest'], 'pain': ['pain']}
+
+
+def test_overlapping_keywords_are_all_found():
+    # 'arm pain' and 'pain in arm' overlap; 'pain' starts inside 'arm pain'
+    matches = KeywordMatcher(TABLE).match('arm pain in arm')
+    assert matches == {'cardiac': ['pain in arm'], 'pain': ['arm pain', 'pain']}
+
+
+def test_left_boundary_allows_suffixes_but_not_infixes():
+    matcher = KeywordMatcher(TABLE)
+    assert matcher.match('heart racing') == {'cardiac': ['heart']}  # no 'ear'
+    assert matcher.match('itching near my ear') == {'ent': ['ear'], 'skin': ['itch']}
+    assert matcher.match('chives') == {}
+
+
+def test_both_boundaries_require_whole_words():
+    matcher = KeywordMatcher(TABLE, word_boundary='both')
+    assert matcher.match('itching') == {}
+    assert matcher.match('ear pain, chesty') == {'ent': ['ear pain', 'ear'], 'pain': ['pain']}
+
+
+def test_unknown_word_boundary_is_rejected():
+    with pytest.raises(ValueError):
+        KeywordMatcher(TABLE, word_boundary='right')
+
+
+@pytest.mark.parametrize('name', ['emergency', 'specialization', 'synthetic'])
+def test_substring_mode_matches_the_old_scan(name):
+    rules = rule_engine.rules
+    table = {
+        'emergency': rules.emergency_keywords,
+        'specialization': rules.specialization_keywords,
+        'synthetic': make_table(300)
+    }[name]
+    texts = make_texts(2000, [table], seed=3)
+    texts += ['heartburn near my ear', 'chives', '', 'CHEST PAIN']
+    matcher = KeywordMatcher(table, word_boundary=None)
+
+    for text in texts:
+        text = text.lower()
+        assert matcher.categories(text) == scan(table, text), text
+        expected = {category: {k for k in keywords if k in text} for category, keywords in table.items()}
+        assert {c: set(k) for c, k in matcher.match(text).items()} == {c: k for c, k in expected.items() if k}
+
+
+def test_detect_emergency_reports_matched_keywords():
+    result = EmergencyDetector.detect_emergency(['Chest pain', 'cold sweat'])
+    assert result['is_emergency'] is True
+    assert [e['type'] for e in result['emergencies']] == ['heart_attack']
+    assert result['emergencies'][0]['matched_keywords'] == ['chest pain', 'cold sweat']
+
+
+def test_detect_emergency_ignores_keywords_inside_words():
+    # 'hives' inside 'chives', 'swelling' needs to start a word
+    result = EmergencyDetector.detect_emergency(['ate chives', 'upswelling'])
+    assert result == {
+        'is_emergency': False,
+        'emergencies': [],
+        'recommendation': 'Schedule appointment with doctor'
+    }
+
+
+def test_detect_emergency_batch_matches_single_calls():
+    lists = [['chest pain'], ['mild cough'], ['passed out', 'deep cut'], ['chest pain']]
+    assert EmergencyDetector.detect_emergency_batch(lists) == [
+        EmergencyDetector.detect_emergency(symptoms) for symptoms in lists
+    ]
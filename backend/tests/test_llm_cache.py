@@ -0,0 +1,64 @@
+import pytest
+
+from config import Config
+from services.llm_cache import MethodCache, ResponseCache, normalize, shingles
+
+HYPERTENSION = ('Patient has a long history of hypertension treated with lisinopril 10 mg daily, '
+                'reports intermittent dizziness when standing, mild headaches in the morning and '
+                'occasional blurred vision; follow up with cardiology and repeat blood panel in two weeks')
+HYPOTENSION = HYPERTENSION.replace('hypertension', 'hypotension')
+
+
+def jaccard(a, b):
+    a, b = shingles(normalize(a)), shingles(normalize(b))
+    return len(a & b) / len(a | b)
+
+
+@pytest.mark.parametrize('first, second', [
+    ('HIV+', 'HIV-'),
+    ('BP > 140', 'BP < 140'),
+    ('glucose 5/10', 'glucose 510'),
+    ('dose 50%', 'dose 50'),
+])
+def test_symbols_stay_in_the_exact_key(first, second):
+    assert normalize(first) != normalize(second)
+
+    cache = MethodCache(ttl=60, max_entries=10)
+    cache.put(first, 'cached answer', 0.1)
+    assert cache.get(second) is None
+    assert cache.get(first) == 'cached answer'
+
+
+def test_spacing_around_symbols_does_not_matter():
+    assert normalize('HIV+') == normalize('hiv +')
+    assert normalize('BP>140') == normalize('bp > 140')
+
+
+def test_near_duplicate_never_swaps_a_medical_term():
+    assert jaccard(HYPERTENSION, HYPOTENSION) >= 0.95  # close enough for shingles alone
+
+    cache = MethodCache(ttl=60, max_entries=10, near_duplicate=0.95)
+    cache.put(HYPERTENSION, 'high blood pressure', 0.1)
+    assert cache.get(HYPOTENSION) is None
+
+
+@pytest.mark.parametrize('first, second', [('HIV+ test result', 'HIV- test result'),
+                                           ('no chest pain', 'chest pain')])
+def test_near_duplicate_requires_symbols_and_negations(first, second):
+    cache = MethodCache(ttl=60, max_entries=10, near_duplicate=0.5)
+    cache.put(first, 'cached answer', 0.1)
+    assert cache.get(second) is None
+
+
+def test_near_duplicate_tolerates_stop_words_only():
+    cache = MethodCache(ttl=60, max_entries=10, near_duplicate=0.9)
+    cache.put(HYPERTENSION, 'high blood pressure', 0.1)
+    assert cache.get('The ' + HYPERTENSION) == 'high blood pressure'
+
+
+def test_medical_methods_are_exact_only():
+    cache = ResponseCache(Config.GEMINI_CACHE_POLICIES)
+    cache.put('translate_medical_terms', HYPERTENSION, 'high blood pressure', 0.1)
+    assert cache.get('translate_medical_terms', HYPOTENSION) is None
+    for method in ('analyze_symptoms', 'translate_medical_terms'):
+        assert Config.GEMINI_CACHE_POLICIES[method]['near_duplicate'] is None
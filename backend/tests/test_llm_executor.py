@@ -0,0 +1,130 @@
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+from benchmarks.fake_gemini import FakeModel
+from services import gemini_service
+from services.llm_executor import LLMBusyError, LLMExecutor, LLMTimeoutError
+
+
+def make_executor(model, **kwargs):
+    options = {'max_concurrency': 1, 'max_queue': 0, 'timeout': 5, 'queue_timeout': 0.05}
+    options.update(kwargs)
+    return LLMExecutor(lambda: model, **options)
+
+
+def test_identical_prompts_share_one_call():
+    model = FakeModel(latency=0.2)
+    executor = make_executor(model, max_concurrency=2)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(executor.generate('same prompt').text))
+               for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model.calls == 1
+    assert len(results) == 2 and results[0] == results[1]
+    assert executor.stats()['coalesced'] == 1
+
+
+def test_different_prompts_are_not_coalesced():
+    model = FakeModel(latency=0.01)
+    executor = make_executor(model, max_concurrency=2, max_queue=2)
+    executor.generate('first')
+    executor.generate('second')
+    assert model.calls == 2
+
+
+def test_saturated_executor_rejects_submit():
+    model = FakeModel(latency=0.3)
+    executor = make_executor(model)
+    running = executor.submit('occupies the only slot')
+
+    with pytest.raises(LLMBusyError):
+        executor.submit('another prompt')
+    assert executor.stats()['rejected'] == 1
+    running.result()
+
+
+def test_streams_use_their_own_slots():
+    model = FakeModel(latency=0.3)
+    executor = make_executor(model, max_concurrency=2, max_queue=8)
+    running = [executor.submit(f'pooled {i}') for i in range(10)]
+
+    # A full pool and queue still leave max_concurrency stream slots
+    with executor.reserve() as first, executor.reserve() as second:
+        assert first == second == {'timeout': 5}
+        with pytest.raises(LLMBusyError):
+            with executor.reserve():
+                pass
+    with executor.reserve():
+        pass  # slots are free again
+    for future in running:
+        future.result()
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    model = FakeModel(latency=0.5)
+    executor = make_executor(model)
+    monkeypatch.setattr(gemini_service, 'llm_executor', executor)
+    monkeypatch.setattr(gemini_service, '_model', model)
+    running = executor.submit('occupies the only slot')
+    yield
+    running.result()
+
+
+@pytest.fixture
+def client():
+    from routes.gemini import gemini_bp
+    app = Flask(__name__)
+    app.register_blueprint(gemini_bp, url_prefix='/api/gemini')
+    return app.test_client()
+
+
+def test_chat_returns_503_when_saturated(saturated, client):
+    response = client.post('/api/gemini/chat', json={'message': 'hello'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.get_json()['success'] is False
+
+
+def test_streamed_chat_returns_503_when_streams_saturated(monkeypatch, client):
+    executor = make_executor(FakeModel(latency=0.01))
+    monkeypatch.setattr(gemini_service, 'llm_executor', executor)
+    with executor.reserve():
+        response = client.post('/api/gemini/chat?stream=1', json={'message': 'hello'})
+    assert response.status_code == 503
+
+
+def test_streamed_chat_times_out_and_frees_its_slot(monkeypatch, client):
+    model = FakeModel(latency=2)
+    executor = make_executor(model, timeout=0.1)
+    monkeypatch.setattr(gemini_service, 'llm_executor', executor)
+    monkeypatch.setattr(gemini_service, '_model', model)
+
+    start = time.monotonic()
+    response = client.post('/api/gemini/chat?stream=1', json={'message': 'hello'})
+    assert time.monotonic() - start < 1
+    assert 'Deadline' in response.get_data(as_text=True)
+    with executor.reserve():
+        pass  # not LLMBusyError
+
+
+def test_timed_out_call_frees_its_slot():
+    model = FakeModel(latency=2)
+    executor = make_executor(model, timeout=0.1)
+    with pytest.raises(LLMTimeoutError):
+        executor.generate('hangs upstream')
+
+    # The SDK gives up at the same timeout, so the thread and slot come back
+    deadline = time.monotonic() + 1
+    while executor.stats()['in_flight'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert executor.stats()['in_flight'] == 0
+    with pytest.raises(LLMTimeoutError):  # not LLMBusyError
+        executor.generate('next prompt')
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+from pymongo import MongoClient
+
+from services.place_details_cache import PlaceDetailsCache
+
+
+class Upstream:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, place_id):
+        self.calls.append(place_id)
+        return {'name': f'Hospital {place_id}'}
+
+
+@pytest.fixture
+def unreachable():
+    # Nothing listens on port 1; connect=False so building the client does not block
+    client = MongoClient('mongodb://127.0.0.1:1', connect=False)
+    yield client.test.place_details
+    client.close()
+
+
+def test_unreachable_database_costs_one_short_wait(unreachable):
+    upstream = Upstream()
+    cache = PlaceDetailsCache(unreachable, upstream, db_timeout=0.2, db_retry=60)
+
+    start = time.perf_counter()
+    assert cache.get('a') == {'name': 'Hospital a'}
+    assert time.perf_counter() - start < 2  # not pymongo's 30 s server selection
+
+    start = time.perf_counter()
+    assert cache.get_many(['b', 'c']) == {'b': {'name': 'Hospital b'}, 'c': {'name': 'Hospital c'}}
+    assert time.perf_counter() - start < 0.1  # MongoDB skipped outright
+
+    stats = cache.stats()
+    assert stats['db'] == 'open'
+    assert stats['db_skipped'] >= 3  # the second read and every write after the failure
+    assert upstream.calls == ['a', 'b', 'c']
+
+
+def test_database_is_tried_again_after_db_retry(unreachable):
+    mongomock = pytest.importorskip('mongomock')
+    cache = PlaceDetailsCache(unreachable, Upstream(), db_timeout=0.2, db_retry=0.05)
+    cache.get('a')
+    assert cache.stats()['db'] == 'open'
+
+    cache.collection = mongomock.MongoClient().test.place_details  # the database is back
+    time.sleep(0.06)
+    cache.get('b')
+    assert cache.stats()['db'] == 'closed'
+    assert cache.get('b') == {'name': 'Hospital b'}
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from services.google_places_service import GooglePlacesService
+from services.places_cache import MAX_SEARCH_RADIUS, PlacesCache
+from utils.geo import geohash, geohash_bounds, haversine_km
+
+BOSTON = (42.3601, -71.0589)
+
+
+def make_facilities(count=400, seed=3):
+    rng = random.Random(seed)
+    return [{
+        'place_id': f'p{i}',
+        'location': {'lat': BOSTON[0] + rng.uniform(-0.1, 0.1), 'lng': BOSTON[1] + rng.uniform(-0.13, 0.13)}
+    } for i in range(count)]
+
+
+class Upstream:
+    """Nearby Search over a fixed set: everything within radius meters of the point"""
+
+    def __init__(self, facilities):
+        self.facilities = facilities
+        self.calls = []
+
+    def search(self, latitude, longitude, radius, keyword, pages=1):
+        self.calls.append(radius)
+        return [f for f in self.facilities
+                if haversine_km(latitude, longitude, f['location']['lat'], f['location']['lng']) * 1000 <= radius]
+
+
+def users_in_cell(cell, count, seed=1):
+    """The cell's corners plus random points inside it"""
+    rng = random.Random(seed)
+    south, west, north, east = geohash_bounds(cell)
+    inset = 1e-9
+    corners = [(lat, lng) for lat in (south + inset, north - inset) for lng in (west + inset, east - inset)]
+    return corners + [(rng.uniform(south, north), rng.uniform(west, east)) for _ in range(count)]
+
+
+@pytest.mark.parametrize('radius', [500, 2000, 5000])
+def test_cached_answers_match_a_search_from_each_user(radius):
+    upstream = Upstream(make_facilities())
+    cache = PlacesCache(upstream.search)
+    cell = geohash(*BOSTON, cache.precision)
+
+    for lat, lng in users_in_cell(cell, 20):
+        assert geohash(lat, lng, cache.precision) == cell
+        cached = GooglePlacesService._nearest(cache.lookup(lat, lng, radius, 'hospital'), lat, lng, 50, radius)
+        direct = GooglePlacesService._nearest(upstream.search(lat, lng, radius, 'hospital'), lat, lng, 50, radius)
+        assert cached == direct
+        assert all(facility['distance'] <= radius / 1000 for facility in cached)
+
+    assert upstream.calls[0] > radius  # one widened upstream search for the whole cell
+    assert cache.stats()['upstream_calls'] == 1
+
+
+def test_search_radius_is_capped_at_the_places_limit():
+    cell = geohash(*BOSTON, 6)
+    assert PlacesCache.search_radius(cell, MAX_SEARCH_RADIUS) == MAX_SEARCH_RADIUS
+    assert 5000 < PlacesCache.search_radius(cell, 5000) < 5000 + 1000  # a precision-6 cell is ~1.2 x 0.6 km
+
+
+def test_nearest_drops_facilities_beyond_the_radius():
+    facilities = [
+        {'place_id': 'near', 'location': {'lat': BOSTON[0] + 0.01, 'lng': BOSTON[1]}},
+        {'place_id': 'far', 'location': {'lat': BOSTON[0] + 0.1, 'lng': BOSTON[1]}},
+        {'place_id': 'unknown', 'location': {'lat': None, 'lng': None}}
+    ]
+    assert [f['place_id'] for f in GooglePlacesService._nearest(facilities, *BOSTON, 10, 5000)] == ['near']
+    assert len(GooglePlacesService._nearest(facilities, *BOSTON, 10)) == 3
@@ -0,0 +1,68 @@
+import pytest
+from flask import Flask
+
+from benchmarks.fake_places_server import FakePlacesServer, make_places
+from config import Config
+from services import google_places_service
+from services.google_places_service import GooglePlacesService
+from utils.http_client import HTTPClient
+
+BOSTON = (42.3601, -71.0589)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = FakePlacesServer(pages=3, token_delay=0.05).start()
+    monkeypatch.setattr(google_places_service, 'places_http', HTTPClient(server.url, retries=0))
+    for name in ('places_cache', 'place_details_cache', 'facility_index'):
+        monkeypatch.setattr(google_places_service, name, None)
+    # Poll before the token is valid, so the INVALID_REQUEST retry is exercised
+    monkeypatch.setattr(Config, 'PLACES_PAGE_TOKEN_DELAY', 0.02)
+    monkeypatch.setattr(Config, 'PLACES_PAGE_TOKEN_ATTEMPTS', 10)
+    yield server
+    server.stop()
+
+
+def nearest_ids(k):
+    lat, lng = BOSTON
+    places = sorted(
+        (GooglePlacesService._calculate_distance(
+            lat, lng, p['geometry']['location']['lat'], p['geometry']['location']['lng']), i, p['place_id'])
+        for i, p in enumerate(make_places(lat, lng, 60, radius_km=5))
+    )
+    return [place_id for _, _, place_id in places[:k]]
+
+
+def test_all_pages_give_the_true_nearest(server):
+    facilities = GooglePlacesService.find_nearby_hospitals(*BOSTON, limit=15, pages=3)
+    assert [f['place_id'] for f in facilities] == nearest_ids(15)
+    assert [f['distance'] for f in facilities] == sorted(f['distance'] for f in facilities)
+    assert server.requests > 3  # tokens were polled before they became valid
+
+
+def test_one_page_is_one_request(server):
+    facilities = GooglePlacesService.find_nearby_hospitals(*BOSTON, limit=30, pages=1)
+    assert len(facilities) == 20
+    assert server.requests == 1
+
+
+def test_later_page_failure_keeps_earlier_pages(server, monkeypatch):
+    monkeypatch.setattr(Config, 'PLACES_PAGE_TOKEN_ATTEMPTS', 1)
+    monkeypatch.setattr(Config, 'PLACES_PAGE_TOKEN_DELAY', 0)  # token never valid in time
+    facilities = GooglePlacesService._search_nearby(*BOSTON, 5000, 'hospital', pages=3)
+    assert len(facilities) == 20
+
+
+@pytest.mark.parametrize('body, status', [
+    ({'limit': 61}, 400), ({'limit': 0}, 400), ({'limit': '10'}, 400), ({'limit': True}, 400),
+    ({'pages': 4}, 400), ({'pages': 0}, 400), ({'limit': 60, 'pages': 3}, 200),
+])
+def test_route_validates_limit_and_pages(server, body, status):
+    from routes.places import places_bp
+    app = Flask(__name__)
+    app.register_blueprint(places_bp, url_prefix='/api/places')
+    response = app.test_client().post('/api/places/nearby-hospitals',
+                                      json={'latitude': BOSTON[0], 'longitude': BOSTON[1], **body})
+    assert response.status_code == status
+    if status == 200:
+        assert response.get_json()['count'] == 60
@@ -0,0 +1,62 @@
+import json
+
+import pytest
+from flask import Flask
+
+from config import Config
+from routes import rules as rules_route
+from services.rule_engine import RuleEngine, RuleError, RuleSet
+
+
+@pytest.fixture
+def rule_file(tmp_path):
+    path = tmp_path / 'rules.json'
+    with open(Config.RULES_PATH, encoding='utf-8') as f:
+        path.write_text(f.read(), encoding='utf-8')
+    return path
+
+
+def write(path, tables):
+    path.write_text(json.dumps(tables), encoding='utf-8')
+
+
+@pytest.mark.parametrize('section, value', [
+    ('emergency', ['chest pain']),
+    ('specializations', 'Cardiology'),
+    ('facility_keywords', [['hospital']]),
+])
+def test_sections_must_be_objects(section, value):
+    with pytest.raises(RuleError, match=section):
+        RuleSet({'version': 1, section: value})
+
+
+@pytest.mark.parametrize('tables', [
+    {'version': 2, 'emergency': ['chest pain']},
+    {'version': 2, 'specializations': {'Cardiology': 'chest pain'}},
+    ['not', 'an', 'object'],
+])
+def test_malformed_reload_keeps_previous_version(rule_file, monkeypatch, tables):
+    engine = RuleEngine(str(rule_file), check_interval=None)
+    version = engine.rules.version
+    write(rule_file, tables)
+
+    monkeypatch.setattr(rules_route, 'rule_engine', engine)
+    app = Flask(__name__)
+    app.register_blueprint(rules_route.rules_bp, url_prefix='/api/rules')
+    response = app.test_client().post('/api/rules/reload')
+
+    assert response.status_code == 422
+    assert response.get_json()['version'] == version
+    assert engine.rules.version == version
+    assert engine.reload_errors == 1
+    assert engine.last_error
+
+
+def test_valid_reload_swaps_version(rule_file):
+    engine = RuleEngine(str(rule_file), check_interval=None)
+    tables = json.loads(rule_file.read_text(encoding='utf-8'))
+    write(rule_file, {**tables, 'version': 'next'})
+
+    assert engine.reload() is True
+    assert engine.rules.version == 'next'
+    assert engine.reloads == 2 and engine.last_error is None
@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+from pymongo import GEOSPHERE, MongoClient
 from config import Config
 
 client = MongoClient(Config.MONGO_URI)
@@ -10,6 +10,7 @@ doctors_collection = db.doctors
 appointments_collection = db.appointments
 symptom_reports_collection = db.symptom_reports
 medications_collection = db.medications
+place_details_collection = db.place_details  # Places details cache, _id = place_id
 
 def init_db():
     """Initialize database with indexes"""
@@ -19,7 +20,11 @@ def init_db():
     
     # Doctor indexes
     doctors_collection.create_index('specialization')
-    doctors_collection.create_index('location')
+    backfill_doctor_geo()
+    if 'location_1' in doctors_collection.index_information():
+        # Plain index on the location subdocument; superseded by the 2dsphere one below
+        doctors_collection.drop_index('location_1')
+    doctors_collection.create_index([('location.geo', GEOSPHERE), ('specialization', 1)])
     
     # Appointment indexes
     appointments_collection.create_index('user_id')
@@ -30,4 +35,23 @@ def init_db():
     symptom_reports_collection.create_index('user_id')
     symptom_reports_collection.create_index('created_at')
     
-    print("✅ Database initialized with indexes")
\ No newline at end of file
+    # Place details cache: documents expire at their own expires_at
+    place_details_collection.create_index('expires_at', expireAfterSeconds=0)
+    
+    print("✅ Database initialized with indexes")
+
+def backfill_doctor_geo():
+    """Add the GeoJSON location.geo point to doctors that only have lat/lng coordinates"""
+    result = doctors_collection.update_many(
+        {
+            'location.geo': {'$exists': False},
+            'location.coordinates.lat': {'$type': 'number', '$ne': 0},
+            'location.coordinates.lng': {'$type': 'number', '$ne': 0}
+        },
+        [{'$set': {'location.geo': {
+            'type': 'Point',
+            'coordinates': ['$location.coordinates.lng', '$location.coordinates.lat']
+        }}}]
+    )
+    if result.modified_count:
+        print(f"✅ Backfilled location.geo for {result.modified_count} doctors")
\ No newline at end of file
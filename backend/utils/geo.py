@@ -0,0 +1,146 @@
+"""
+GeoJSON and geohash helpers for doctor and facility locations.
+
+Doctors keep their display coordinates in location.coordinates
+({'lat', 'lng'}) and a GeoJSON point in location.geo, which carries the
+2dsphere index used by $geoNear.
+
+MongoDB measures 2dsphere distances in meters on a sphere of radius
+6378.1 km; the app's Haversine uses 6371 km. Scaling by the ratio of the
+two radii converts between them exactly (same central angle), so scores
+and distance thresholds computed from $geoNear match the Python path.
+
+Geohash cells bucket nearby-search queries for the Places cache;
+grid_cells() finds the cells of an in-memory lat/lng grid a radius touches.
+"""
+
+import math
+
+EARTH_RADIUS_KM = 6371  # as in DoctorMatcher._calculate_distance
+MONGO_EARTH_RADIUS_KM = 6378.1
+
+# $geoNear meters -> app kilometres
+GEO_NEAR_KM_MULTIPLIER = EARTH_RADIUS_KM / (MONGO_EARTH_RADIUS_KM * 1000)
+
+
+def geo_point(coordinates):
+    """GeoJSON point for {'lat', 'lng'}, or None when missing (0/0 counts as missing, like the distance code)"""
+    if not coordinates:
+        return None
+    lat = coordinates.get('lat')
+    lng = coordinates.get('lng')
+    if not lat or not lng:
+        return None
+    return {'type': 'Point', 'coordinates': [float(lng), float(lat)]}
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance in kilometres"""
+    lat1, lng1, lat2, lng2 = map(math.radians, [lat1, lng1, lat2, lng2])
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
+
+
+def grid_cells(grid, cell_degrees, lat, lng, radius_km):
+    """
+    Keys (lat_cell, lng_cell) of a floor(degrees / cell_degrees) grid that
+    can hold points within radius_km of (lat, lng). The bounding box is
+    split at the antimeridian and spans every longitude when the radius
+    reaches a pole. When the box covers more cells than the grid has, the
+    grid's own keys are filtered instead, so a huge radius costs one pass
+    over the occupied cells rather than a scan of empty ones.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    south, north = lat - math.degrees(angle), lat + math.degrees(angle)
+    if south <= -90 or north >= 90:
+        lng_ranges = [(-180, 180)]
+    else:
+        lng_span = math.degrees(math.asin(min(1, math.sin(angle) / math.cos(math.radians(lat)))))
+        west, east = lng - lng_span, lng + lng_span
+        if west < -180:
+            lng_ranges = [(west + 360, 180), (-180, east)]
+        elif east > 180:
+            lng_ranges = [(west, 180), (-180, east - 360)]
+        else:
+            lng_ranges = [(west, east)]
+    
+    def cell(degrees):
+        return int(math.floor(degrees / cell_degrees))
+    
+    low_lat, high_lat = cell(max(south, -90)), cell(min(north, 90))
+    lng_cells = [(cell(west), cell(east)) for west, east in lng_ranges]
+    if (high_lat - low_lat + 1) * sum(high - low + 1 for low, high in lng_cells) > len(grid):
+        return [key for key in grid
+                if low_lat <= key[0] <= high_lat and any(low <= key[1] <= high for low, high in lng_cells)]
+    return [(cell_lat, cell_lng) for cell_lat in range(low_lat, high_lat + 1)
+            for low, high in lng_cells for cell_lng in range(low, high + 1)]
+
+
+def mongo_meters(km):
+    """App kilometres -> the meters $geoNear's maxDistance expects"""
+    return km / GEO_NEAR_KM_MULTIPLIER
+
+
+def geo_near(lat, lng, max_km=None, query=None, distance_field='distance'):
+    """$geoNear stage around (lat, lng); distance_field comes back in app kilometres"""
+    stage = {
+        'near': {'type': 'Point', 'coordinates': [float(lng), float(lat)]},
+        'key': 'location.geo',
+        'distanceField': distance_field,
+        'distanceMultiplier': GEO_NEAR_KM_MULTIPLIER,
+        'spherical': True
+    }
+    if max_km is not None:
+        stage['maxDistance'] = mongo_meters(max_km)
+    if query:
+        stage['query'] = query
+    return {'$geoNear': stage}
+
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def geohash(lat, lng, precision=6):
+    """Standard base32 geohash of (lat, lng); precision 6 is a ~1.2 x 0.6 km cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits = value = 0
+    even = True  # bits alternate longitude, latitude
+    while len(chars) < precision:
+        interval, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= mid:
+            value |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_BASE32[value])
+            bits = value = 0
+    return ''.join(chars)
+
+
+def geohash_bounds(cell):
+    """(south, west, north, east) of a geohash cell"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            interval = lng_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if value >> shift & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def geohash_center(cell):
+    """(lat, lng) of the centre of a geohash cell"""
+    south, west, north, east = geohash_bounds(cell)
+    return (south + north) / 2, (west + east) / 2
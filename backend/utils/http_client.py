@@ -0,0 +1,154 @@
+"""
+Shared HTTP client for upstream APIs.
+
+One requests.Session per upstream keeps connections alive in a bounded
+urllib3 pool, so calls skip the TCP/TLS handshake after the first. Every
+request has a (connect, read) timeout, per endpoint when configured.
+Connection errors, timeouts and retryable statuses are retried a bounded
+number of times with full-jitter exponential backoff; any other request
+error fails the call at once. A circuit breaker per endpoint opens after
+repeated failed calls and fails fast with CircuitOpenError until
+reset_timeout passes, then lets one trial call through (half-open). A
+trial that never reports back is replaced after another reset_timeout.
+"""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'  # closed, open, half_open
+        self.failures = 0
+        self.opened_at = None
+        self.probe_at = None  # when the current half-open trial call started
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            now = time.monotonic()
+            if self.state == 'open' and now - self.opened_at >= self.reset_timeout:
+                # One trial call; everyone else keeps failing fast until it reports back
+                self.state = 'half_open'
+                self.probe_at = now
+                return True
+            if self.state == 'half_open' and now - self.probe_at >= self.reset_timeout:
+                # The trial call never reported back; let another one through
+                self.probe_at = now
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class HTTPClient:
+    RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+    
+    def __init__(self, base_url='', pool_size=10, timeout=(3.05, 10), timeouts=None,
+                 retries=2, backoff=0.2, max_backoff=2.0,
+                 breaker_threshold=5, breaker_reset=30.0):
+        """
+        timeout: default (connect, read) seconds; timeouts: {endpoint: (connect, read)}
+        retries: extra attempts after the first
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.timeouts = timeouts or {}
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._breakers = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retried = 0
+        self.failures = 0
+        self.short_circuited = 0
+    
+    def breaker(self, endpoint):
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+            return breaker
+    
+    def get(self, endpoint, params=None, timeout=None):
+        """
+        GET base_url + endpoint. Returns the response (any non-retryable
+        status); raises CircuitOpenError, or the last error once retries
+        are used up.
+        """
+        breaker = self.breaker(endpoint)
+        if not breaker.allow():
+            with self._lock:
+                self.short_circuited += 1
+            raise CircuitOpenError(f'{endpoint} is failing, not calling it for now')
+        
+        url = self.base_url + endpoint
+        timeout = timeout or self.timeouts.get(endpoint, self.timeout)
+        with self._lock:
+            self.calls += 1
+        
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    response = self.session.get(url, params=params, timeout=timeout)
+                    if response.status_code not in self.RETRY_STATUSES:
+                        breaker.record_success()
+                        return response
+                    error = requests.HTTPError(f'{response.status_code} from {endpoint}', response=response)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                
+                if attempt < self.retries:
+                    with self._lock:
+                        self.retried += 1
+                    # Full jitter keeps retrying workers from hitting the upstream in lockstep
+                    time.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt)))
+        except Exception as e:
+            # Not worth retrying (bad URL, redirect loop, broken body...), but still a failed call
+            error = e
+        
+        breaker.record_failure()
+        with self._lock:
+            self.failures += 1
+        raise error
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'retried': self.retried,
+                'failures': self.failures,
+                'short_circuited': self.short_circuited,
+                'breakers': {endpoint: breaker.state for endpoint, breaker in self._breakers.items()}
+            }